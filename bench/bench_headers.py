@@ -0,0 +1,116 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench.bench_headers
+~~~~~~~~~~~~~~~~~
+
+Measures the cost per response of the original dict based
+``Response.build_response_header`` (reproduced below as
+:func:`legacy_build_response_header`) against the template based one.
+
+Usage::
+
+  python -m bench.bench_headers --number 20000
+"""
+
+import argparse
+import contextlib
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daemon.request import Request
+from daemon.response import Response
+
+
+def make_response(content_type, content, connection="close", keepalive=None, **headers):
+    """A response ready for header building, as build_response leaves it."""
+    resp = Response()
+    resp.status_code, resp.reason = 200, "OK"
+    resp.headers['Content-Type'] = content_type
+    resp.headers.update(headers)
+    resp._content = content
+    resp.connection = connection
+    resp.keepalive = keepalive
+    return resp
+
+
+#: A static stylesheet on a persistent connection and a JSON hook answer.
+SAMPLES = {
+    "static-css": make_response(
+        "text/css", b"x" * 6393, "keep-alive", (5, 99),
+        **{"Cache-Control": "public, max-age=3600", "ETag": '"3d70ff754bf210d91b6003bc"',
+           "Last-Modified": "Thu, 11 Dec 2025 16:55:26 GMT", "Accept-Ranges": "bytes"}),
+    "json-hook": make_response("application/json", b'{"peer_list": {}, "length": 0}'),
+}
+
+
+def legacy_build_response_header(resp):
+    """The original header builder: a 13 entry dict, utcnow(), += and a print."""
+    headers = {
+        "Accept": "application/json",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Authorization": "Basic <credentials>",
+        "Cache-Control": "no-cache",
+        "Content-Type": "{}".format(resp.headers['Content-Type']),
+        "Content-Length": "{}".format(len(resp._content)),
+        "Connection": resp.connection,
+        "Date": "{}".format(datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")),
+        "Max-Forward": "10",
+        "Pragma": "no-cache",
+        "Proxy-Authorization": "Basic dXNlcjpwYXNz",
+        "Warning": "199 Miscellaneous warning",
+        "User-Agent": "Chrome/123.0.0.0",
+    }
+    headers.update(resp.headers)
+    if resp.connection == "keep-alive" and resp.keepalive:
+        headers["Keep-Alive"] = "timeout={}, max={}".format(*resp.keepalive)
+    status_line = f"HTTP/1.1 {resp.status_code} {resp.reason}\r\n"
+    header_lines = ""
+    for k, v in headers.items():
+        header_lines += f"{k}: {v}\r\n"
+    fmt_header = status_line + header_lines + "\r\n"
+    print(f"[Response.Header] Sending Header:\n{fmt_header}")
+    return fmt_header.encode("utf-8")
+
+
+def per_call_ns(func, number, repeat):
+    """Best-of-``repeat`` cost of one call in nanoseconds."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_headers', description='Response header cost')
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    request = Request()
+    print("{:<12} {:>14} {:>14} {:>10} {:>10}".format(
+        "sample", "legacy ns/rsp", "current ns", "legacy B", "current B"))
+    for name, resp in SAMPLES.items():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            legacy = per_call_ns(lambda: legacy_build_response_header(resp), args.number, args.repeat)
+            legacy_size = len(legacy_build_response_header(resp))
+        current = per_call_ns(lambda: resp.build_response_header(request), args.number, args.repeat)
+        current_size = len(resp.build_response_header(request))
+        print("{:<12} {:>14.0f} {:>14.0f} {:>10} {:>10}".format(
+            name, legacy, current, legacy_size, current_size))
+
+
+if __name__ == "__main__":
+    main()
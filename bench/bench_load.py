@@ -0,0 +1,394 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench.bench_load
+~~~~~~~~~~~~~~~~~
+
+End-to-end load test of the tracker, the proxy and the peers on loopback.
+
+A :class:`Cluster` starts ``start_tracker.py``, ``start_proxy.py`` (with a
+generated virtual host pointing at the tracker) and ``--peers`` instances of
+``peer.py``, which register with the tracker as they would in the chat. Each
+scenario is then driven by ``--concurrency`` client threads on keep-alive
+connections for ``--duration`` seconds:
+
+  - ``chat``: peers polling ``/api/get-messages`` and sending messages;
+  - ``fanout``: ``/send-peer``, every message relayed to another peer;
+  - ``static``: the chat UI pages, stylesheets and images from the tracker;
+  - ``register``: a registration storm on ``/submit-info`` and ``/add-list``;
+  - ``proxy``: peer list and static assets through the proxy.
+
+Throughput, p50/p99/p99.9 latency and errors are reported per scenario and per
+operation, and can be written as JSON. ``--baseline`` compares the run with a
+stored result and exits with status 1 when throughput dropped or p99 latency
+rose by more than ``--tolerance`` percent.
+
+Usage::
+
+  python -m bench.bench_load --peers 3 --concurrency 16 --duration 10 --output load.json
+  python -m bench.bench_load --save-baseline bench/baseline_load.json
+  python -m bench.bench_load --baseline bench/baseline_load.json --tolerance 15
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST = "127.0.0.1"
+AUTH = {"Cookie": "auth=true"}
+JSON = {"Cookie": "auth=true", "Content-Type": "application/json"}
+
+
+def free_port():
+    """A TCP port of the loopback interface nobody listens on."""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_port(port, timeout=10.0):
+    """Block until ``port`` accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("Nothing listening on {}:{} after {}s".format(HOST, port, timeout))
+
+
+class Cluster:
+    """The tracker, the proxy and the peers, as child processes.
+
+    :attrs tracker (int): tracker port.
+    :attrs proxy (int): proxy port.
+    :attrs peers (list): peer ports.
+    """
+
+    def __init__(self, peers=3, engine="threaded"):
+        self.engine = engine
+        self.tracker = free_port()
+        self.proxy = free_port()
+        self.peers = [free_port() for _ in range(peers)]
+        self._procs = []
+        self._tmp = tempfile.TemporaryDirectory(prefix="bench_load")
+
+    def _spawn(self, *args):
+        log = open(os.path.join(self._tmp.name, "{}.log".format(len(self._procs))), "w")
+        proc = subprocess.Popen([sys.executable] + list(args), cwd=ROOT,
+                                stdout=log, stderr=subprocess.STDOUT)
+        self._procs.append(proc)
+        return proc
+
+    def __enter__(self):
+        try:
+            self._spawn("start_tracker.py", "--server-ip", HOST, "--server-port", str(self.tracker),
+                        "--engine", self.engine, "--log-level", "WARNING")
+            wait_port(self.tracker)
+
+            config = os.path.join(self._tmp.name, "proxy.conf")
+            with open(config, "w") as f:
+                f.write('host "{0}:{1}" {{\n    proxy_pass http://{0}:{2};\n}}\n'.format(
+                    HOST, self.proxy, self.tracker))
+            self._spawn("start_proxy.py", "--server-ip", HOST, "--server-port", str(self.proxy),
+                        "--config", config)
+            wait_port(self.proxy)
+
+            for port in self.peers:
+                self._spawn("peer.py", "--server-ip", HOST, "--server-port", str(self.tracker),
+                            "--peer-ip", HOST, "--peer-port", str(port))
+            for port in self.peers:
+                wait_port(port)
+            self._wait_registered()
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def _wait_registered(self, timeout=10.0):
+        """Wait until every peer went online on the tracker."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            conn = http.client.HTTPConnection(HOST, self.tracker, timeout=2)
+            try:
+                conn.request("GET", "/get-list", headers=AUTH)
+                if json.loads(conn.getresponse().read())["length"] >= len(self.peers):
+                    return
+            finally:
+                conn.close()
+            time.sleep(0.2)
+        raise RuntimeError("The peers did not register with the tracker")
+
+    def __exit__(self, *exc):
+        for proc in self._procs:
+            proc.terminate()
+        for proc in self._procs:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self._procs = []
+        self._tmp.cleanup()
+        return False
+
+
+#
+# Operations: (cluster, rng) -> (port, method, path, body, headers)
+#
+
+def poll_messages(cluster, rng):
+    return rng.choice(cluster.peers), "GET", "/api/get-messages", None, AUTH
+
+
+def peer_list(cluster, rng):
+    return rng.choice(cluster.peers), "GET", "/get-list", None, AUTH
+
+
+def send_message(cluster, rng):
+    sender, receiver = rng.sample(cluster.peers, 2) if len(cluster.peers) > 1 else cluster.peers * 2
+    body = json.dumps({"message": {
+        "id": rng.randrange(1 << 30),
+        "text": "Hey there! How are you?",
+        "sender": "{}:{}".format(HOST, sender),
+        "receiver": "{}:{}".format(HOST, receiver),
+    }})
+    return sender, "POST", "/send-peer", body, JSON
+
+
+def tracker_list(cluster, rng):
+    return cluster.tracker, "GET", "/get-list", None, AUTH
+
+
+def static_asset(paths):
+    def op(cluster, rng):
+        return cluster.tracker, "GET", rng.choice(paths), None, AUTH
+    op.__name__ = "static"
+    return op
+
+
+def register_peer(cluster, rng):
+    body = json.dumps({"ip": "10.{}.{}.{}".format(*(rng.randrange(256) for _ in range(3))),
+                       "port": rng.randrange(1024, 65536)})
+    return cluster.tracker, "POST", "/submit-info", body, JSON
+
+
+def activate_peer(cluster, rng):
+    # Random peers are almost never registered: the tracker's 400 answer is part of the storm
+    ip, port = "10.0.0.{}".format(rng.randrange(256)), rng.randrange(1024, 65536)
+    return cluster.tracker, "POST", "/add-list", json.dumps({"ip": ip, "port": port}), JSON
+
+
+def proxied(op):
+    def proxied_op(cluster, rng):
+        _, method, path, body, headers = op(cluster, rng)
+        return cluster.proxy, method, path, body, dict(headers, Host="{}:{}".format(HOST, cluster.proxy))
+    proxied_op.__name__ = "proxy-" + op.__name__
+    return proxied_op
+
+
+PAGES = ["/", "/chat.html", "/login.html", "/css/chat.css", "/css/styles.css",
+         "/images/welcome.png", "/images/favicon.ico"]
+
+#: Scenario name to weighted operations.
+SCENARIOS = {
+    "chat": [(70, poll_messages), (20, send_message), (10, peer_list)],
+    "fanout": [(100, send_message)],
+    "static": [(100, static_asset(PAGES))],
+    "register": [(60, register_peer), (30, activate_peer), (10, tracker_list)],
+    "proxy": [(50, proxied(tracker_list)), (50, proxied(static_asset(PAGES[3:])))],
+}
+
+#: Status codes that are an expected answer of an operation, not an error.
+EXPECTED = {"add-list": (200, 400)}
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of a sorted list, in milliseconds."""
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+
+def summarise(latencies, errors, elapsed):
+    """Throughput and latency figures of one operation or scenario."""
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": percentile(ordered, 0.50),
+        "p99_ms": percentile(ordered, 0.99),
+        "p999_ms": percentile(ordered, 0.999),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+    }
+
+
+def client(cluster, ops, weights, seed, deadline, measure_from, results):
+    """One load generator thread: weighted random operations on keep-alive connections."""
+    rng = random.Random(seed)
+    conns = {}
+    latencies, errors = {}, {}
+    while True:
+        op = rng.choices(ops, weights)[0]
+        port, method, path, body, headers = op(cluster, rng)
+        name = op.__name__
+        started = time.perf_counter()
+        if started >= deadline:
+            break
+        ok = False
+        for attempt in (0, 1):
+            conn = conns.get(port)
+            reused = conn is not None
+            if conn is None:
+                conn = conns[port] = http.client.HTTPConnection(HOST, port, timeout=10)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status in EXPECTED.get(path.lstrip("/"), (200, 304))
+                if response.getheader("Connection", "").lower() == "close":
+                    conn.close()
+                    del conns[port]
+                break
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                del conns[port]
+                if not reused or attempt:
+                    break
+                # The server closed an idle keep-alive connection: retry once on a new one
+        elapsed = time.perf_counter() - started
+        if started < measure_from:
+            continue
+        if ok:
+            latencies.setdefault(name, []).append(elapsed)
+        else:
+            errors[name] = errors.get(name, 0) + 1
+    for conn in conns.values():
+        conn.close()
+    results.append((latencies, errors))
+
+
+def run_scenario(cluster, name, concurrency, duration, warmup):
+    """Drive one scenario and summarise it."""
+    weights, ops = zip(*SCENARIOS[name])
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    results = []
+    threads = [threading.Thread(target=client,
+                                args=(cluster, ops, weights, i, deadline, measure_from, results))
+               for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    per_op, all_latencies, all_errors = {}, [], 0
+    for op in sorted({op.__name__ for op in ops}):
+        latencies = [x for lat, _ in results for x in lat.get(op, ())]
+        errors = sum(err.get(op, 0) for _, err in results)
+        per_op[op] = summarise(latencies, errors, duration)
+        all_latencies += latencies
+        all_errors += errors
+    return {"total": summarise(all_latencies, all_errors, duration), "ops": per_op}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the run against the baseline.
+
+    :rtype list: scenarios whose throughput or p99 regressed beyond ``tolerance`` percent.
+    """
+    regressions = []
+    print("\n{:<10} {:>10} {:>10} {:>8} {:>10} {:>10} {:>8}".format(
+        "scenario", "base rps", "rps", "delta", "base p99", "p99", "delta"))
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        now, then = result["total"], base["total"]
+        rps_delta = (now["rps"] - then["rps"]) / then["rps"] * 100 if then["rps"] else 0.0
+        p99_delta = ((now["p99_ms"] - then["p99_ms"]) / then["p99_ms"] * 100
+                     if now["p99_ms"] and then["p99_ms"] else 0.0)
+        regressed = rps_delta < -tolerance or p99_delta > tolerance
+        if regressed:
+            regressions.append(name)
+        print("{:<10} {:>10} {:>10} {:>+7.1f}% {:>10} {:>10} {:>+7.1f}%{}".format(
+            name, then["rps"], now["rps"], rps_delta, then["p99_ms"], now["p99_ms"], p99_delta,
+            "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_load', description='Loopback load test')
+    parser.add_argument('--scenarios', default=",".join(SCENARIOS),
+                        help='Comma separated scenarios. Default is all of them.')
+    parser.add_argument('--peers', type=int, default=3)
+    parser.add_argument('--engine', default='threaded',
+                        choices=['threaded', 'pool', 'eventloop', 'prefork'])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=1.0)
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare with the results stored in this file.')
+    parser.add_argument('--save-baseline', help='Store the results as a baseline in this file.')
+    parser.add_argument('--tolerance', type=float, default=10.0,
+                        help='Regression threshold in percent. Default is 10.')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error("unknown scenarios: {}".format(", ".join(unknown)))
+
+    results = {
+        "time": time.time(),
+        "config": {"peers": args.peers, "engine": args.engine, "concurrency": args.concurrency,
+                   "duration": args.duration, "python": sys.version.split()[0]},
+        "scenarios": {},
+    }
+    print("{:<10} {:<20} {:>8} {:>7} {:>9} {:>9} {:>9} {:>9}".format(
+        "scenario", "operation", "requests", "errors", "req/s", "p50 ms", "p99 ms", "p99.9 ms"))
+    with Cluster(args.peers, args.engine) as cluster:
+        for name in names:
+            result = results["scenarios"][name] = run_scenario(
+                cluster, name, args.concurrency, args.duration, args.warmup)
+            for op, row in list(result["ops"].items()) + [("total", result["total"])]:
+                print("{:<10} {:<20} {:>8} {:>7} {:>9} {:>9} {:>9} {:>9}".format(
+                    name, op, row["requests"], row["errors"], row["rps"],
+                    row["p50_ms"], row["p99_ms"], row["p999_ms"]))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressed beyond {}%: {}".format(args.tolerance, ", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
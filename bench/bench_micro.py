@@ -0,0 +1,264 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench.bench_micro
+~~~~~~~~~~~~~~~~~
+
+Microbenchmarks of the per-request hot paths, on fixed inputs: request
+parsing (:meth:`Request.prepare`, :meth:`Request.prepare_headers`),
+:class:`CaseInsensitiveDict`, route lookup in the :class:`Router` compiled from
+``WeApRous.routes``, :meth:`Response.build_response_header` and
+:meth:`Response.build_response` of a static file.
+
+Each benchmark reports:
+
+  - ``ns/op``: best of ``--repeat`` timed runs, each long enough (about 0.2s)
+    for the timer resolution not to matter;
+  - ``B/op``: peak memory allocated while one operation runs, from
+    :mod:`tracemalloc` (CPython has no allocation counter, the transient peak
+    is what a hot path change moves);
+  - ``blocks/op``: memory blocks still allocated after the operation, per
+    operation (non zero means something grows, e.g. a cache or a leak).
+
+``--baseline`` compares the run with stored results: a benchmark regresses
+when its ns/op or B/op exceeds the baseline by more than its threshold, and
+the process exits with status 1.
+
+Usage::
+
+  python -m bench.bench_micro --save-baseline bench/baseline_micro.json
+  python -m bench.bench_micro --baseline bench/baseline_micro.json
+  python -m bench.bench_micro --filter route
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench.bench_headers import SAMPLES as RESPONSES
+from bench.bench_parser import SAMPLES as REQUESTS
+from daemon.dictionary import CaseInsensitiveDict
+from daemon.docroot import static_index
+from daemon.request import Request
+from daemon.response import Response
+from daemon.router import Router
+
+#: Regression threshold in percent when a benchmark does not set its own.
+DEFAULT_THRESHOLD = 10.0
+
+
+def handler(headers, body, **params):
+    return {}
+
+
+#: The tracker and peer routes, plus parameterised ones, as WeApRous.routes holds them.
+ROUTES = {(method, path): handler for method, path in [
+    ("PUT", "/hello"), ("GET", "/"), ("GET", "/user"), ("POST", "/echo"),
+    ("POST", "/submit-info"), ("GET", "/get-list"), ("POST", "/add-list"), ("POST", "/remove"),
+    ("POST", "/receive-message"), ("GET", "/api/get-messages"), ("POST", "/send-peer"),
+    ("GET", "/userip"), ("GET", "/peers/<int:id>"), ("GET", "/files/<path:rest>"),
+    ("GET", "/metrics"), ("GET", "/debug/slow-requests"),
+]}
+ROUTER = Router.from_routes(ROUTES)
+
+HEADERS = {
+    "Host": "127.0.0.1:6000", "Connection": "keep-alive", "Accept": "*/*",
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/123.0.0.0",
+    "Accept-Encoding": "gzip, deflate, br", "Accept-Language": "en-US,en;q=0.9",
+    "Cookie": "auth=true; theme=dark", "Referer": "http://127.0.0.1:6000/chat.html",
+}
+CIDICT = CaseInsensitiveDict(HEADERS)
+
+STATIC_REQUEST = (
+    b"GET /css/chat.css HTTP/1.1\r\n"
+    b"Host: 127.0.0.1:9000\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Accept: text/css,*/*;q=0.1\r\n"
+    b"\r\n"
+)
+
+
+def prepare(raw):
+    def op():
+        Request().prepare(raw, ROUTER)
+    return op
+
+
+def prepare_headers(raw):
+    request = Request()
+
+    def op():
+        request.prepare_headers(raw)
+    return op
+
+
+def cidict_build():
+    CaseInsensitiveDict(HEADERS)
+
+
+def cidict_lookup():
+    d = CIDICT
+    d["content-type"] = "text/plain"
+    "cookie" in d
+    d["Accept-Encoding"]
+    d.get("if-none-match")
+    del d["Content-Type"]
+
+
+def route(method, path):
+    def op():
+        ROUTER.match(method, path)
+    return op
+
+
+def build_response_header(resp):
+    request = Request()
+
+    def op():
+        resp.build_response_header(request)
+    return op
+
+
+def build_static_response():
+    request = Request()
+    request.prepare(STATIC_REQUEST, ROUTER)
+    Response().build_response(request)
+
+    def op():
+        Response().build_response(request)
+    return op
+
+
+#: name, operation factory, regression threshold (percent).
+BENCHMARKS = [
+    ("prepare/poll", lambda: prepare(REQUESTS["poll"]), DEFAULT_THRESHOLD),
+    ("prepare/send-peer", lambda: prepare(REQUESTS["send-peer"]), DEFAULT_THRESHOLD),
+    ("prepare_headers/poll", lambda: prepare_headers(REQUESTS["poll"]), DEFAULT_THRESHOLD),
+    ("cidict/build", lambda: cidict_build, DEFAULT_THRESHOLD),
+    ("cidict/lookup", lambda: cidict_lookup, DEFAULT_THRESHOLD),
+    ("route/exact", lambda: route("GET", "/api/get-messages"), DEFAULT_THRESHOLD),
+    ("route/param", lambda: route("GET", "/peers/42"), DEFAULT_THRESHOLD),
+    ("route/miss", lambda: route("GET", "/css/chat.css"), DEFAULT_THRESHOLD),
+    ("response_header/static-css",
+     lambda: build_response_header(RESPONSES["static-css"]), DEFAULT_THRESHOLD),
+    ("response_header/json-hook",
+     lambda: build_response_header(RESPONSES["json-hook"]), DEFAULT_THRESHOLD),
+    # File metadata checks make this one noisier
+    ("build_response/static-css", build_static_response, 20.0),
+]
+
+
+def measure(op, repeat):
+    """
+    Time and size one operation.
+
+    :rtype dict: ``ns_op``, ``bytes_op`` and ``blocks_op``.
+    """
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    # autorange stops at 0.2s; keep every repeat at least that long
+    ns_op = min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        op()  # first call allocations (interned strings, caches) are not per op
+        peak = 0
+        for _ in range(20):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            op()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    calls = 1000
+    gc.collect()
+    before = sys.getallocatedblocks()
+    for _ in range(calls):
+        op()
+    gc.collect()
+    blocks = (sys.getallocatedblocks() - before) / calls
+    return {"ns_op": round(ns_op, 1), "bytes_op": peak, "blocks_op": round(blocks, 2)}
+
+
+def compare(results, baseline):
+    """
+    Print the run against the baseline.
+
+    :rtype list: benchmarks that regressed beyond their threshold.
+    """
+    regressions = []
+    print("\n{:<28} {:>10} {:>10} {:>8} {:>9} {:>9} {:>6}".format(
+        "benchmark", "base ns", "ns/op", "delta", "base B", "B/op", "limit"))
+    for name, result in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            continue
+        limit = result["threshold"]
+        delta = (result["ns_op"] - base["ns_op"]) / base["ns_op"] * 100
+        grew = result["bytes_op"] > base["bytes_op"] * (1 + limit / 100)
+        regressed = delta > limit or grew
+        if regressed:
+            regressions.append(name)
+        print("{:<28} {:>10.0f} {:>10.0f} {:>+7.1f}% {:>9} {:>9} {:>5.0f}%{}".format(
+            name, base["ns_op"], result["ns_op"], delta, base["bytes_op"], result["bytes_op"],
+            limit, "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_micro', description='Hot path microbenchmarks')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare with the results stored in this file.')
+    parser.add_argument('--save-baseline', help='Store the results as a baseline in this file.')
+    args = parser.parse_args()
+
+    # The static benchmark serves the repository's own static/ directory
+    os.chdir(ROOT)
+    static_index.build()
+
+    results = {"python": sys.version.split()[0], "benchmarks": {}}
+    print("{:<28} {:>10} {:>8} {:>10}".format("benchmark", "ns/op", "B/op", "blocks/op"))
+    for name, factory, threshold in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        result = measure(factory(), args.repeat)
+        result["threshold"] = threshold
+        results["benchmarks"][name] = result
+        print("{:<28} {:>10.0f} {:>8} {:>10}".format(
+            name, result["ns_op"], result["bytes_op"], result["blocks_op"]))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            print("\nRegressed beyond their threshold: {}".format(", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench.bench_parser
+~~~~~~~~~~~~~~~~~
+
+Measures the parse cost per request of the original ``str`` based
+``Request.prepare`` (reproduced below as :func:`legacy_prepare`) against the
+single-pass bytes parser and the current :meth:`Request.prepare`.
+
+Usage::
+
+  python -m bench.bench_parser --number 20000
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daemon.parser import parse_request
+from daemon.request import Request
+
+#: Typical chat UI requests: a poll and a message post.
+SAMPLES = {
+    "poll": (
+        b"GET /api/get-messages HTTP/1.1\r\n"
+        b"Host: 127.0.0.1:6000\r\n"
+        b"Connection: keep-alive\r\n"
+        b"User-Agent: Mozilla/5.0 (X11; Linux x86_64) Chrome/123.0.0.0\r\n"
+        b"Accept: */*\r\n"
+        b"Referer: http://127.0.0.1:6000/chat.html\r\n"
+        b"Accept-Encoding: gzip, deflate, br\r\n"
+        b"Accept-Language: en-US,en;q=0.9\r\n"
+        b"Cookie: auth=true; theme=dark\r\n"
+        b"\r\n"
+    ),
+    "send-peer": (
+        b"POST /send-peer HTTP/1.1\r\n"
+        b"Host: 127.0.0.1:6000\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Cookie: auth=true\r\n"
+        b"Content-Length: 120\r\n"
+        b"\r\n"
+        b'{"message": {"id": 1, "text": "Hey there! How are you?", '
+        b'"sender": "127.0.0.1:6000", "receiver": "127.0.0.1:6001"}}   '
+    ),
+}
+
+
+def legacy_prepare(raw):
+    """The pre-parser ``Request.prepare``: decode, splitlines twice, split again."""
+    Request()
+    request = raw.decode()
+    lines = request.splitlines()
+    method, path, version = lines[0].split()
+    if path == '/':
+        path = '/index.html'
+    print("[Request] {} path {} version {}".format(method, path, version))
+    headers = {}
+    for line in request.splitlines()[1:]:
+        if ':' in line:
+            key, val = line.split(':', 1)
+            headers[key.lower().strip()] = val.strip()
+    cookies = {}
+    for pair in headers.get('cookie', '').split(';'):
+        if '=' in pair:
+            key, value = pair.split('=', 1)
+            cookies[key.strip()] = value.strip()
+    body = None
+    parts = request.split("\r\n\r\n", 1)
+    print("[Request] requested: {}".format(request))
+    if len(parts) > 1:
+        body = parts[1]
+        print("[Request] parts: {}".format(parts[0]))
+    # HttpAdapter split the message once more before calling the hook
+    hook_headers, hook_body = request.split("\r\n\r\n")[:2]
+    headers["Content-Length"] = str(len(body.encode('utf-8'))) if body is not None else "0"
+    return method, path, version, headers, cookies, body
+
+
+def prepare(raw):
+    """Current :meth:`Request.prepare`."""
+    Request().prepare(raw, {})
+
+
+def per_call_ns(func, arg, number, repeat):
+    """Best-of-``repeat`` cost of one call in nanoseconds."""
+    timer = timeit.Timer(lambda: func(arg))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_parser', description='Request parse cost')
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print("{:<10} {:>14} {:>16} {:>18}".format(
+        "sample", "legacy ns/req", "parse_request", "Request.prepare"))
+    for name, raw in SAMPLES.items():
+        parsed = per_call_ns(parse_request, raw, args.number, args.repeat)
+        # Both versions print, keep the terminal out of the timing
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            legacy = per_call_ns(legacy_prepare, raw, args.number, args.repeat)
+            full = per_call_ns(prepare, raw, args.number, args.repeat)
+        print("{:<10} {:>14.0f} {:>16.0f} {:>18.0f}".format(name, legacy, parsed, full))
+
+
+if __name__ == "__main__":
+    main()
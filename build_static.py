@@ -0,0 +1,57 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course,
+# and is released under the "MIT License Agreement". Please see the LICENSE
+# file that should have been included as part of this package.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+
+"""
+build_static
+~~~~~~~~~~~~~~~~~
+
+This module provides the entry point of the offline static asset build. It
+minifies, content-hashes and precompresses the files of ``www/`` and
+``static/`` into an output directory (see :mod:`daemon.assets`), which is then
+served with ``start_tracker.py --static-dir <output>``.
+"""
+
+import argparse
+
+from daemon.assets import build_assets
+
+if __name__ == "__main__":
+    """
+    Entry point for building the static assets.
+
+    :arg --source-dir (str): directory containing ``www/`` and ``static/`` (default: current).
+    :arg --out-dir (str): output directory (default: dist).
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='BuildStatic',
+        description='Minify, fingerprint and precompress the static assets'
+    )
+    parser.add_argument('--source-dir',
+        type=str,
+        default='',
+        help='Directory containing www/ and static/. Default is the current directory.'
+    )
+    parser.add_argument('--out-dir',
+        type=str,
+        default='dist',
+        help='Output directory. Default is dist.'
+    )
+
+    args = parser.parse_args()
+    manifest = build_assets(args.source_dir, args.out_dir)
+    for url, hashed in sorted(manifest.items()):
+        print("[BuildStatic] {} -> {}".format(url, hashed))
+    print("[BuildStatic] {} assets fingerprinted into {}".format(len(manifest), args.out_dir))
@@ -0,0 +1,259 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.assets
+~~~~~~~~~~~~~~~~~
+
+This module provides the offline build of the static assets served by
+:class:`Response <Response>`.
+
+:func:`build_assets` reads every file of the docroot index (``www/``,
+``static/``, ...) and writes a deployable copy of the document roots:
+
+* HTML and CSS are minified (comments and indentation removed, inline
+  ``<style>`` and ``<script>`` included);
+* every asset but the HTML pages is also written under a content-hashed name,
+  ``css/chat.css`` becoming ``css/chat.1f0c9e2a7b3d.css``;
+* references to those assets in HTML (``href``/``src``) and CSS (``url()``)
+  are rewritten to the hashed names;
+* a ``.gz`` sibling is written for every compressible file.
+
+The ``manifest.json`` written next to the document roots maps each original
+URL to its hashed one. Serving the output directory (see
+:meth:`WeApRous.prepare_static`), hashed URLs are cached as ``immutable`` and
+the ``.gz`` siblings are sent as is, nothing is compressed at request time.
+
+Usage Example:
+--------------
+>>> manifest = build_assets("", "dist")
+>>> manifest["/css/chat.css"]
+'/css/chat.1f0c9e2a7b3d.css'
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+
+from .compression import compressible, compress
+from .docroot import DOCROOTS, MANIFEST, StaticIndex
+
+#: Hex digits of content hash put in the file names.
+FINGERPRINT_LENGTH = 12
+
+_STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+_CSS_SPACE = re.compile(r'({})|/\*.*?\*/|\s+'.format(_STRING), re.S)
+_CSS_PUNCT = re.compile(r'({})|\s*;?\s*(\}})\s*|\s*([{{;,>])\s*|:\s+'.format(_STRING))
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_HTML_REF = re.compile(r'\b(href|src)=([\'"])([^\'"]+)\2', re.I)
+_HTML_COMMENT = re.compile(r'<!--(?!\[).*?-->', re.S)
+_HTML_RAW = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+
+
+def minify_css(text):
+    """
+    Removes the comments and the insignificant whitespace of a stylesheet.
+
+    Quoted strings are left untouched.
+
+    :param text (str): CSS source.
+
+    :rtype str: the minified CSS.
+    """
+    text = _CSS_SPACE.sub(
+        lambda m: m.group(1) or ("" if m.group(0).startswith("/*") else " "), text)
+
+    def punct(m):
+        if m.group(1):
+            return m.group(1)
+        return m.group(2) or m.group(3) or ":"
+
+    return _CSS_PUNCT.sub(punct, text).strip()
+
+
+def minify_js(text):
+    """
+    Removes the indentation, blank lines and whole-line ``//`` comments of a
+    script.
+
+    Line breaks are kept, so automatic semicolon insertion still applies, and
+    lines inside multi-line template literals are copied verbatim.
+
+    :param text (str): JavaScript source.
+
+    :rtype str: the minified script.
+    """
+    lines = []
+    in_template = False
+    for line in text.splitlines():
+        if in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith("//"):
+                lines.append(stripped)
+        # An odd number of unescaped backticks opens or closes a template
+        if (line.count("`") - line.count("\\`")) % 2:
+            in_template = not in_template
+    return "\n".join(lines)
+
+
+def minify_html(text):
+    """
+    Minifies an HTML page: comments and indentation are removed, inline
+    stylesheets and scripts are minified, ``<pre>`` and ``<textarea>``
+    contents are kept as is.
+
+    :param text (str): HTML source.
+
+    :rtype str: the minified page.
+    """
+    def markup(chunk):
+        chunk = _HTML_COMMENT.sub("", chunk)
+        return "\n".join(line.strip() for line in chunk.splitlines() if line.strip())
+
+    parts = []
+    position = 0
+    for m in _HTML_RAW.finditer(text):
+        parts.append(markup(text[position:m.start()]))
+        tag = m.group(2).lower()
+        body = m.group(3)
+        if tag == "style":
+            body = minify_css(body)
+        elif tag == "script" and "src=" not in m.group(1).lower():
+            body = minify_js(body)
+        parts.append(m.group(1) + body + m.group(4))
+        position = m.end()
+    parts.append(markup(text[position:]))
+    return "\n".join(part for part in parts if part)
+
+
+def fingerprint(url, data):
+    """
+    Returns the content-hashed URL of an asset.
+
+    :param url (str): URL path, e.g. ``/css/chat.css``.
+    :param data (bytes): the asset content.
+
+    :rtype str: e.g. ``/css/chat.1f0c9e2a7b3d.css``.
+    """
+    digest = hashlib.blake2b(data, digest_size=FINGERPRINT_LENGTH // 2).hexdigest()
+    root, ext = posixpath.splitext(url)
+    return "{}.{}{}".format(root, digest, ext)
+
+
+def rewrite_refs(text, page_url, manifest, pattern):
+    """
+    Points the asset references of a page or stylesheet to the hashed URLs.
+
+    Relative references are resolved against ``page_url``; references to
+    files outside the manifest (external URLs, anchors, ...) are kept.
+
+    :param text (str): HTML or CSS source.
+    :param page_url (str): URL path of the document being rewritten.
+    :param manifest (dict): original URL to hashed URL.
+    :param pattern (re.Pattern): reference pattern, its last group is the URL.
+
+    :rtype str: the rewritten source.
+    """
+    def replace(m):
+        group = m.re.groups
+        path, sep, suffix = _split_ref(m.group(group))
+        if not path or "//" in path or path.startswith("data:"):
+            return m.group(0)
+        if not path.startswith("/"):
+            path = posixpath.normpath(posixpath.join(posixpath.dirname(page_url), path))
+        hashed = manifest.get(path)
+        if hashed is None:
+            return m.group(0)
+        whole = m.group(0)
+        start, end = m.start(group) - m.start(), m.end(group) - m.start()
+        return whole[:start] + hashed + sep + suffix + whole[end:]
+
+    return pattern.sub(replace, text)
+
+
+def _split_ref(ref):
+    """Split ``ref`` into path, separator and query string or fragment."""
+    for i, char in enumerate(ref):
+        if char in "?#":
+            return ref[:i], char, ref[i + 1:]
+    return ref, "", ""
+
+
+def _write(path, data):
+    """Write ``data`` to ``path``, creating the parent directories."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build_assets(base_dir="", out_dir="dist"):
+    """
+    Builds the deployable copy of the document roots.
+
+    :param base_dir (str): directory containing the source ``www/``, ``static/``, ...
+    :param out_dir (str): output directory, its document roots are replaced.
+
+    :rtype dict: the manifest, original URL to hashed URL.
+    :raises ValueError: If ``out_dir`` is the source directory.
+    """
+    if os.path.realpath(out_dir) == os.path.realpath(base_dir or "."):
+        raise ValueError("Output directory must differ from the sources: {}".format(out_dir))
+
+    index = StaticIndex(base_dir)
+    index.build()
+    for docroot in set(DOCROOTS.values()):
+        shutil.rmtree(os.path.join(out_dir, docroot), ignore_errors=True)
+
+    def stage(entry):
+        # Referenced assets are hashed before the files referencing them
+        if entry.mime_type == "text/html":
+            return 2
+        return 1 if entry.mime_type == "text/css" else 0
+
+    manifest = {}
+    for entry in sorted(index.entries.values(), key=lambda e: (stage(e), e.url)):
+        with open(entry.path, "rb") as f:
+            data = f.read()
+        if entry.mime_type == "text/html":
+            text = minify_html(data.decode("utf-8"))
+            text = rewrite_refs(text, entry.url, manifest, _HTML_REF)
+            data = rewrite_refs(text, entry.url, manifest, _CSS_URL).encode("utf-8")
+        elif entry.mime_type == "text/css":
+            text = rewrite_refs(data.decode("utf-8"), entry.url, manifest, _CSS_URL)
+            data = minify_css(text).encode("utf-8")
+
+        urls = [entry.url]
+        if entry.mime_type != "text/html":
+            # Pages keep their address, everything they load gets a hashed one
+            manifest[entry.url] = fingerprint(entry.url, data)
+            urls.append(manifest[entry.url])
+
+        gzipped = None
+        # Compressed offline, so large files get a gzip variant too
+        if compressible(entry.mime_type, len(data), max_size=None):
+            gzipped = compress(data)
+            if len(gzipped) >= len(data):
+                gzipped = None
+        for url in urls:
+            path = os.path.join(out_dir, entry.docroot, url.lstrip("/"))
+            _write(path, data)
+            if gzipped is not None:
+                _write(path + ".gz", gzipped)
+
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
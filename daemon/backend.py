@@ -30,13 +30,19 @@ Requirements:
 
 Notes:
 ------
-- The server create daemon threads for client handling.
+- The server create daemon threads for client handling. With ``engine="pool"`` the
+  connections are served by a bounded :class:`WorkerPool <WorkerPool>` instead, and
+  with ``engine="eventloop"`` by a single non-blocking :mod:`selectors` loop.
+- ``engine="prefork"`` runs any of these engines in several worker processes
+  sharing the port, to use more than one CPU core.
 - The current implementation error handling is minimal, socket errors are printed to the console.
 - The actual request processing is delegated to the HttpAdapter class.
 
 Usage Example:
 --------------
 >>> create_backend("127.0.0.1", 9000, routes={})
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="pool",
+...                min_workers=8, max_workers=64, queue_size=256, overflow="reject")
 
 """
 
@@ -47,8 +53,18 @@ import argparse
 from .response import *
 from .httpadapter import HttpAdapter
 from .dictionary import CaseInsensitiveDict
+from .workerpool import WorkerPool
+from .eventloop import run_backend_eventloop
+from .prefork import run_prefork, record_connection
+from .docroot import static_index
+from .logger import get_logger
 
-def handle_client(ip, port, conn, addr, routes):
+log = get_logger(__name__)
+
+#: Serving engines selectable through :func:`create_backend`.
+ENGINES = ("threaded", "pool", "eventloop", "prefork")
+
+def handle_client(ip, port, conn, addr, routes, max_requests=None):
     """
     Initializes an HttpAdapter instance and delegates the client handling logic to it.
 
@@ -57,13 +73,23 @@ def handle_client(ip, port, conn, addr, routes):
     :param conn (socket.socket): Client connection socket.
     :param addr (tuple): client address (IP, port).
     :param routes (dict): Dictionary of route handlers.
+    :param max_requests (int): requests served on the connection, the adapter's default if ``None``.
     """
-    daemon = HttpAdapter(ip, port, conn, addr, routes)
+    record_connection()
+    daemon = HttpAdapter(ip, port, conn, addr, routes, max_requests=max_requests)
 
     # Handle client
     daemon.handle_client(conn, addr, routes)
 
-def run_backend(ip, port, routes):
+def handle_client_once(ip, port, conn, addr, routes):
+    """
+    :func:`handle_client` for a connection the accept thread serves itself
+    (``caller-runs`` overflow): one request, answered with ``Connection: close``,
+    so a persistent client cannot stall the accept loop.
+    """
+    handle_client(ip, port, conn, addr, routes, max_requests=1)
+
+def run_backend(ip, port, routes, server=None):
     """
     Starts the backend server, binds to the specified IP and port, and listens for incoming
     connections. Each connection is handled in a separate thread. The backend accepts incoming
@@ -73,15 +99,16 @@ def run_backend(ip, port, routes):
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict): Dictionary of route handlers.
+    :param server (socket.socket, optional): already listening socket, e.g. in a prefork worker.
     """
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
     try:
-        server.bind((ip, port))
-        server.listen(50)
-        print("[Backend] Listening on port {}".format(port))
+        if server is None:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind((ip, port))
+            server.listen(50)
+        log.info("Listening on port {}", port)
         if routes != {}:
-            print("[Backend] route settings {}".format(routes))
+            log.info("route settings {}", routes)
 
         while True:
             conn, addr = server.accept()
@@ -97,15 +124,135 @@ def run_backend(ip, port, routes):
             client_thread.daemon = True  # Thread will die when main program exits
             client_thread.start()
     except socket.error as e:
-      print("Socket error: {}".format(e))
+      log.error("Socket error: {}", e)
+
+def reject_client(conn):
+    """
+    Answers an overflowed connection with ``503 Service Unavailable`` and closes it.
+
+    :param conn (socket.socket): Client connection socket.
+    """
+    try:
+        conn.sendall(Response().build_unavailable())
+    except socket.error:
+        pass
+    finally:
+        conn.close()
+
+def run_backend_pool(ip, port, routes, min_workers=8, max_workers=64,
+                     queue_size=256, overflow="reject", idle_timeout=30.0,
+                     stats_interval=0, server=None):
+    """
+    Starts the backend server like :func:`run_backend`, but hands every accepted
+    connection to a bounded :class:`WorkerPool <WorkerPool>` instead of spawning
+    a new thread for it.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param min_workers (int): threads kept alive at all times.
+    :param max_workers (int): maximum number of worker threads.
+    :param queue_size (int): capacity of the hand-off queue.
+    :param overflow (str): ``block``, ``reject`` (503) or ``caller-runs`` (served by
+                           the accept thread, one request then ``Connection: close``).
+    :param idle_timeout (float): idle seconds before an extra worker is retired.
+    :param stats_interval (float): print pool stats every N seconds, 0 disables it.
+    :param server (socket.socket, optional): already listening socket, e.g. in a prefork worker.
+
+    :rtype WorkerPool: the pool, once the accept loop stops.
+    """
+    pool = WorkerPool(min_workers=min_workers, max_workers=max_workers,
+                      queue_size=queue_size, overflow=overflow,
+                      idle_timeout=idle_timeout, name="Backend")
+
+    try:
+        if server is None:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind((ip, port))
+            server.listen(max(50, queue_size))
+        log.info("Listening on port {} (pool {}-{} workers, queue {}, overflow {})",
+                 port, min_workers, max_workers, queue_size, overflow)
+        if routes != {}:
+            log.info("route settings {}", routes)
+
+        pool.start()
+        if stats_interval:
+            pool.report(stats_interval)
+
+        while True:
+            conn, addr = server.accept()
+            if not pool.submit(handle_client, ip, port, conn, addr, routes,
+                               caller_func=handle_client_once):
+                reject_client(conn)
+    except socket.error as e:
+      log.error("Socket error: {}", e)
+    finally:
+        pool.shutdown()
+
+    return pool
 
-def create_backend(ip, port, routes={}):
+def run_backend_prefork(ip, port, routes, processes=None, worker_engine="threaded",
+                        cpu_affinity=False, stats_interval=0, **options):
+    """
+    Starts the backend in several processes that all accept on the same port
+    (see :mod:`daemon.prefork`). Each worker process runs ``worker_engine``.
+
+    Module level state of the route handlers (e.g. the tracker peer list) is
+    per process, so only stateless or externally backed apps should use it.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param processes (int): number of worker processes, defaults to the CPU count.
+    :param worker_engine (str): ``threaded``, ``pool`` or ``eventloop`` engine of each worker.
+    :param cpu_affinity (bool|list): pin each worker to one CPU.
+    :param stats_interval (float): print aggregated worker stats every N seconds.
+    :param options: settings passed to the worker engine.
+
+    :raises ValueError: If the worker engine is unknown.
+    """
+    runners = {
+        "threaded": run_backend,
+        "pool": run_backend_pool,
+        "eventloop": run_backend_eventloop,
+    }
+    if worker_engine not in runners:
+        raise ValueError("Invalid prefork worker engine: {}".format(worker_engine))
+    runner = runners[worker_engine]
+
+    def serve(server):
+        runner(ip, port, routes, server=server, **options)
+
+    run_prefork(ip, port, serve, processes=processes, cpu_affinity=cpu_affinity,
+                stats_interval=stats_interval, name="Backend")
+
+def create_backend(ip, port, routes={}, engine="threaded", **options):
     """
     Entry point for creating and running the backend server.
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict, optional): Dictionary of route handlers. Defaults to empty dict.
+    :param engine (str, optional): serving engine, one of :data:`ENGINES`.
+                                   Defaults to ``threaded`` (one thread per connection).
+    :param options: engine specific settings, e.g. the :func:`run_backend_pool`
+                    sizing arguments for ``engine="pool"`` or the
+                    :func:`run_backend_eventloop` ones for ``engine="eventloop"``
+                    and :func:`run_backend_prefork` ones for ``engine="prefork"``.
+
+    :raises ValueError: If the engine is unknown.
     """
 
-    run_backend(ip, port, routes)
\ No newline at end of file
+    # Index the document roots once, before any worker (or forked child) serves
+    log.info("Indexed {} static files", static_index.build())
+
+    if engine == "threaded":
+        run_backend(ip, port, routes)
+    elif engine == "pool":
+        run_backend_pool(ip, port, routes, **options)
+    elif engine == "eventloop":
+        run_backend_eventloop(ip, port, routes, **options)
+    elif engine == "prefork":
+        run_backend_prefork(ip, port, routes, **options)
+    else:
+        raise ValueError("Invalid backend engine: {}".format(engine))
\ No newline at end of file
@@ -0,0 +1,198 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.compression
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``gzip`` content negotiation used by
+:class:`Response <Response>`.
+
+A body is compressed when the client accepts ``gzip``, its MIME type is in
+:data:`COMPRESSIBLE_TYPES` and it is between :data:`MIN_COMPRESS_SIZE` and
+:data:`MAX_COMPRESS_SIZE` bytes. Static files are compressed once per file
+version and the variant is kept in the static cache; route handler bodies are
+compressed per response, and streamed bodies chunk by chunk with
+:func:`compress_stream`. Larger static files are only sent gzip encoded when
+the asset build precompressed them.
+
+:data:`compression_stats` counts the compressed responses and the bytes saved.
+
+Usage Example:
+--------------
+>>> accepts_gzip("gzip, deflate, br")
+True
+>>> compressible("application/json; charset=utf-8", 4096)
+True
+"""
+
+import gzip
+import threading
+import zlib
+
+#: Smallest body worth compressing, in bytes.
+MIN_COMPRESS_SIZE = 1024
+#: Largest body compressed while serving, in bytes, like the static cache's
+#: :data:`MAX_ENTRY_SIZE <daemon.staticcache.MAX_ENTRY_SIZE>`.
+MAX_COMPRESS_SIZE = 1024 * 1024
+#: gzip level, 6 is the usual size/CPU trade-off.
+COMPRESS_LEVEL = 6
+#: MIME types (or ``main/*`` families) that are compressed.
+COMPRESSIBLE_TYPES = frozenset((
+    "text/*",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+))
+
+
+def compressible(content_type, size, max_size=MAX_COMPRESS_SIZE):
+    """
+    Tells whether a body of ``content_type`` and ``size`` bytes is compressed.
+
+    :param content_type (str): ``Content-Type`` value, parameters allowed.
+    :param size (int): body length in bytes.
+    :param max_size (int): largest body compressed, ``None`` for no limit.
+
+    :rtype bool: ``True`` if the body qualifies for ``gzip``.
+    """
+    if size < MIN_COMPRESS_SIZE or (max_size is not None and size > max_size):
+        return False
+    mime_type = content_type.split(";", 1)[0].strip().lower()
+    return (mime_type in COMPRESSIBLE_TYPES
+            or mime_type.split("/", 1)[0] + "/*" in COMPRESSIBLE_TYPES)
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Tells whether an ``Accept-Encoding`` header allows ``gzip``.
+
+    :param accept_encoding (str): the header value, ``None`` if absent.
+
+    :rtype bool: ``True`` unless gzip is absent or refused with ``q=0``.
+    """
+    if not accept_encoding:
+        return False
+    wildcard = False
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == "*":
+            wildcard = q > 0
+        else:
+            return q > 0
+    return wildcard
+
+
+def compress(data):
+    """
+    Compresses a body with ``gzip``.
+
+    The gzip header carries no timestamp, so a given input always produces the
+    same bytes (and the same entity tag).
+
+    :param data (bytes): the identity body.
+
+    :rtype bytes: the compressed body.
+    """
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+
+def compress_stream(chunks):
+    """
+    Compresses a streamed body with ``gzip``, one chunk at a time.
+
+    Every chunk is flushed (``Z_SYNC_FLUSH``) so the client can decode what it
+    received so far; the compressor state is the only thing held in memory.
+
+    :param chunks (iterator): ``bytes``/``str`` chunks of the identity body.
+
+    :rtype generator: the ``bytes`` chunks of the gzip stream.
+    """
+    # wbits 31: gzip wrapper, with a zero timestamp like :func:`compress`
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+    identity_size = encoded_size = 0
+    try:
+        for chunk in chunks:
+            data = chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+            if not data:
+                continue
+            identity_size += len(data)
+            block = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            encoded_size += len(block)
+            yield block
+        block = compressor.flush()
+        encoded_size += len(block)
+        yield block
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    compression_stats.record(identity_size, encoded_size)
+
+
+class CompressionStats:
+    """Thread-safe counters of the compressed responses.
+
+    :attrs responses (int): responses sent gzip encoded.
+    :attrs bytes_in (int): identity bytes of those responses.
+    :attrs bytes_out (int): bytes actually sent for them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, identity_size, encoded_size):
+        """
+        Count one compressed response.
+
+        :param identity_size (int): length of the uncompressed body.
+        :param encoded_size (int): length of the body sent.
+        """
+        with self._lock:
+            self.responses += 1
+            self.bytes_in += identity_size
+            self.bytes_out += encoded_size
+
+    def stats(self):
+        """
+        Snapshot of the counters.
+
+        :rtype dict: ``responses``, ``bytes_in``, ``bytes_out``, ``bytes_saved``
+                     and ``ratio`` (sent / identity).
+        """
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "bytes_saved": self.bytes_in - self.bytes_out,
+                "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 1.0,
+            }
+
+
+#: Counters shared by every :class:`Response <Response>` of the process.
+compression_stats = CompressionStats()
@@ -0,0 +1,183 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.docroot
+~~~~~~~~~~~~~~~~~
+
+This module provides the index of servable static files used by
+:class:`Response <Response>`.
+
+The MIME type of a URL decides its document root (:data:`DOCROOTS`): HTML is
+served from ``www/``, stylesheets and images from ``static/``, XML and ZIP
+files from ``application/``. Instead of guessing the type and joining paths on
+every request, :class:`StaticIndex <StaticIndex>` walks the document roots once
+at startup and maps every servable URL path to its file, MIME type and size.
+
+Resolving a request is then a single dict lookup. A URL that is not in the
+index (``/../config/x``, a PNG placed in ``www/``, ...) is simply not found,
+so path traversal cannot reach files outside the document roots.
+
+When the base directory is the output of the asset build (see
+:mod:`daemon.assets`), the index also records which URLs are content-hashed
+(listed in its :data:`MANIFEST`) and the precompressed ``.gz`` sibling of each
+file, which are never served under their own URL.
+
+Usage Example:
+--------------
+>>> static_index.build()
+>>> static_index.lookup("/css/chat.css")
+<IndexEntry /css/chat.css -> static/css/chat.css (text/css)>
+"""
+
+import json
+import mimetypes
+import os
+
+#: Document root of each servable MIME type, by exact type then main type.
+#: Types missing from both are never served; ``application`` is listed by
+#: subtype only, so octet-stream or bytecode files never are.
+DOCROOTS = {
+    "text/html": "www/",
+    "text/css": "static/",
+    "text/csv": "static/",
+    "text/xml": "static/",
+    "image": "static/",
+    "application/xml": "application/",
+    "application/zip": "application/",
+    "video/mp4": "video/",
+    "video/mpeg": "video/",
+}
+
+#: File of the asset build listing the content-hashed URLs.
+MANIFEST = "manifest.json"
+
+
+def docroot_of(mime_type):
+    """
+    Returns the document root serving ``mime_type``.
+
+    :param mime_type (str): MIME type.
+
+    :rtype str: the docroot (relative to the base directory), ``None`` if the
+                type is not served.
+    """
+    docroot = DOCROOTS.get(mime_type)
+    if docroot is None:
+        docroot = DOCROOTS.get(mime_type.split("/", 1)[0])
+    return docroot
+
+
+class IndexEntry:
+    """One servable file.
+
+    :attrs url (str): URL path, e.g. ``/css/chat.css``.
+    :attrs path (str): file path, e.g. ``static/css/chat.css``.
+    :attrs mime_type (str): MIME type sent as ``Content-Type``.
+    :attrs docroot (str): document root the file was found in.
+    :attrs size (int): file size when the index was built.
+    :attrs gzip_path (str): precompressed ``.gz`` sibling, ``None`` if absent.
+    :attrs immutable (bool): ``True`` if the URL is content-hashed.
+    """
+
+    __slots__ = ("url", "path", "mime_type", "docroot", "size", "gzip_path", "immutable")
+
+    def __init__(self, url, path, mime_type, docroot, size, gzip_path=None, immutable=False):
+        self.url = url
+        self.path = path
+        self.mime_type = mime_type
+        self.docroot = docroot
+        self.size = size
+        self.gzip_path = gzip_path
+        self.immutable = immutable
+
+    def __repr__(self):
+        return "<IndexEntry {} -> {} ({})>".format(self.url, self.path, self.mime_type)
+
+
+class StaticIndex:
+    """URL path to file index of the document roots.
+
+    :attrs base_dir (str): directory the document roots are relative to.
+    :attrs entries (dict): URL path to :class:`IndexEntry <IndexEntry>`.
+    """
+
+    def __init__(self, base_dir=""):
+        """
+        :param base_dir (str): directory containing ``www/``, ``static/``, ...
+        """
+        self.base_dir = base_dir
+        self.entries = None
+
+    def build(self):
+        """
+        Walk every document root of :data:`DOCROOTS` and rebuild the index.
+
+        Files are only indexed under the docroot their MIME type is served
+        from, and only if they resolve inside it (symlinks are followed).
+
+        :rtype int: number of indexed files.
+        """
+        try:
+            with open(os.path.join(self.base_dir, MANIFEST)) as f:
+                hashed = set(json.load(f).values())
+        except FileNotFoundError:
+            hashed = set()
+
+        entries = {}
+        for docroot in sorted(set(DOCROOTS.values())):
+            top = os.path.join(self.base_dir, docroot)
+            real_top = os.path.realpath(top) + os.sep
+            for dirpath, _, filenames in os.walk(top):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if not os.path.realpath(path).startswith(real_top):
+                        continue  # symlink leaving the document root
+                    relative = os.path.relpath(path, top).replace(os.sep, "/")
+                    url = "/" + relative
+                    mime_type, encoding = mimetypes.guess_type(filename)
+                    if encoding is not None:
+                        continue  # precompressed variant, found from its source
+                    mime_type = mime_type or "application/octet-stream"
+                    if docroot_of(mime_type) != docroot:
+                        continue
+                    try:
+                        size = os.path.getsize(path)
+                    except OSError:
+                        continue
+                    gzip_path = path + ".gz"
+                    if not os.path.isfile(gzip_path):
+                        gzip_path = None
+                    entries[url] = IndexEntry(url, path, mime_type, docroot, size,
+                                              gzip_path, url in hashed)
+        # Swapped in one assignment, lookups never see a half built index
+        self.entries = entries
+        return len(entries)
+
+    def lookup(self, url):
+        """
+        Resolve a request path.
+
+        :param url (str): request path, without the query string.
+
+        :rtype IndexEntry: the file, or ``None`` if nothing is served at ``url``.
+        """
+        entries = self.entries
+        if entries is None:
+            # Not built at startup: build now (a concurrent double build is harmless)
+            self.build()
+            entries = self.entries
+        return entries.get(url)
+
+
+#: Index shared by every :class:`Response <Response>` of the process.
+static_index = StaticIndex()
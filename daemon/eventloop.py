@@ -0,0 +1,385 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.eventloop
+~~~~~~~~~~~~~~~~~
+
+This module provides a non-blocking serving engine for the backend built on
+Python's :mod:`selectors`. A single thread multiplexes every client socket, so
+idle connections cost a few hundred bytes of state instead of one OS thread.
+
+Complete requests are processed by the same :class:`HttpAdapter <HttpAdapter>`
+request pipeline (:class:`Request <Request>`, :class:`Response <Response>` and the
+route table) as the threaded engine. By default the route hooks run inline in
+the loop thread; with ``workers > 0`` they are handed to a
+:class:`WorkerPool <WorkerPool>` so slow hooks (e.g. ones opening outbound
+sockets) do not stall the other connections. The loop never waits for the
+pool: a request arriving while its queue is full is answered with
+``503 Service Unavailable``.
+
+Notes:
+------
+- Holding 10k+ connections needs a matching ``ulimit -n`` for the process.
+- Requests are framed by :func:`daemon.reader.frame_request` (``Content-Length``
+  or chunked); bodies beyond ``max_request_size`` are answered with
+  ``413 Payload Too Large``. Bodies are buffered, not streamed, and a
+  connection is not read from while its request is with the worker pool, so
+  pipelined data cannot pile up behind a slow hook.
+- Large static files are answered with a :class:`FileResponse <FileResponse>`
+  and written with non-blocking ``os.sendfile`` calls.
+- Streaming route handlers are answered with a
+  :class:`ChunkedResponse <ChunkedResponse>`, whose chunks are pulled in the
+  loop thread as the socket drains: producing a chunk must not block.
+- Persistent connections follow the same keep-alive rules as
+  :class:`HttpAdapter <HttpAdapter>`; pipelined requests are answered in order
+  and idle connections are swept after ``keepalive_timeout`` seconds.
+
+Usage Example:
+--------------
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="eventloop", workers=8)
+"""
+
+import collections
+import selectors
+import socket
+import time
+
+from .httpadapter import HttpAdapter, KEEPALIVE_TIMEOUT, MAX_KEEPALIVE_REQUESTS, set_nodelay
+from .reader import frame_request, RequestError
+from .workerpool import WorkerPool
+from .prefork import record_connection
+from .zerocopy import FileResponse
+from .streaming import ChunkedResponse
+from .logger import get_logger
+from .metrics import metrics
+from .tracing import tracer
+
+log = get_logger(__name__)
+
+#: Size of a single non-blocking read.
+RECV_SIZE = 65536
+#: Seconds between two sweeps for idle persistent connections.
+SWEEP_INTERVAL = 1.0
+#: Responses written piecewise by their own ``send_some``.
+STREAMED_RESPONSES = (FileResponse, ChunkedResponse)
+
+class _Connection:
+    """Per-socket state kept by the :class:`EventLoop <EventLoop>`."""
+
+    __slots__ = ("sock", "addr", "adapter", "inbuf", "outbuf", "busy",
+                 "keep_alive", "last_active")
+
+    def __init__(self, sock, addr, adapter):
+        self.sock = sock
+        self.addr = addr
+        self.adapter = adapter
+        self.inbuf = bytearray()
+        self.outbuf = b""
+        self.busy = False
+        self.keep_alive = False
+        self.last_active = time.monotonic()
+
+
+class EventLoop:
+    """A :mod:`selectors` based HTTP serving loop.
+
+    :attrs ip (str): IP address the server is bound to.
+    :attrs port (int): port the server listens on.
+    :attrs routes (dict): route handlers shared with :class:`HttpAdapter <HttpAdapter>`.
+    :attrs max_connections (int): open connections above this are refused.
+    :attrs max_request_size (int): largest accepted request body in bytes.
+    """
+
+    def __init__(self, ip, port, routes, workers=0, queue_size=1024,
+                 max_connections=10000, max_request_size=1024 * 1024,
+                 keepalive_timeout=KEEPALIVE_TIMEOUT,
+                 max_keepalive_requests=MAX_KEEPALIVE_REQUESTS):
+        """
+        Initialize a new EventLoop instance.
+
+        :param ip (str): IP address to bind the server.
+        :param port (int): Port number to listen on.
+        :param routes (dict): Dictionary of route handlers.
+        :param workers (int): hook worker threads, 0 runs hooks inline in the loop.
+        :param queue_size (int): capacity of the worker hand-off queue.
+        :param max_connections (int): maximum concurrently open client connections.
+        :param max_request_size (int): maximum request body size in bytes.
+        :param keepalive_timeout (float): idle seconds before a persistent connection is closed.
+        :param max_keepalive_requests (int): requests served on one connection before closing it.
+        """
+        self.ip = ip
+        self.port = port
+        self.routes = routes
+        self.max_connections = max_connections
+        self.max_request_size = max_request_size
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        self.selector = selectors.DefaultSelector()
+        self.connections = 0
+
+        self.pool = None
+        if workers:
+            self.pool = WorkerPool(min_workers=workers, queue_size=queue_size,
+                                   overflow="reject", name="EventLoop")
+        #: Responses finished by pool workers, handed back to the loop thread.
+        self._done = collections.deque()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
+    def serve_forever(self, server):
+        """
+        Run the loop on an already bound and listening ``server`` socket.
+
+        :param server (socket.socket): listening server socket.
+        """
+        server.setblocking(False)
+        self.selector.register(server, selectors.EVENT_READ, self._accept)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ, self._drain_done)
+        if self.pool:
+            self.pool.start()
+
+        last_sweep = time.monotonic()
+        while True:
+            for key, mask in self.selector.select(timeout=SWEEP_INTERVAL):
+                callback = key.data
+                if callback in (self._accept, self._drain_done):
+                    callback(key.fileobj)
+                elif mask & selectors.EVENT_READ:
+                    self._read(callback)
+                elif mask & selectors.EVENT_WRITE:
+                    self._write(callback)
+
+            now = time.monotonic()
+            if now - last_sweep >= SWEEP_INTERVAL:
+                last_sweep = now
+                self._sweep_idle(now)
+
+    def _sweep_idle(self, now):
+        """Close persistent connections idle for longer than ``keepalive_timeout``."""
+        idle = [
+            key.data for key in list(self.selector.get_map().values())
+            if isinstance(key.data, _Connection) and not key.data.busy
+            and now - key.data.last_active > self.keepalive_timeout
+        ]
+        for c in idle:
+            self._close(c)
+
+    def _accept(self, server):
+        """Accept every pending connection on the listening socket."""
+        while True:
+            try:
+                sock, addr = server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except socket.error as e:
+                log.warning("accept error: {}", e)
+                return
+            if self.connections >= self.max_connections:
+                sock.close()
+                continue
+            sock.setblocking(False)
+            set_nodelay(sock)
+            record_connection()
+            self.connections += 1
+            adapter = HttpAdapter(self.ip, self.port, sock, addr, self.routes,
+                                  keepalive_timeout=self.keepalive_timeout,
+                                  max_requests=self.max_keepalive_requests)
+            self.selector.register(sock, selectors.EVENT_READ, _Connection(sock, addr, adapter))
+
+    def _read(self, c):
+        """Read from a client and dispatch once a complete request arrived."""
+        try:
+            data = c.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except socket.error:
+            self._close(c)
+            return
+        if not data:
+            self._close(c)
+            return
+
+        c.inbuf += data
+        c.last_active = time.monotonic()
+        self._dispatch(c)
+
+    def _dispatch(self, c):
+        """Hand the first complete buffered request to the request pipeline."""
+        if c.busy:
+            return
+        try:
+            framed = frame_request(c.inbuf, max_body_size=self.max_request_size)
+        except RequestError as e:
+            c.busy = True
+            self._respond(c, c.adapter.response.build_error(e.status_code, e.reason))
+            return
+        if framed is None:
+            return
+
+        length, head, body = framed
+        msg = head + body
+        del c.inbuf[:length]
+        c.busy = True
+        if self.pool:
+            # Not read again until the response is queued: the kernel buffer,
+            # not inbuf, holds whatever the client pipelines meanwhile
+            self.selector.unregister(c.sock)
+            if not self.pool.submit(self._process_async, c, msg):
+                # Blocking here would stall every connection of the loop
+                self._respond(c, c.adapter.response.build_unavailable())
+        else:
+            self._respond(c, *self._process(c, msg))
+
+    def _process(self, c, msg):
+        """
+        Run the shared request pipeline.
+
+        :rtype tuple: (response bytes, whether the connection stays open).
+        """
+        log.debug("client connected from {}", c.addr)
+        adapter = c.adapter
+        # Traced from the complete request to the built response; the
+        # non-blocking send is interleaved with other sockets and not timed.
+        trace = tracer.begin()
+        started = metrics.begin()
+        try:
+            response = adapter.handle_request(msg, self.routes)
+        except Exception as e:
+            log.error("request error: {!r}", e)
+            response = adapter.response.build_error(500, "Internal Server Error")
+            status = adapter.record_request(response, started)
+            tracer.finish(trace, adapter.request.method, adapter.request.path, status)
+            return response, False
+        status = adapter.record_request(response, started)
+        tracer.finish(trace, adapter.request.method, adapter.request.path, status)
+        return response, adapter.response.connection == "keep-alive"
+
+    def _process_async(self, c, msg):
+        """Worker side of :meth:`_process`; wakes the loop when the response is ready."""
+        self._done.append((c,) + self._process(c, msg))
+        try:
+            self._wakeup_w.send(b"\0")
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _drain_done(self, wakeup):
+        """Pick up the responses finished by the workers."""
+        try:
+            while wakeup.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        while self._done:
+            c, response, keep_alive = self._done.popleft()
+            self._respond(c, response, keep_alive)
+
+    def _respond(self, c, response, keep_alive=False):
+        """Queue ``response`` on the connection and wait for it to be writable."""
+        if c.sock.fileno() < 0:
+            # The client went away while a worker was building the response.
+            return
+        c.outbuf = response
+        c.keep_alive = keep_alive
+        try:
+            self.selector.modify(c.sock, selectors.EVENT_WRITE, c)
+        except KeyError:
+            # Unregistered while its request was with the worker pool
+            self.selector.register(c.sock, selectors.EVENT_WRITE, c)
+
+    def _write(self, c):
+        """Flush as much of the pending response as the socket accepts."""
+        if isinstance(c.outbuf, STREAMED_RESPONSES):
+            try:
+                done = c.outbuf.send_some(c.sock)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._close(c)
+                return
+            if not done:
+                return
+            c.outbuf.close()
+            c.outbuf = b""
+        else:
+            try:
+                sent = c.sock.send(c.outbuf)
+            except (BlockingIOError, InterruptedError):
+                return
+            except socket.error:
+                self._close(c)
+                return
+            c.outbuf = c.outbuf[sent:]
+            if c.outbuf:
+                return
+        if not c.keep_alive:
+            self._close(c)
+            return
+
+        # Persistent connection: wait for the next request, or answer the
+        # next pipelined one that is already buffered.
+        c.busy = False
+        c.last_active = time.monotonic()
+        self.selector.modify(c.sock, selectors.EVENT_READ, c)
+        self._dispatch(c)
+
+    def _close(self, c):
+        """Unregister and close a client connection."""
+        if c.sock.fileno() < 0:
+            return
+        if isinstance(c.outbuf, STREAMED_RESPONSES):
+            c.outbuf.close()
+        try:
+            self.selector.unregister(c.sock)
+        except (KeyError, ValueError):
+            pass
+        c.sock.close()
+        self.connections -= 1
+
+
+def run_backend_eventloop(ip, port, routes, workers=0, queue_size=1024,
+                          max_connections=10000, max_request_size=1024 * 1024,
+                          keepalive_timeout=KEEPALIVE_TIMEOUT,
+                          max_keepalive_requests=MAX_KEEPALIVE_REQUESTS,
+                          server=None):
+    """
+    Starts the backend server on the non-blocking :class:`EventLoop <EventLoop>` engine.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param workers (int): hook worker threads, 0 runs hooks inline in the loop.
+    :param queue_size (int): capacity of the worker hand-off queue.
+    :param max_connections (int): maximum concurrently open client connections.
+    :param max_request_size (int): maximum request body size in bytes.
+    :param keepalive_timeout (float): idle seconds before a persistent connection is closed.
+    :param max_keepalive_requests (int): requests served on one connection before closing it.
+    :param server (socket.socket, optional): already listening socket, e.g. in a prefork worker.
+    """
+    try:
+        if server is None:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind((ip, port))
+            server.listen(1024)
+        log.info("Listening on port {} (event loop, {} hook workers)", port, workers)
+        if routes != {}:
+            log.info("route settings {}", routes)
+
+        loop = EventLoop(ip, port, routes, workers=workers, queue_size=queue_size,
+                         max_connections=max_connections,
+                         max_request_size=max_request_size,
+                         keepalive_timeout=keepalive_timeout,
+                         max_keepalive_requests=max_keepalive_requests)
+        loop.serve_forever(server)
+    except socket.error as e:
+      log.error("Socket error: {}", e)
@@ -20,9 +20,41 @@ raw URL paths and RESTful route definitions, and integrates with
 Request and Response objects to handle client-server communication.
 """
 
+import datetime
+import socket
+
 from .request import Request
 from .response import Response
 from .dictionary import CaseInsensitiveDict
+from .reader import RequestReader, RequestError, BodyStream
+from .zerocopy import FileResponse
+from .streaming import ChunkedResponse
+from .logger import get_logger, access, access_log, INFO
+from .metrics import metrics, METHODS
+from .tracing import tracer, current_trace, TRACE_HEADER
+
+log = get_logger(__name__)
+
+#: Seconds an idle persistent connection is kept open.
+KEEPALIVE_TIMEOUT = 5.0
+#: Requests served on one persistent connection before it is closed.
+MAX_KEEPALIVE_REQUESTS = 100
+
+def set_nodelay(conn):
+    """
+    Disable Nagle's algorithm on a client socket.
+
+    A response is written as its header, then the body or one chunk at a
+    time: on a persistent connection, each small write after the first would
+    otherwise wait for the client's delayed ACK (about 40 ms).
+
+    :param conn (socket.socket): the accepted client socket.
+    """
+    try:
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (OSError, AttributeError):
+        pass  # not a TCP socket
+
 
 class HttpAdapter:
     """
@@ -42,6 +74,9 @@ class HttpAdapter:
         routes (dict): Mapping of route paths to handler functions.
         request (Request): Request object for parsing incoming data.
         response (Response): Response object for building and sending replies.
+        keepalive_timeout (float): idle seconds before a persistent connection is closed.
+        max_requests (int): requests served on one connection before it is closed.
+        requests_served (int): requests served so far on this connection.
     """
 
     __attrs__ = [
@@ -52,9 +87,13 @@ class HttpAdapter:
         "routes",
         "request",
         "response",
+        "keepalive_timeout",
+        "max_requests",
+        "requests_served",
     ]
 
-    def __init__(self, ip, port, conn, connaddr, routes):
+    def __init__(self, ip, port, conn, connaddr, routes,
+                 keepalive_timeout=None, max_requests=None):
         """
         Initialize a new HttpAdapter instance.
 
@@ -63,6 +102,8 @@ class HttpAdapter:
         :param conn (socket): Active socket connection.
         :param connaddr (tuple): Address of the connected client.
         :param routes (dict): Mapping of route paths to handler functions.
+        :param keepalive_timeout (float): idle timeout, defaults to :data:`KEEPALIVE_TIMEOUT`.
+        :param max_requests (int): per-connection cap, defaults to :data:`MAX_KEEPALIVE_REQUESTS`.
         """
 
         #: IP address.
@@ -79,6 +120,12 @@ class HttpAdapter:
         self.request = Request()
         #: Response
         self.response = Response()
+        #: Idle timeout of a persistent connection, 0 disables keep-alive.
+        self.keepalive_timeout = KEEPALIVE_TIMEOUT if keepalive_timeout is None else keepalive_timeout
+        #: Maximum requests on one persistent connection.
+        self.max_requests = MAX_KEEPALIVE_REQUESTS if max_requests is None else max_requests
+        #: Requests served on this connection.
+        self.requests_served = 0
 
     def handle_client(self, conn, addr, routes):
         """
@@ -88,31 +135,141 @@ class HttpAdapter:
         invokes the appropriate route handler if available, builds the response,
         and sends it back to the client.
 
+        HTTP/1.1 connections are persistent: requests are served in order, including
+        pipelined ones already buffered, until the client asks for ``Connection: close``,
+        stays idle longer than ``keepalive_timeout`` or reaches ``max_requests``.
+
         :param conn (socket): The client socket connection.
         :param addr (tuple): The client's address.
         :param routes (dict): The route mapping for dispatching requests.
         """
-        print("Client connected from", addr)
+        log.debug("client connected from {}", addr)
         # Connection handler.
         self.conn = conn        
+        set_nodelay(conn)
         # Connection address.
         self.connaddr = addr
+
+        reader = RequestReader(conn)
+        try:
+            if self.keepalive_timeout:
+                conn.settimeout(self.keepalive_timeout)
+            while True:
+                try:
+                    # Waiting for the header block is idle time, not part of the trace
+                    head = reader.read_head()
+                    if head is None:
+                        break
+                    trace = tracer.begin()
+                    head, body = reader.read_body(head)
+                except RequestError as e:
+                    conn.sendall(self.response.build_error(e.status_code, e.reason))
+                    break
+                if trace is not None:
+                    trace.mark("recv")
+
+                # Handle the request
+                started = metrics.begin()
+                response = None
+                try:
+                    try:
+                        if isinstance(body, BodyStream):
+                            # Large body: the hook reads it from the socket on demand
+                            response = self.handle_request(head, routes, body_stream=body)
+                            body.discard()
+                        else:
+                            response = self.handle_request(head + body, routes)
+                    except RequestError as e:
+                        response = self.response.build_error(e.status_code, e.reason)
+                    except socket.error:
+                        raise
+                    except Exception as e:
+                        # A failing handler still gets an answer (and a 500 in the metrics)
+                        log.error("request error: {!r}", e)
+                        response = self.response.build_error(500, "Internal Server Error")
+                finally:
+                    status = self.record_request(response, started)
+
+                #print(response)
+                if isinstance(response, (FileResponse, ChunkedResponse)):
+                    response.send(conn)
+                else:
+                    conn.sendall(response)
+                if trace is not None:
+                    trace.mark("send")
+                    tracer.finish(trace, self.request.method, self.request.path, status)
+                if self.response.connection != "keep-alive":
+                    break
+        except (socket.timeout, socket.error, RequestError):
+            # Idle persistent connection timed out or the client went away.
+            pass
+        finally:
+            conn.close()
+
+    def keep_alive(self, req):
+        """
+        Decide whether the connection stays open after the current response.
+
+        :param req (Request): the current request.
+
+        :rtype bool: ``True`` for a persistent connection.
+        """
+        if not self.keepalive_timeout or self.requests_served >= self.max_requests:
+            return False
+        connection = (req.get_header("connection") or "").lower()
+        if req.version == "HTTP/1.1":
+            return "close" not in connection
+        return "keep-alive" in connection
+
+    def handle_request(self, msg, routes, body_stream=None):
+        """
+        Process one raw HTTP request and build the raw HTTP response.
+
+        This is the socket independent part of :meth:`handle_client`: it prepares
+        the request object, applies the authentication rules, invokes the route
+        hook if any and builds the response bytes. Serving engines that do their
+        own socket I/O (e.g. the event loop engine) call it directly.
+
+        :param msg (bytes): the raw HTTP request.
+        :param routes (dict): The route mapping for dispatching requests.
+        :param body_stream (BodyStream): body of a large request, which ``msg``
+                                         then only holds the header block of.
+
+        :rtype bytes: the raw HTTP response to send back to the client, or a
+                      :class:`FileResponse <FileResponse>` for large static files
+                      or a :class:`ChunkedResponse <ChunkedResponse>` for
+                      streaming route handlers.
+        """
+        # Fresh request/response objects for every request on the connection
+        self.request = Request()
+        self.response = Response()
         # Request handler
         req = self.request
         # Response handler
         resp = self.response
 
-        # Handle the request
-        msg = conn.recv(1024).decode()
-        req.prepare(msg, routes)
+        trace = current_trace()
 
-        #get req body
-        body=req.body
+        req.prepare(msg, routes)
+        if req.method is None:
+            return resp.build_error(400, "Bad Request")
+        if trace is not None:
+            trace.adopt(req.get_header(TRACE_HEADER.lower()))
+            trace.mark("prepare")
+        self.requests_served += 1
+        if self.keep_alive(req):
+            resp.connection = "keep-alive"
+            resp.keepalive = (int(self.keepalive_timeout), self.max_requests - self.requests_served)
+
+        # The authentication rules below may rewrite the path that was routed
+        routed_path = req.path
 
         #TASK 1A: Implement authentication handling
         if req.method == "POST" and req.path == "/login":
+            #get req body (materialised only here and for hooks)
+            body=req.body
             params = {}
-            for pair in body.split("&"):
+            for pair in (body or "").split("&"):
                 if "=" in pair:
                     key, value = pair.split("=", 1)
                     params[key] = value # for ex: username=long&password=123 become username: long, password: 123
@@ -127,9 +284,7 @@ class HttpAdapter:
                 resp.headers['Set-Cookie'] = 'auth=true; Path=/; HttpOnly'
             else:
                 # print("111111111111111111111")
-                conn.sendall(resp.build_unauthorized())
-                conn.close()
-                return #401
+                return resp.build_unauthorized() #401
         #TASK 1B: Implement cookie-based authentication
         protected_paths = ["/","/login", "/index.html"]
 
@@ -141,9 +296,7 @@ class HttpAdapter:
                     req.path = "/login.html"
                 else:
                     # print("222222222222222")
-                    conn.sendall(resp.build_unauthorized())
-                    conn.close()
-                    return
+                    return resp.build_unauthorized()
             else:         
                 req.path = "/index.html"  
 
@@ -163,37 +316,74 @@ class HttpAdapter:
                     req.path = "/login.html"
                 else:
                     # print("3333333333333333")
-                    conn.sendall(resp.build_unauthorized())
-                    conn.close()
-                    return
+                    return resp.build_unauthorized()
             # print("4444444444444444")
+        if trace is not None:
+            trace.mark("auth")
+        if req.hook is None and req.allowed and req.path != routed_path:
+            # Rewritten (e.g. GET /login to /login.html): 405 only if the final path is routed too
+            req.allowed = req.routes.match(req.method, req.path)[2]
+        if req.hook is None and req.allowed:
+            # The path is routed, only not for this method
+            return resp.build_error(405, "Method Not Allowed",
+                                    headers={"Allow": ", ".join(req.allowed)})
         # Handle request hook
         if req.hook:
-            print("[HttpAdapter] hook in route-path METHOD {} PATH {}".format(req.hook._route_path,req.hook._route_methods)) # o day bi nguoc ha ta?
+            log.debug("hook {} for {} {}", req.hook.__name__, req.method, req.path)
 
             #req.hook(headers = "bksysnet",body = "get in touch")
-            headers = ""
-            body = ""
-            if "\r\n\r\n" in msg:
-                msg = msg.split("\r\n\r\n")
-                headers = msg[0]
-                body = msg[1]
-            else:
-                headers = msg
-            print("[HttpAdapter] hook in route-path METHOD {} PATH {}".format(req.hook._route_path,req.hook._route_methods))
-            resp.status_code, resp.reason = req.hook(headers = headers,body = body)
-            #
-            # TODO: handle for App hook here
-            #
+            # Header block and body come from the single parse in Request.prepare
+            headers = bytes(req.parsed.head).decode("utf-8", "replace")
+            body = req.body or ""
+            if body_stream is not None:
+                body = body_stream
+            # The handler returns the body itself (and optionally status/headers)
+            resp.prepare_hook_result(req.hook(headers = headers,body = body, **req.params))
+            if trace is not None:
+                trace.mark("hook")
 
-        
         # Build response
         response = resp.build_response(req)
+        if trace is not None:
+            trace.mark("build")
+        return response
+
+    def record_request(self, response, started):
+        """
+        Record the request just handled: :data:`metrics <daemon.metrics.metrics>`,
+        ``Response.elapsed`` and the access log line.
 
+        :param response: what :meth:`handle_request` returned, ``None`` if it raised.
+        :param started (float): value of :meth:`Metrics.begin` when the request was read.
+
+        :rtype str: the response status code.
+        """
+        req, resp = self.request, self.response
+        if response is None:
+            header, size = b"HTTP/1.1 500", None
+        elif isinstance(response, (bytes, bytearray)):
+            header, size = response, len(response)
+        else:
+            header = response.header
+            size = None if isinstance(response, ChunkedResponse) else len(response)
+        # The status code is always at the same offset of "HTTP/1.1 200 OK"
+        status = header[9:12].decode("latin-1")
+
+        # Labelled by route pattern, never by raw path, and by a known method
+        # or "other", never by the raw token, to bound the series
+        method = req.method if req.method in METHODS else "other"
+        if req.hook is not None:
+            route = req.hook._route_path
+        elif resp.static_file is not None:
+            route = "static"
+        else:
+            route = "other"
+        elapsed = metrics.end(method, route, status, started)
+        resp.elapsed = datetime.timedelta(seconds=elapsed)
 
-        #print(response)
-        conn.sendall(response)
-        conn.close()
+        if access_log.is_enabled(INFO):
+            access(self.connaddr, req.method, req.path, req.version, status, size, elapsed)
+        return status
 
     @property
     def extract_cookies(self, req, resp):
@@ -0,0 +1,330 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.logger
+~~~~~~~~~~~~~~~~~
+
+This module provides the leveled, asynchronous logger used by the daemon
+instead of ``print()``.
+
+Serving threads never write to the output themselves: a record is a tuple
+(time, level, logger, message template, arguments) pushed on a bounded queue,
+and a background writer thread formats the records and writes them in
+batches. Formatting is deferred to that thread too, so the arguments should be
+values that are not modified afterwards.
+
+Every module gets its own :class:`Logger <Logger>` from :func:`get_logger`.
+Levels are set per module (or per package prefix) with :func:`configure`; a
+disabled call is a single integer comparison, nothing is formatted or queued.
+Hot paths may be sampled: with ``samples={"daemon.access": 10}`` only one
+record in ten below ``WARNING`` is written for that logger.
+
+Requests are summarised by one compact line of the ``daemon.access`` logger
+(:func:`access`)::
+
+    127.0.0.1:51234 "GET /css/chat.css HTTP/1.1" 200 6393 0.4ms
+
+Usage Example:
+--------------
+>>> configure(level="INFO", levels={"daemon.response": "DEBUG"})
+>>> log = get_logger("daemon.response")
+>>> log.debug("serving {}", path)
+"""
+
+import atexit
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+#: Level names accepted by :func:`configure`.
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+_NAMES = {value: name for name, value in LEVELS.items()}
+
+#: Records waiting to be written; further records are dropped and counted.
+MAX_QUEUE = 65536
+#: Records written between two flushes of the output.
+BATCH_SIZE = 256
+
+
+def _level(value):
+    """Level number of a level name or number."""
+    if isinstance(value, str):
+        try:
+            return LEVELS[value.upper()]
+        except KeyError:
+            raise ValueError("Invalid log level: {}".format(value))
+    return int(value)
+
+
+class LogWriter:
+    """Background thread writing the queued records.
+
+    :attrs stream (file): output of the formatted lines.
+    :attrs dropped (int): records lost because the queue was full.
+    """
+
+    def __init__(self, stream=None, max_queue=MAX_QUEUE):
+        """
+        :param stream (file): output, defaults to ``sys.stdout``.
+        :param max_queue (int): records kept waiting before new ones are dropped.
+        """
+        self.stream = stream
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue = None
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            # The writer thread does not survive a fork: the child starts its own
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        """Drop the parent's queue and lock in a forked child."""
+        self._queue = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """Start the writer thread of this process on first use."""
+        with self._lock:
+            if self._queue is not None:
+                return
+            records = queue.Queue(maxsize=self.max_queue)
+            thread = threading.Thread(target=self._run, args=(records,), name="LogWriter")
+            thread.daemon = True
+            thread.start()
+            self._queue = records
+
+    def put(self, record):
+        """
+        Queue one record, never blocking the caller.
+
+        :param record (tuple): (time, level, logger name, message, args).
+        """
+        if self._queue is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self, records):
+        """Writer loop: block for a record, then write the backlog in one batch."""
+        while True:
+            batch = [records.get()]
+            try:
+                while len(batch) < BATCH_SIZE:
+                    batch.append(records.get_nowait())
+            except queue.Empty:
+                pass
+            self._write(batch)
+            for _ in batch:
+                records.task_done()
+
+    def _write(self, batch):
+        """Format and write ``batch``; a broken record is written as is."""
+        stream = self.stream or sys.stdout
+        lines = []
+        for created, level, name, message, args in batch:
+            if args:
+                try:
+                    message = message.format(*args)
+                except (IndexError, KeyError, ValueError):
+                    message = "{} {!r}".format(message, args)
+            lines.append("{}.{:03d} {} {} {}\n".format(
+                time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created)),
+                int(created % 1 * 1000), _NAMES.get(level, level), name, message))
+        try:
+            stream.write("".join(lines))
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def flush(self, timeout=1.0):
+        """
+        Wait until every record queued by this process is written.
+
+        :param timeout (float): seconds to wait at most.
+        """
+        records = self._queue
+        if records is None:
+            return
+        deadline = time.monotonic() + timeout
+        while records.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+class Logger:
+    """A named logger.
+
+    :attrs name (str): dotted name, usually the module name.
+    :attrs level (int): records below this level are discarded.
+    :attrs sample (int): write one in ``sample`` records below ``WARNING``.
+    """
+
+    __slots__ = ("name", "level", "sample", "_counter")
+
+    def __init__(self, name, level=INFO, sample=1):
+        self.name = name
+        self.level = level
+        self.sample = sample
+        self._counter = itertools.count()
+
+    def is_enabled(self, level):
+        """Tells whether a record of ``level`` would be queued."""
+        return level >= self.level
+
+    def log(self, level, message, *args):
+        """
+        Queue a record; ``message`` is formatted with ``str.format(*args)`` by
+        the writer thread.
+
+        :param level (int): record level.
+        :param message (str): message template.
+        :param args: template arguments.
+        """
+        if level < self.level:
+            return
+        if self.sample > 1 and level < WARNING and next(self._counter) % self.sample:
+            return
+        writer.put((time.time(), level, self.name, message, args))
+
+    def debug(self, message, *args):
+        if DEBUG >= self.level:
+            self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        if INFO >= self.level:
+            self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        self.log(ERROR, message, *args)
+
+    def __repr__(self):
+        return "<Logger {} {}>".format(self.name, _NAMES.get(self.level, self.level))
+
+
+#: Writer shared by every logger of the process.
+writer = LogWriter()
+
+_loggers = {}
+_registry_lock = threading.Lock()
+_default_level = INFO
+_levels = {}
+_samples = {}
+
+
+def _setting(table, name, default):
+    """Most specific value of ``table`` for ``name`` (exact, then parent packages)."""
+    while True:
+        if name in table:
+            return table[name]
+        if "." not in name:
+            return default
+        name = name.rsplit(".", 1)[0]
+
+
+def get_logger(name):
+    """
+    Returns the logger of ``name``, created on first use.
+
+    :param name (str): dotted logger name, e.g. ``__name__``.
+
+    :rtype Logger: the shared logger instance.
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        with _registry_lock:
+            logger = _loggers.get(name)
+            if logger is None:
+                logger = Logger(name, _setting(_levels, name, _default_level),
+                                _setting(_samples, name, 1))
+                _loggers[name] = logger
+    return logger
+
+
+def configure(level=None, levels=None, samples=None, stream=None):
+    """
+    Sets the levels, sampling and output; existing loggers are updated.
+
+    :param level (str|int): default level, ``INFO`` initially.
+    :param levels (dict): logger name or package prefix to level.
+    :param samples (dict): logger name or package prefix to sampling rate.
+    :param stream (file): output of the writer thread.
+    """
+    global _default_level
+    with _registry_lock:
+        if level is not None:
+            _default_level = _level(level)
+        if levels:
+            _levels.update({name: _level(value) for name, value in levels.items()})
+        if samples:
+            _samples.update({name: max(1, int(rate)) for name, rate in samples.items()})
+        if stream is not None:
+            writer.stream = stream
+        for name, logger in _loggers.items():
+            logger.level = _setting(_levels, name, _default_level)
+            logger.sample = _setting(_samples, name, 1)
+
+
+def parse_levels(specs):
+    """
+    Parses ``name=LEVEL`` command-line settings.
+
+    :param specs (list): e.g. ``["daemon.response=DEBUG"]``.
+
+    :rtype dict: logger name to level.
+    :raises ValueError: If a setting is malformed.
+    """
+    levels = {}
+    for spec in specs or ():
+        name, sep, value = spec.partition("=")
+        if not sep or not name:
+            raise ValueError("Invalid log level setting: {}".format(spec))
+        levels[name.strip()] = _level(value.strip())
+    return levels
+
+
+#: Logger of the access lines.
+access_log = get_logger("daemon.access")
+
+
+def access(addr, method, path, version, status, size, elapsed):
+    """
+    Queue the access line of a request.
+
+    :param addr (tuple): client address, ``(host, port)``.
+    :param method (str): request method.
+    :param path (str): request path.
+    :param version (str): request HTTP version.
+    :param status (int): response status code.
+    :param size (int): response bytes, ``None`` if unknown (streamed).
+    :param elapsed (float): seconds spent building the response.
+    """
+    if INFO >= access_log.level:
+        host, port = addr if addr else ("-", "-")
+        access_log.log(INFO, "{}:{} \"{} {} {}\" {} {} {:.1f}ms",
+                       host, port, method, path, version, status,
+                       "-" if size is None else size, elapsed * 1000)
+
+
+atexit.register(writer.flush)
@@ -0,0 +1,212 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.metrics
+~~~~~~~~~~~~~~~~~
+
+This module provides the request metrics recorded by
+:class:`HttpAdapter <HttpAdapter>`: per-route request counters by status
+code, latency histograms and the number of requests in flight.
+
+Recording goes to one of a fixed number of :class:`_Shard` stripes, chosen by
+thread id, each with its own lock: concurrent threads rarely share a stripe, so
+the locks are uncontended, and the memory stays bounded however many threads
+the threaded engine starts over time. :meth:`Metrics.render` merges the shards
+when the metrics are scraped. The counters are per process (one set per
+prefork worker).
+
+:meth:`Metrics.render` produces the Prometheus text exposition format,
+including the static cache and compression counters. It is served by the
+opt-in admin route of :meth:`WeApRous.enable_metrics`.
+
+Usage Example:
+--------------
+>>> started = metrics.begin()
+>>> metrics.end("GET", "/get-list", 200, started)
+>>> print(metrics.render())
+# HELP weaprous_requests_total Requests handled, by route, method and status.
+...
+"""
+
+import bisect
+import threading
+import time
+
+from .staticcache import static_cache
+from .compression import compression_stats
+from .logger import writer
+
+#: Counter stripes; threads are spread over them by thread id.
+SHARDS = 32
+#: Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+#: Methods labelled as themselves; any other client-supplied token is "other".
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"))
+
+
+class _Shard:
+    """One stripe of counters, shared by the threads whose id maps to it.
+
+    :attrs requests (dict): (method, route, status) to count.
+    :attrs latency (dict): (method, route) to ``[bucket counts..., +Inf, sum]``.
+    :attrs in_flight (int): requests started minus requests finished.
+    :attrs lock (threading.Lock): guards the counters of the stripe.
+    """
+
+    __slots__ = ("requests", "latency", "in_flight", "lock")
+
+    def __init__(self):
+        self.requests = {}
+        self.latency = {}
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+
+class Metrics:
+    """Lock-striped request metrics of the process."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS, shards=SHARDS):
+        """
+        :param buckets (tuple): ascending upper bounds of the latency buckets.
+        :param shards (int): number of counter stripes.
+        """
+        self.buckets = tuple(buckets)
+        self.started = time.time()
+        self._shards = tuple(_Shard() for _ in range(shards))
+
+    def _shard(self):
+        """Stripe of the calling thread."""
+        return self._shards[threading.get_ident() % len(self._shards)]
+
+    def begin(self):
+        """
+        Count a request in flight.
+
+        :rtype float: the start time to pass to :meth:`end`.
+        """
+        shard = self._shard()
+        with shard.lock:
+            shard.in_flight += 1
+        return time.perf_counter()
+
+    def end(self, method, route, status, started):
+        """
+        Record a finished request.
+
+        :param method (str): request method.
+        :param route (str): route pattern (not the raw path, to bound cardinality).
+        :param status (int|str): response status code.
+        :param started (float): value returned by :meth:`begin`.
+
+        :rtype float: the request duration in seconds.
+        """
+        elapsed = time.perf_counter() - started
+        bucket = bisect.bisect_left(self.buckets, elapsed)
+        shard = self._shard()
+        with shard.lock:
+            shard.in_flight -= 1
+            key = (method, route, status)
+            shard.requests[key] = shard.requests.get(key, 0) + 1
+            key = (method, route)
+            counts = shard.latency.get(key)
+            if counts is None:
+                counts = shard.latency[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bucket] += 1
+            counts[-1] += elapsed
+        return elapsed
+
+    def snapshot(self):
+        """
+        Merge the shards.
+
+        :rtype dict: ``requests``, ``latency`` and ``in_flight`` totals.
+        """
+        requests, latency, in_flight = {}, {}, 0
+        for shard in self._shards:
+            with shard.lock:
+                in_flight += shard.in_flight
+                shard_requests = dict(shard.requests)
+                shard_latency = {key: list(counts) for key, counts in shard.latency.items()}
+            for key, count in shard_requests.items():
+                requests[key] = requests.get(key, 0) + count
+            for key, counts in shard_latency.items():
+                total = latency.setdefault(key, [0] * (len(counts) - 1) + [0.0])
+                for i, value in enumerate(counts):
+                    total[i] += value
+        return {"requests": requests, "latency": latency, "in_flight": in_flight}
+
+    def render(self):
+        """
+        The metrics in Prometheus text exposition format (version 0.0.4).
+
+        :rtype str: the exposition document.
+        """
+        snap = self.snapshot()
+        lines = [
+            "# HELP weaprous_requests_total Requests handled, by route, method and status.",
+            "# TYPE weaprous_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(snap["requests"].items(), key=str):
+            lines.append('weaprous_requests_total{{route="{}",method="{}",status="{}"}} {}'.format(
+                _escape(route), _escape(method), status, count))
+
+        lines += [
+            "# HELP weaprous_request_duration_seconds Time to build a response, by route and method.",
+            "# TYPE weaprous_request_duration_seconds histogram",
+        ]
+        for (method, route), counts in sorted(snap["latency"].items()):
+            labels = 'route="{}",method="{}"'.format(_escape(route), _escape(method))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append('weaprous_request_duration_seconds_bucket{{{},le="{}"}} {}'.format(
+                    labels, bound, cumulative))
+            lines.append("weaprous_request_duration_seconds_sum{{{}}} {:.6f}".format(labels, counts[-1]))
+            lines.append("weaprous_request_duration_seconds_count{{{}}} {}".format(labels, cumulative))
+
+        cache = static_cache.stats()
+        gzip = compression_stats.stats()
+        lines += [
+            "# HELP weaprous_requests_in_flight Requests being handled.",
+            "# TYPE weaprous_requests_in_flight gauge",
+            "weaprous_requests_in_flight {}".format(snap["in_flight"]),
+            "# HELP weaprous_static_cache_hits_total Static cache lookups served from memory.",
+            "# TYPE weaprous_static_cache_hits_total counter",
+            "weaprous_static_cache_hits_total {}".format(cache["hits"]),
+            "# HELP weaprous_static_cache_misses_total Static cache lookups that read the disk.",
+            "# TYPE weaprous_static_cache_misses_total counter",
+            "weaprous_static_cache_misses_total {}".format(cache["misses"]),
+            "# HELP weaprous_static_cache_bytes Bytes of file content held by the static cache.",
+            "# TYPE weaprous_static_cache_bytes gauge",
+            "weaprous_static_cache_bytes {}".format(cache["bytes"]),
+            "# HELP weaprous_gzip_bytes_saved_total Bytes saved by gzip encoded responses.",
+            "# TYPE weaprous_gzip_bytes_saved_total counter",
+            "weaprous_gzip_bytes_saved_total {}".format(gzip["bytes_saved"]),
+            "# HELP weaprous_log_records_dropped_total Log records lost to a full queue.",
+            "# TYPE weaprous_log_records_dropped_total counter",
+            "weaprous_log_records_dropped_total {}".format(writer.dropped),
+            "# HELP weaprous_start_time_seconds Start time of the process since the epoch.",
+            "# TYPE weaprous_start_time_seconds gauge",
+            "weaprous_start_time_seconds {:.3f}".format(self.started),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+#: Metrics shared by every :class:`HttpAdapter <HttpAdapter>` of the process.
+metrics = Metrics()
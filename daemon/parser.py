@@ -0,0 +1,148 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.parser
+~~~~~~~~~~~~~~~~~
+
+This module provides a single-pass HTTP request parser working on ``bytes``.
+
+:func:`parse_request` locates the end of the header block once and splits the
+request line. The header block and the body are then exposed as
+:class:`memoryview` slices of the original buffer, so nothing is decoded or
+copied until a caller asks for it. The first :meth:`ParsedRequest.header`
+lookup scans the header lines once into a lower-cased index, which the later
+lookups of the request reuse.
+
+Usage Example:
+--------------
+>>> p = parse_request(b"GET /get-list?x=1 HTTP/1.1\\r\\nHost: a\\r\\n\\r\\n")
+>>> p.method, p.path, p.query, p.version
+(b'GET', b'/get-list', b'x=1', b'HTTP/1.1')
+>>> p.header(b"host")
+b'a'
+"""
+
+
+class ParsedRequest:
+    """The result of :func:`parse_request`.
+
+    :attrs raw (bytes): the whole request.
+    :attrs buf (memoryview): zero-copy view of ``raw``.
+    :attrs method (bytes): HTTP verb.
+    :attrs path (bytes): request target without the query string.
+    :attrs query (bytes): query string, ``b""`` when absent.
+    :attrs version (bytes): protocol version, e.g. ``b"HTTP/1.1"``.
+    :attrs line_end (int): offset where the request line ends.
+    :attrs head_stop (int): offset where the header block ends.
+    :attrs head_end (int): offset of the first body byte.
+    """
+
+    __slots__ = ("raw", "buf", "method", "path", "query", "version",
+                 "line_end", "head_stop", "head_end", "_index")
+
+    def __init__(self, raw, method, path, query, version, line_end, head_stop, head_end):
+        self.raw = raw
+        self.buf = memoryview(raw)
+        self.method = method
+        self.path = path
+        self.query = query
+        self.version = version
+        self.line_end = line_end
+        self.head_stop = head_stop
+        self.head_end = head_end
+        self._index = None
+
+    @property
+    def head(self):
+        """Header block (request line and headers, without the blank line)."""
+        return self.buf[:self.head_stop]
+
+    @property
+    def fields(self):
+        """Header lines (without the request line)."""
+        return self.buf[self.line_end + 2:self.head_stop]
+
+    @property
+    def body(self):
+        """Body bytes following the header block."""
+        return self.buf[self.head_end:]
+
+    @property
+    def terminated(self):
+        """``True`` if the blank line ending the header block was received."""
+        return self.head_end != self.head_stop
+
+    def header_items(self):
+        """
+        Iterate over the headers in request order.
+
+        :rtype iterator: ``(name, value)`` byte pairs; names keep their original
+                         case and values are stripped.
+        """
+        # Located in place: only the names and values themselves are copied
+        raw, stop = self.raw, self.head_stop
+        pos = self.line_end + 2
+        while pos < stop:
+            end = raw.find(b"\r\n", pos, stop)
+            if end < 0:
+                end = stop
+            colon = raw.find(b":", pos, end)
+            if colon >= 0:
+                yield raw[pos:colon].strip(), raw[colon + 1:end].strip()
+            pos = end + 2
+
+    def header(self, name):
+        """
+        Returns the value of the first header called ``name``.
+
+        :param name (bytes): lower-case header name.
+
+        :rtype bytes: the value, or ``None`` if absent.
+        """
+        index = self._index
+        if index is None:
+            index = {}
+            for key, value in self.header_items():
+                index.setdefault(key.lower(), value)
+            self._index = index
+        return index.get(name)
+
+
+def parse_request(data):
+    """
+    Parses a raw HTTP request, locating the header block with a single scan.
+
+    :param data (bytes): the raw request (``bytes``, ``bytearray`` or ``memoryview``).
+
+    :rtype ParsedRequest: the parsed request, or ``None`` if the request line is
+                          malformed.
+    """
+    raw = data if isinstance(data, bytes) else bytes(data)
+    size = len(raw)
+
+    head_stop = raw.find(b"\r\n\r\n")
+    if head_stop < 0:
+        head_stop = head_end = size
+    else:
+        head_end = head_stop + 4
+
+    line_end = raw.find(b"\r\n", 0, head_stop)
+    if line_end < 0:
+        line_end = head_stop
+    parts = raw[:line_end].split()
+    if len(parts) != 3:
+        return None
+    method, target, version = parts
+    path, _, query = target.partition(b"?")
+
+    return ParsedRequest(raw, method, path, query, version, line_end, head_stop, head_end)
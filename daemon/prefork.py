@@ -0,0 +1,284 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.prefork
+~~~~~~~~~~~~~~~~~
+
+This module provides a pre-fork multi-process runner shared by the backend and
+the proxy. A supervisor process forks N workers which all accept on the same
+port, so a server is no longer limited to the single core the GIL allows.
+
+- With ``SO_REUSEPORT`` (Linux, BSD) every worker binds its own listening socket
+  and the kernel balances new connections between them.
+- Without it the supervisor binds one socket before forking and the workers
+  share it (classic pre-fork accept).
+
+The supervisor restarts crashed workers, optionally pins each worker to a CPU
+and aggregates per-worker counters kept in shared memory.
+
+Usage Example:
+--------------
+>>> def serve(server):
+...     run_backend("0.0.0.0", 9000, routes, server=server)
+>>> run_prefork("0.0.0.0", 9000, serve, processes=4, cpu_affinity=True)
+"""
+
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+from .logger import get_logger, writer
+
+log = get_logger(__name__)
+
+#: Counters kept per worker slot in shared memory.
+_FIELDS = ("pid", "connections", "restarts")
+
+#: Shared counters of the current worker process, set after fork.
+_slot = None
+_slot_lock = threading.Lock()
+
+
+def record_connection():
+    """
+    Count an accepted connection for the current prefork worker.
+
+    Outside of a prefork worker this is a no-op, so the serving engines can
+    call it unconditionally.
+    """
+    if _slot is None:
+        return
+    array, base = _slot
+    with _slot_lock:
+        array[base + 1] += 1
+
+
+def bind_socket(ip, port, backlog=128, reuse_port=False):
+    """
+    Creates a listening TCP socket.
+
+    :param ip (str): IP address to bind.
+    :param port (int): port number to listen on.
+    :param backlog (int): listen backlog.
+    :param reuse_port (bool): set ``SO_REUSEPORT`` so sibling processes can bind the same port.
+
+    :rtype socket.socket: the bound and listening socket.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server.bind((ip, port))
+    server.listen(backlog)
+    return server
+
+
+def _resolve_cpus(cpu_affinity, processes):
+    """Returns the CPU each worker slot is pinned to, or ``None`` per slot."""
+    if not cpu_affinity or not hasattr(os, "sched_setaffinity"):
+        return [None] * processes
+    if cpu_affinity is True:
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(cpu_affinity)
+    return [cpus[i % len(cpus)] for i in range(processes)]
+
+
+class PreforkSupervisor:
+    """Forks, watches and restarts the worker processes of a server.
+
+    :attrs ip (str): IP address the workers listen on.
+    :attrs port (int): port the workers listen on.
+    :attrs serve (callable): ``serve(server)`` run by each worker with its listening socket.
+    :attrs processes (int): number of worker processes.
+    :attrs name (str): label used in the log lines.
+    """
+
+    def __init__(self, ip, port, serve, processes=None, cpu_affinity=False,
+                 backlog=128, name="Prefork"):
+        """
+        Initialize a new PreforkSupervisor instance.
+
+        :param ip (str): IP address to bind.
+        :param port (int): port number to listen on.
+        :param serve (callable): per-worker serving loop, called with the listening socket.
+        :param processes (int): number of workers, defaults to the CPU count.
+        :param cpu_affinity (bool|list): ``True`` pins worker i to the i-th usable
+                                         CPU, a list gives the CPUs explicitly.
+        :param backlog (int): listen backlog of each socket.
+        :param name (str): label used in the log lines.
+        """
+        self.ip = ip
+        self.port = port
+        self.serve = serve
+        self.processes = processes or os.cpu_count() or 1
+        self.backlog = backlog
+        self.name = name
+        self.cpus = _resolve_cpus(cpu_affinity, self.processes)
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+
+        self._counters = multiprocessing.RawArray("q", self.processes * len(_FIELDS))
+        self._pids = {}
+        self._started = {}
+        self._shared = None
+        self._stopping = False
+
+    def _spawn(self, index):
+        """Fork the worker of slot ``index``."""
+        sys.stdout.flush()
+        self._started[index] = time.monotonic()
+        pid = os.fork()
+        if pid:
+            self._pids[pid] = index
+            self._counters[index * len(_FIELDS)] = pid
+            return
+
+        # Child process: never returns into the supervisor loop.
+        global _slot
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            _slot = (self._counters, index * len(_FIELDS))
+            cpu = self.cpus[index]
+            if cpu is not None:
+                os.sched_setaffinity(0, {cpu})
+            if self._shared is not None:
+                server = self._shared
+            else:
+                server = bind_socket(self.ip, self.port, self.backlog, reuse_port=True)
+            log.info("[{}] worker {} pid {} serving{}",
+                     self.name, index, os.getpid(),
+                     "" if cpu is None else " on cpu {}".format(cpu))
+            self.serve(server)
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            log.error("[{}] worker {} crashed: {!r}", self.name, index, e)
+            code = 1
+        finally:
+            # os._exit skips atexit: write the pending log lines first
+            writer.flush()
+            os._exit(code)
+
+    def stats(self):
+        """
+        Aggregated counters of every worker slot.
+
+        :rtype dict: totals plus a per-worker list of ``pid``, ``connections`` and ``restarts``.
+        """
+        n = len(_FIELDS)
+        workers = [
+            dict(zip(_FIELDS, self._counters[i * n:(i + 1) * n]))
+            for i in range(self.processes)
+        ]
+        return {
+            "processes": self.processes,
+            "alive": len(self._pids),
+            "connections": sum(w["connections"] for w in workers),
+            "restarts": sum(w["restarts"] for w in workers),
+            "workers": workers,
+        }
+
+    def _stop(self, signum, frame):
+        """Signal handler: terminate the workers and leave the supervisor loop."""
+        self._stopping = True
+
+    def run(self, stats_interval=0):
+        """
+        Fork the workers and supervise them until SIGINT/SIGTERM.
+
+        :param stats_interval (float): print aggregated stats every N seconds, 0 disables it.
+        """
+        if not self.reuse_port:
+            # Shared accept socket, inherited by every forked worker.
+            self._shared = bind_socket(self.ip, self.port, self.backlog)
+
+        log.info("[{}] Listening on port {} with {} worker processes ({})",
+                 self.name, self.port, self.processes,
+                 "SO_REUSEPORT" if self.reuse_port else "shared socket")
+
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        for index in range(self.processes):
+            self._spawn(index)
+
+        last_report = time.monotonic()
+        while not self._stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid and pid in self._pids:
+                index = self._pids.pop(pid)
+                log.warning("[{}] worker {} pid {} exited with status {}, restarting",
+                            self.name, index, pid, status)
+                self._counters[index * len(_FIELDS) + 2] += 1
+                if time.monotonic() - self._started[index] < 1.0:
+                    # Crash loop (e.g. bind failure): do not fork at full speed.
+                    time.sleep(1.0)
+                self._spawn(index)
+                continue
+
+            time.sleep(0.2)
+            if stats_interval and time.monotonic() - last_report >= stats_interval:
+                last_report = time.monotonic()
+                s = self.stats()
+                log.info("[{}] alive={}/{} connections={} restarts={}",
+                         self.name, s["alive"], s["processes"], s["connections"], s["restarts"])
+
+        self.shutdown()
+
+    def shutdown(self):
+        """Terminate and reap every worker."""
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self._pids):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self._pids.pop(pid, None)
+
+
+def run_prefork(ip, port, serve, processes=None, cpu_affinity=False,
+                stats_interval=0, backlog=128, name="Prefork"):
+    """
+    Entry point for running ``serve`` in a supervised pool of worker processes.
+
+    Platforms without ``os.fork`` (Windows) fall back to a single process.
+
+    :param ip (str): IP address to bind.
+    :param port (int): port number to listen on.
+    :param serve (callable): per-worker serving loop, called with the listening socket.
+    :param processes (int): number of workers, defaults to the CPU count.
+    :param cpu_affinity (bool|list): pin workers to CPUs (see :class:`PreforkSupervisor`).
+    :param stats_interval (float): print aggregated stats every N seconds, 0 disables it.
+    :param backlog (int): listen backlog of each socket.
+    :param name (str): label used in the log lines.
+    """
+    if not hasattr(os, "fork"):
+        log.warning("[{}] os.fork is not available, serving in a single process", name)
+        serve(bind_socket(ip, port, backlog))
+        return
+
+    supervisor = PreforkSupervisor(ip, port, serve, processes=processes,
+                                   cpu_affinity=cpu_affinity, backlog=backlog, name=name)
+    supervisor.run(stats_interval=stats_interval)
@@ -0,0 +1,239 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.profiler
+~~~~~~~~~~~~~~~~~
+
+This module provides the on-demand sampling profiler of a running server.
+
+A profile is time-boxed: :meth:`SamplingProfiler.start` launches a sampling
+thread that, every ``interval`` seconds for ``duration`` seconds, reads the
+stack of every thread with :func:`sys._current_frames`. Only threads inside
+:meth:`HttpAdapter.handle_request` are counted, and each sample is filed under
+the route being handled (the route pattern, ``static`` or ``other``, as in
+:mod:`daemon.metrics`), so the result shows the hot spots of every route.
+
+Nothing is installed on the serving path: no trace or profile hook, no per
+request bookkeeping. While no profile runs the profiler costs nothing; while
+one runs, the sampling thread holds the GIL for a stack walk per interval.
+
+The result is available as collapsed stacks (``route;frame;...;frame count``,
+the input of ``flamegraph.pl`` and speedscope) or as a JSON summary of the
+functions with the most samples, per route. Profiles are per process, i.e.
+per prefork worker.
+
+Usage Example:
+--------------
+>>> profiler.start(duration=10, interval=0.005)
+True
+>>> time.sleep(10)
+>>> print(profiler.result().collapsed())
+/get-list;httpadapter.py:HttpAdapter.handle_request;start_tracker.py:get_list 42
+"""
+
+import collections
+import os
+import sys
+import threading
+import time
+
+from .httpadapter import HttpAdapter
+
+#: Profile duration when none is given, in seconds.
+DEFAULT_DURATION = 10.0
+#: Longest profile accepted, in seconds.
+MAX_DURATION = 120.0
+#: Seconds between two samples when none is given.
+DEFAULT_INTERVAL = 0.005
+#: Shortest sampling interval accepted, in seconds.
+MIN_INTERVAL = 0.001
+#: Frames kept per sample, from the request handler down.
+MAX_DEPTH = 64
+
+_HANDLE_REQUEST = HttpAdapter.handle_request.__code__
+
+
+def _frame_name(code):
+    """Flame graph label of a code object, e.g. ``response.py:Response.build_response``."""
+    return "{}:{}".format(os.path.basename(code.co_filename),
+                          getattr(code, "co_qualname", code.co_name))
+
+
+def _route_of(frame):
+    """Route label of the request handled by the ``handle_request`` ``frame``."""
+    adapter = frame.f_locals.get("self")
+    if adapter is None:
+        return "other"
+    hook = adapter.request.hook
+    if hook is not None:
+        return getattr(hook, "_route_path", hook.__name__)
+    if adapter.response.static_file is not None:
+        return "static"
+    return "other"
+
+
+class Profile:
+    """Samples collected by one profiling run.
+
+    :attrs started (float): start time since the epoch.
+    :attrs duration (float): seconds actually profiled.
+    :attrs interval (float): seconds between two samples.
+    :attrs ticks (int): sampling rounds taken.
+    :attrs samples (int): stacks recorded (one per busy handler thread per round).
+    :attrs stacks (Counter): ``(route, frames)`` to sample count, ``frames``
+                             from the request handler down to the leaf.
+    """
+
+    def __init__(self, interval):
+        self.started = time.time()
+        self.duration = 0.0
+        self.interval = interval
+        self.ticks = 0
+        self.samples = 0
+        self.stacks = collections.Counter()
+
+    def collapsed(self):
+        """
+        The samples in collapsed stack format, one stack per line.
+
+        :rtype str: ``route;outer;...;leaf count`` lines.
+        """
+        lines = ["{};{} {}".format(route, ";".join(frames), count)
+                 for (route, frames), count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def hot_spots(self, limit=20):
+        """
+        The functions with the most samples, per route.
+
+        ``self`` counts the samples where the function was running, ``total``
+        those where it was anywhere on the stack.
+
+        :param limit (int): functions listed per route.
+
+        :rtype dict: the run settings and, per route, its sample count and top functions.
+        """
+        routes = {}
+        for (route, frames), count in self.stacks.items():
+            entry = routes.setdefault(route, {"samples": 0,
+                                              "self": collections.Counter(),
+                                              "total": collections.Counter()})
+            entry["samples"] += count
+            entry["self"][frames[-1]] += count
+            for name in set(frames):
+                entry["total"][name] += count
+
+        def top(counter, samples):
+            return [{"function": name, "samples": count,
+                     "percent": round(100.0 * count / samples, 1)}
+                    for name, count in counter.most_common(limit)]
+
+        return {
+            "started": self.started,
+            "duration": round(self.duration, 3),
+            "interval": self.interval,
+            "ticks": self.ticks,
+            "samples": self.samples,
+            "routes": {
+                route: {"samples": entry["samples"],
+                        "self": top(entry["self"], entry["samples"]),
+                        "total": top(entry["total"], entry["samples"])}
+                for route, entry in sorted(routes.items(), key=lambda item: -item[1]["samples"])
+            },
+        }
+
+
+class SamplingProfiler:
+    """Runs one time-boxed profile at a time and keeps the last result.
+
+    :attrs running (bool): a profile is being collected.
+    """
+
+    def __init__(self):
+        self.running = False
+        self._result = None
+        self._lock = threading.Lock()
+
+    def start(self, duration=DEFAULT_DURATION, interval=DEFAULT_INTERVAL):
+        """
+        Start profiling in a background thread.
+
+        :param duration (float): seconds to profile, at most :data:`MAX_DURATION`.
+        :param interval (float): seconds between samples, at least :data:`MIN_INTERVAL`.
+
+        :rtype bool: ``False`` if a profile is already running.
+        :raises ValueError: If ``duration`` or ``interval`` is out of range.
+        """
+        if not 0 < duration <= MAX_DURATION:
+            raise ValueError("Profile duration must be within (0, {}] seconds".format(MAX_DURATION))
+        if not MIN_INTERVAL <= interval < duration:
+            raise ValueError("Sampling interval must be within [{}, duration) seconds".format(MIN_INTERVAL))
+        with self._lock:
+            if self.running:
+                return False
+            self.running = True
+        thread = threading.Thread(target=self._run, args=(duration, interval), name="Profiler")
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def result(self):
+        """
+        The last finished profile.
+
+        :rtype Profile: the profile, ``None`` if none finished yet.
+        """
+        return self._result
+
+    def _run(self, duration, interval):
+        """Sampling loop of the profiler thread."""
+        profile = Profile(interval)
+        own = threading.get_ident()
+        begin = time.perf_counter()
+        deadline = begin + duration
+        try:
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                self._sample(profile, own)
+                time.sleep(max(0.0, min(interval - (time.perf_counter() - now), deadline - now)))
+        finally:
+            profile.duration = time.perf_counter() - begin
+            self._result = profile
+            self.running = False
+
+    def _sample(self, profile, own):
+        """Record the stack of every thread busy handling a request."""
+        profile.ticks += 1
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                if code is _HANDLE_REQUEST:
+                    break
+                frames.append(code)
+                frame = frame.f_back
+            if frame is None:
+                continue  # idle thread, or not serving a request
+            frames.append(code)
+            del frames[:-MAX_DEPTH]
+            route = _route_of(frame)
+            profile.stacks[(route, tuple(_frame_name(c) for c in reversed(frames)))] += 1
+            profile.samples += 1
+
+
+#: Profiler of the process, driven by the admin route of :meth:`WeApRous.enable_profiler`.
+profiler = SamplingProfiler()
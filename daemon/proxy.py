@@ -25,6 +25,7 @@ Requirement:
 - response: customized :class: `Response <Response>` utilities.
 - httpadapter: :class: `HttpAdapter <HttpAdapter >` adapter for HTTP request processing.
 - dictionary: :class: `CaseInsensitiveDict <CaseInsensitiveDict>` for managing headers and cookies.
+- upstream: :class: `UpstreamPool <UpstreamPool>` of keep-alive backend connections.
 
 """
 import socket
@@ -32,6 +33,12 @@ import threading
 from .response import *
 from .httpadapter import HttpAdapter
 from .dictionary import CaseInsensitiveDict
+from .prefork import run_prefork, record_connection
+from .reader import RequestReader, RequestError, header_value
+from .logger import get_logger
+from .upstream import upstream_pool
+
+log = get_logger(__name__)
 
 #: A dictionary mapping hostnames to backend IP and port tuples.
 #: Used to determine routing targets for incoming requests.
@@ -42,44 +49,71 @@ PROXY_PASS = {
 }
 
 
+#: Methods a backend may safely receive twice, see :func:`forward_request`.
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+
 _roundrobin_index = {}
 _roundrobin_lock = threading.Lock()
 
+def set_connection_header(message, value):
+    """
+    Rewrites the ``Connection`` header of a raw request or response, dropping
+    ``Keep-Alive`` (both are hop-by-hop headers).
+
+    The backend connections are kept alive and pooled, while the client
+    connection is closed after its response.
+
+    :params message (bytes): header block, optionally followed by the body.
+    :params value (bytes): new ``Connection`` value, ``b"keep-alive"`` or ``b"close"``.
+
+    :rtype bytes: the message with the new ``Connection`` header.
+    """
+    head, sep, body = message.partition(b"\r\n\r\n")
+    lines = [line for line in head.split(b"\r\n")
+             if not line.lower().startswith((b"connection:", b"keep-alive:"))]
+    lines.append(b"Connection: " + value)
+    return b"\r\n".join(lines) + b"\r\n\r\n" + body
+
+
 def forward_request(host, port, request):
     """
     Forwards an HTTP request to a backend server and retrieves the response.
 
+    The request goes over a pooled keep-alive connection (see
+    :mod:`daemon.upstream`) and the response is framed by its headers, so
+    the connection can serve the next request. A pooled connection the
+    backend closed meanwhile is replaced once by a new one, for idempotent
+    methods only: the backend may have processed a ``POST`` before closing.
+
     :params host (str): IP address of the backend server.
     :params port (int): port number of the backend server.
-    :params request (str): incoming HTTP request.
+    :params request (bytes): incoming HTTP request, header block and body.
 
-    :rtype bytes: Raw HTTP response from the backend server. If the connection
-                  fails, returns a 404 Not Found response.
+    :rtype bytes: Raw HTTP response from the backend server. If the backend
+                  cannot be reached or answers garbage, a 502 Bad Gateway.
     """
 
-    backend = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
+    data = set_connection_header(request, b"keep-alive")
+    method = request.split(b" ", 1)[0].decode("latin-1")
     try:
-        backend.connect((host, port))
-        backend.sendall(request.encode())
-        response = b""
-        while True:
-            chunk = backend.recv(4096)
-            if not chunk:
-                break
-            response += chunk
-        return response
-    except socket.error as e:
-      print("Socket error: {}".format(e))
-      return (
-            "HTTP/1.1 404 Not Found\r\n"
-            "Content-Type: text/plain\r\n"
-            "Content-Length: 13\r\n"
-            "Connection: close\r\n"
-            "\r\n"
-            "404 Not Found"
-        ).encode('utf-8')
-
+        for attempt in (0, 1):
+            upstream = upstream_pool.checkout(host, port)
+            try:
+                upstream.sock.sendall(data)
+                head, body, reusable = upstream.reader.read_response(method)
+            except ConnectionError:
+                upstream_pool.release(upstream, False)
+                if upstream.reused and not attempt and method in IDEMPOTENT_METHODS:
+                    continue
+                raise
+            except BaseException:
+                upstream_pool.release(upstream, False)
+                raise
+            upstream_pool.release(upstream, reusable)
+            return set_connection_header(head, b"close") + body
+    except (socket.error, RequestError) as e:
+      log.error("Socket error: {}", e)
+      return Response().build_error(502, "Bad Gateway")
 
 def resolve_routing_policy(hostname, routes):
     """
@@ -91,19 +125,16 @@ def resolve_routing_policy(hostname, routes):
     :params routes (dict): dictionary mapping hostnames and location.
     """
 
-    print(hostname)
     #proxy_map, policy = routes.get(hostname,('127.0.0.1:9000','round-robin'))
     proxy_map, policy = routes.get(hostname,('192.168.1.82:9000','round-robin'))
     #proxy_map, policy = routes.get(hostname,PROXY_PASS)
-    print (proxy_map)
-    print (policy)
+    log.debug("hostname {} proxy_map {} policy {}", hostname, proxy_map, policy)
 
     proxy_host = ''
     proxy_port = '9000'
     if isinstance(proxy_map, list):
         if len(proxy_map) == 0:
-            print("[Proxy] Emtpy resolved routing of hostname {}".format(hostname))
-            print ("Empty proxy_map result")
+            log.warning("Empty resolved routing of hostname {}", hostname)
             # TODO: implement the error handling for non mapped host
             #       the policy is design by team, but it can be 
             #       basic default host in your self-defined system
@@ -126,7 +157,7 @@ def resolve_routing_policy(hostname, routes):
             proxy_host = '127.0.0.1'
             proxy_port = '9000'
     else:
-        print("[Proxy] resolve route of hostname {} is a singulair to".format(hostname))
+        log.debug("resolve route of hostname {} is a singular to", hostname)
         proxy_host, proxy_port = proxy_map.split(":", 2)
 
     return proxy_host, proxy_port
@@ -141,7 +172,11 @@ def handle_client(ip, port, conn, addr, routes):
     condition,it forwards the request to the appropriate backend.
 
     The handler sends the backend response back to the client or
-    returns 404 if the hostname is unreachable or is not recognized.
+    returns 404 if the hostname is unreachable or is not recognized, or 400
+    if the request has no Host header.
+
+    The request is kept as bytes: its body is forwarded as received, whatever
+    its encoding.
 
     :params ip (str): IP address of the proxy server.
     :params port (int): port number of the proxy server.
@@ -150,14 +185,31 @@ def handle_client(ip, port, conn, addr, routes):
     :params routes (dict): dictionary mapping hostnames and location.
     """
 
-    request = conn.recv(1024).decode()
+    record_connection()
+    # The proxy forwards whole requests, so bodies are buffered (up to the
+    # reader's max_body_size) rather than streamed.
+    reader = RequestReader(conn, stream_threshold=None)
+    try:
+        head, body = reader.read_request()
+    except (RequestError, socket.error) as e:
+        if isinstance(e, RequestError):
+            conn.sendall(Response().build_error(e.status_code, e.reason))
+        conn.close()
+        return
+    if head is None:
+        conn.close()
+        return
+    request = head + body
 
     # Extract hostname
-    for line in request.splitlines():
-        if line.lower().startswith('host:'):
-            hostname = line.split(':', 1)[1].strip()
+    hostname = header_value(head, b"host")
+    if not hostname:
+        conn.sendall(Response().build_error(400, "Bad Request"))
+        conn.close()
+        return
+    hostname = hostname.decode("latin-1")
 
-    print("[Proxy] {} at Host: {}".format(addr, hostname))
+    log.debug("{} at Host: {}", addr, hostname)
 
     # Resolve the matching destination in routes and need conver port
     # to integer value
@@ -165,11 +217,11 @@ def handle_client(ip, port, conn, addr, routes):
     try:
         resolved_port = int(resolved_port)
     except ValueError:
-        print("Not a valid integer")
+        log.warning("Not a valid port: {}", resolved_port)
 
     if resolved_host:
-        print("[Proxy] Host name {} is forwarded to {}:{}".format(hostname,resolved_host, resolved_port))
-        response = forward_request(resolved_host, resolved_port, request)        
+        log.debug("Host name {} is forwarded to {}:{}", hostname, resolved_host, resolved_port)
+        response = forward_request(resolved_host, resolved_port, request)
     else:
         response = (
             "HTTP/1.1 404 Not Found\r\n"
@@ -182,7 +234,7 @@ def handle_client(ip, port, conn, addr, routes):
     conn.sendall(response)
     conn.close()
 
-def run_proxy(ip, port, routes):
+def run_proxy(ip, port, routes, server=None):
     """
     Starts the proxy server and listens for incoming connections. 
 
@@ -194,15 +246,18 @@ def run_proxy(ip, port, routes):
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params server (socket.socket, optional): already listening socket, e.g. in a prefork worker.
 
     """
 
-    proxy = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    proxy = server
 
     try:
-        proxy.bind((ip, port))
-        proxy.listen(50)
-        print("[Proxy] Listening on IP {} port {}".format(ip,port))
+        if proxy is None:
+            proxy = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            proxy.bind((ip, port))
+            proxy.listen(50)
+        log.info("Listening on IP {} port {}", ip, port)
         while True:
             conn, addr = proxy.accept()
             #
@@ -217,15 +272,26 @@ def run_proxy(ip, port, routes):
             client_thread.daemon = True  # Thread will die when main program exits
             client_thread.start()
     except socket.error as e:
-      print("Socket error: {}".format(e))
+      log.error("Socket error: {}", e)
 
-def create_proxy(ip, port, routes):
+def create_proxy(ip, port, routes, processes=1, cpu_affinity=False, stats_interval=0):
     """
     Entry point for launching the proxy server.
 
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params processes (int): number of prefork worker processes, 1 serves in this process.
+    :params cpu_affinity (bool|list): pin each prefork worker to one CPU.
+    :params stats_interval (float): print aggregated worker stats every N seconds.
     """
 
-    run_proxy(ip, port, routes)
+    if processes == 1:
+        run_proxy(ip, port, routes)
+        return
+
+    def serve(server):
+        run_proxy(ip, port, routes, server=server)
+
+    run_prefork(ip, port, serve, processes=processes, cpu_affinity=cpu_affinity,
+                stats_interval=stats_interval, name="Proxy")
@@ -0,0 +1,423 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.reader
+~~~~~~~~~~~~~~~~~
+
+This module provides the incremental HTTP request readers used in place of a
+single ``conn.recv(1024)``.
+
+- :class:`RequestReader <RequestReader>` reads from a blocking socket: it buffers
+  until the end of the header block, then reads exactly ``Content-Length`` bytes
+  or decodes ``Transfer-Encoding: chunked``. Bodies larger than
+  ``stream_threshold`` are handed out as a :class:`BodyStream <BodyStream>`
+  which pulls from the socket on demand instead of one giant string.
+- :func:`frame_request` does the same framing on an in-memory buffer for the
+  non-blocking engines.
+
+Chunked requests are re-framed: the returned header block carries a
+``Content-Length`` (or nothing for streamed bodies) instead of
+``Transfer-Encoding``, so the body handed out is always the decoded payload.
+
+Size limits are enforced with :class:`RequestError <RequestError>`, which
+carries the HTTP status to answer with (431 for headers, 413 for bodies).
+
+Usage Example:
+--------------
+>>> reader = RequestReader(conn, max_body_size=10 * 1024 * 1024)
+>>> head, body = reader.read_request()
+"""
+
+import io
+
+#: Largest accepted header block in bytes.
+MAX_HEADER_SIZE = 64 * 1024
+#: Largest accepted request body in bytes.
+MAX_BODY_SIZE = 10 * 1024 * 1024
+#: Bodies above this size are handed out as a :class:`BodyStream`.
+STREAM_THRESHOLD = 1024 * 1024
+#: Size of a single socket read.
+RECV_SIZE = 65536
+
+
+class RequestError(Exception):
+    """A malformed or oversized request.
+
+    :attrs status_code (int): HTTP status to answer with.
+    :attrs reason (str): HTTP reason phrase.
+    """
+
+    def __init__(self, status_code, reason):
+        super().__init__("{} {}".format(status_code, reason))
+        self.status_code = status_code
+        self.reason = reason
+
+
+def header_value(head, name):
+    """
+    Returns the value of the first header ``name`` in a raw header block.
+
+    :param head (bytes): raw header block.
+    :param name (bytes): lower-case header name.
+
+    :rtype bytes: the stripped value, or ``None`` if absent.
+    """
+    for line in head.split(b"\r\n")[1:]:
+        key, sep, value = line.partition(b":")
+        if sep and key.strip().lower() == name:
+            return value.strip()
+    return None
+
+
+def header_values(head, name):
+    """
+    Returns the values of every header ``name`` in a raw header block, comma
+    separated lists split into their items.
+
+    :param head (bytes): raw header block.
+    :param name (bytes): lower-case header name.
+
+    :rtype list: the stripped items, in order.
+    """
+    values = []
+    for line in head.split(b"\r\n")[1:]:
+        key, sep, value = line.partition(b":")
+        if sep and key.strip().lower() == name:
+            values += [item.strip() for item in value.split(b",")]
+    return values
+
+
+def body_framing(head, max_body_size=MAX_BODY_SIZE):
+    """
+    Determines how the body following ``head`` is framed (RFC 9112 section 6.3).
+
+    ``Transfer-Encoding`` wins over ``Content-Length``, and its final coding
+    must be ``chunked``: any other length is unknown. ``Content-Length`` must
+    be ASCII digits, and repeated values must agree.
+
+    :param head (bytes): raw header block.
+    :param max_body_size (int): largest accepted body.
+
+    :rtype tuple: (``"chunked"``, None) or (``"length"``, number of bytes).
+    :raises RequestError: If the framing headers are invalid or too large.
+    """
+    encodings = header_values(head, b"transfer-encoding")
+    if encodings:
+        if encodings[-1].lower() != b"chunked":
+            raise RequestError(400, "Bad Request")
+        # A Content-Length next to it is ignored (reframe_head drops it)
+        return "chunked", None
+    lengths = set(header_values(head, b"content-length"))
+    if not lengths:
+        return "length", 0
+    if len(lengths) > 1:
+        raise RequestError(400, "Bad Request")
+    length = lengths.pop()
+    if not length.isdigit():
+        # bytes.isdigit() is ASCII only; int() would also take "+5" or "1_0"
+        raise RequestError(400, "Bad Request")
+    length = int(length)
+    if length > max_body_size:
+        raise RequestError(413, "Payload Too Large")
+    return "length", length
+
+
+def reframe_head(head, length=None):
+    """
+    Drops ``Transfer-Encoding``/``Content-Length`` from a header block and sets
+    ``Content-Length`` to the decoded body size when it is known.
+
+    A message that carried both headers may be a smuggling attempt: it gets
+    ``Connection: close`` so the connection ends after the exchange.
+
+    :param head (bytes): raw header block, ending with the blank line.
+    :param length (int): decoded body length, ``None`` for a streamed body.
+
+    :rtype bytes: the rewritten header block.
+    """
+    lines = []
+    framing = set()
+    for line in head[:-4].split(b"\r\n"):
+        name = line.partition(b":")[0].strip().lower()
+        if name in (b"transfer-encoding", b"content-length"):
+            framing.add(name)
+        else:
+            lines.append(line)
+    if len(framing) == 2:
+        lines = [line for line in lines
+                 if line.partition(b":")[0].strip().lower() != b"connection"]
+        lines.append(b"Connection: close")
+    if length is not None:
+        lines.append(b"Content-Length: " + str(length).encode())
+    return b"\r\n".join(lines) + b"\r\n\r\n"
+
+
+def frame_request(buf, max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE):
+    """
+    Frames the first complete request of an in-memory buffer.
+
+    :param buf (bytes): bytes received so far on a connection.
+    :param max_header_size (int): largest accepted header block.
+    :param max_body_size (int): largest accepted body.
+
+    :rtype tuple: (bytes consumed, header block, body bytes), or ``None`` if more
+                  data is needed.
+    :raises RequestError: If the request is malformed or exceeds a limit.
+    """
+    end = buf.find(b"\r\n\r\n")
+    if end < 0:
+        if len(buf) > max_header_size:
+            raise RequestError(431, "Request Header Fields Too Large")
+        return None
+    if end + 4 > max_header_size:
+        raise RequestError(431, "Request Header Fields Too Large")
+    head = bytes(buf[:end + 4])
+    kind, length = body_framing(head, max_body_size)
+
+    pos = end + 4
+    if kind == "length":
+        if len(buf) < pos + length:
+            return None
+        return pos + length, head, bytes(buf[pos:pos + length])
+
+    chunks = []
+    total = 0
+    while True:
+        line_end = buf.find(b"\r\n", pos)
+        if line_end < 0:
+            _check_line(buf, pos, max_header_size)
+            return None
+        size = _chunk_size(buf[pos:line_end])
+        pos = line_end + 2
+        if size == 0:
+            # Skip the (optional) trailers up to the final blank line.
+            while True:
+                line_end = buf.find(b"\r\n", pos)
+                if line_end < 0:
+                    _check_line(buf, pos, max_header_size)
+                    return None
+                blank = line_end == pos
+                pos = line_end + 2
+                if blank:
+                    body = b"".join(chunks)
+                    return pos, reframe_head(head, len(body)), body
+        total += size
+        if total > max_body_size:
+            raise RequestError(413, "Payload Too Large")
+        if len(buf) < pos + size + 2:
+            return None
+        chunks.append(bytes(buf[pos:pos + size]))
+        pos += size + 2
+
+
+def _check_line(buf, pos, max_line_size):
+    """Rejects an unterminated chunk or trailer line longer than ``max_line_size``."""
+    if len(buf) - pos > max_line_size:
+        raise RequestError(400, "Bad Request")
+
+
+def _chunk_size(line):
+    """Parses a chunk-size line, ignoring chunk extensions."""
+    size = bytes(line).split(b";", 1)[0].strip()
+    # int() alone would also take a sign, "0x" or underscores
+    if not size or size.strip(b"0123456789abcdefABCDEF"):
+        raise RequestError(400, "Bad Request")
+    return int(size, 16)
+
+
+class BodyStream(io.RawIOBase):
+    """A read-only file-like view of a request body still arriving on the socket.
+
+    It supports ``read()``, ``readline()``, ``readinto()`` and iteration over the
+    received chunks. Whatever the handler does not consume is discarded by the
+    adapter so the next request on the connection stays correctly framed.
+    """
+
+    def __init__(self, chunks, length=None):
+        """
+        :param chunks (iterator): iterator producing the body bytes.
+        :param length (int): total body length when known (``Content-Length``).
+        """
+        self._chunks = chunks
+        self._pending = b""
+        self.length = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def __iter__(self):
+        if self._pending:
+            pending, self._pending = self._pending, b""
+            yield pending
+        for chunk in self._chunks:
+            yield chunk
+
+    def discard(self):
+        """Consume and drop the rest of the body."""
+        for _ in self:
+            pass
+
+
+class RequestReader:
+    """Reads complete requests from a blocking client socket.
+
+    The reader keeps the bytes received past the current request, so pipelined
+    requests on a persistent connection are read from the same instance.
+
+    :attrs conn (socket): the client socket.
+    :attrs max_header_size (int): largest accepted header block.
+    :attrs max_body_size (int): largest accepted body.
+    :attrs stream_threshold (int): bodies above this size are returned as a stream.
+    """
+
+    def __init__(self, conn, max_header_size=MAX_HEADER_SIZE,
+                 max_body_size=MAX_BODY_SIZE, stream_threshold=STREAM_THRESHOLD):
+        self.conn = conn
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        self.stream_threshold = stream_threshold
+        self.buffer = bytearray()
+
+    def _fill(self):
+        """Receive more bytes into the buffer; ``False`` on EOF."""
+        chunk = self.conn.recv(RECV_SIZE)
+        if not chunk:
+            return False
+        self.buffer += chunk
+        return True
+
+    def read_head(self):
+        """
+        Read up to and including the blank line ending the header block.
+
+        :rtype bytes: the header block, or ``None`` if the client closed the connection.
+        :raises RequestError: If the header block exceeds ``max_header_size``.
+        """
+        start = 0
+        while True:
+            end = self.buffer.find(b"\r\n\r\n", start)
+            if end >= 0:
+                break
+            if len(self.buffer) > self.max_header_size:
+                raise RequestError(431, "Request Header Fields Too Large")
+            start = max(0, len(self.buffer) - 3)
+            if not self._fill():
+                return None
+        if end + 4 > self.max_header_size:
+            raise RequestError(431, "Request Header Fields Too Large")
+        head = bytes(self.buffer[:end + 4])
+        del self.buffer[:end + 4]
+        return head
+
+    def _read_exact(self, n):
+        """Yield exactly ``n`` body bytes, buffered ones first."""
+        while n > 0:
+            if not self.buffer and not self._fill():
+                raise RequestError(400, "Bad Request")
+            chunk = bytes(self.buffer[:n])
+            del self.buffer[:len(chunk)]
+            n -= len(chunk)
+            yield chunk
+
+    def _readline(self):
+        """Read one CRLF terminated line (used by the chunked decoder)."""
+        while True:
+            end = self.buffer.find(b"\r\n")
+            if end >= 0:
+                line = bytes(self.buffer[:end])
+                del self.buffer[:end + 2]
+                return line
+            if len(self.buffer) > self.max_header_size:
+                raise RequestError(400, "Bad Request")
+            if not self._fill():
+                raise RequestError(400, "Bad Request")
+
+    def _iter_chunked(self):
+        """Yield the decoded payload of a chunked body."""
+        total = 0
+        while True:
+            size = _chunk_size(self._readline())
+            if size == 0:
+                while self._readline():
+                    pass  # trailers
+                return
+            total += size
+            if total > self.max_body_size:
+                raise RequestError(413, "Payload Too Large")
+            for chunk in self._read_exact(size):
+                yield chunk
+            if self._readline():
+                raise RequestError(400, "Bad Request")
+
+    def read_body(self, head):
+        """
+        Read the body announced by ``head``.
+
+        :param head (bytes): the header block returned by :meth:`read_head`.
+
+        :rtype tuple: (header block, ``bytes`` body or :class:`BodyStream`). The
+                      header block is re-framed for chunked requests.
+        :raises RequestError: If the body is malformed or too large.
+        """
+        kind, length = body_framing(head, self.max_body_size)
+
+        if header_value(head, b"expect") == b"100-continue":
+            self.conn.sendall(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+        if kind == "length":
+            if self.stream_threshold is not None and length > self.stream_threshold:
+                return head, BodyStream(self._read_exact(length), length)
+            return head, b"".join(self._read_exact(length))
+
+        chunks = self._iter_chunked()
+        received = []
+        total = 0
+        for chunk in chunks:
+            received.append(chunk)
+            total += len(chunk)
+            if self.stream_threshold is not None and total > self.stream_threshold:
+                stream = _chain(received, chunks)
+                return reframe_head(head), BodyStream(stream)
+        body = b"".join(received)
+        return reframe_head(head, len(body)), body
+
+    def read_request(self):
+        """
+        Read one complete request.
+
+        :rtype tuple: (header block, body), or (``None``, ``None``) on EOF.
+        :raises RequestError: If the request is malformed or exceeds a limit.
+        """
+        head = self.read_head()
+        if head is None:
+            return None, None
+        return self.read_body(head)
+
+
+def _chain(first, rest):
+    """Yield the already received chunks, then the remaining ones."""
+    for chunk in first:
+        yield chunk
+    for chunk in rest:
+        yield chunk
@@ -17,7 +17,30 @@ daemon.request
 This module provides a Request object to manage and persist 
 request settings (cookies, auth, proxies).
 """
+from functools import cached_property
+
 from .dictionary import CaseInsensitiveDict
+from .parser import parse_request, ParsedRequest
+from .router import Router
+from .logger import get_logger
+
+log = get_logger(__name__)
+
+#: Attributes computed on first access and cached until the next ``prepare``.
+LAZY_ATTRS = ("headers", "cookies", "body")
+
+
+def _to_bytes(request):
+    """Encodes a ``str`` request, leaves ``bytes`` untouched."""
+    if isinstance(request, str):
+        return request.encode("utf-8")
+    return request
+
+
+def _text(view):
+    """Decodes a bytes slice of the request."""
+    return bytes(view).decode("utf-8", "replace")
+
 
 class Request():
     """The fully mutable "class" `Request <Request>` object,
@@ -27,6 +50,10 @@ class Request():
     should not be instantiated manually; doing so may produce undesirable
     effects.
 
+    ``headers``, ``cookies`` and ``body`` are materialised from the parsed
+    request on first access and cached, so routes that never read them do not
+    pay for building them. They can still be assigned like plain attributes.
+
     Usage::
 
       >>> import deamon.request
@@ -46,6 +73,10 @@ class Request():
         "body",
         "routes",
         "hook",
+        "query",
+        "parsed",
+        "params",
+        "allowed",
     ]
 
     def __init__(self):
@@ -53,56 +84,79 @@ class Request():
         self.method = None
         #: HTTP URL to send the request to.
         self.url = None
-        #: dictionary of HTTP headers.
-        self.headers = None
         #: HTTP path
         self.path = None        
-        # The cookies set used to create Cookie header
-        self.cookies = None
-        #: request body to send to the server.
-        self.body = None
+        #: Query string of the request target
+        self.query = ""
+        #: Single-pass parse of the raw request
+        self.parsed = None
         #: Routes
         self.routes = {}
         #: Hook point for routed mapped-path
         self.hook = None
+        #: Path parameters captured by the matched route
+        self.params = {}
+        #: Methods of a route matching the path but not the method (405)
+        self.allowed = None
 
     def extract_request_line(self, request):
-        try:
-            lines = request.splitlines()
-            first_line = lines[0]
-            method, path, version = first_line.split()
-
-            if path == '/':
-                path = '/index.html'
-        except Exception:
-            return None, None
-
-        return method, path, version # Example: "GET / HTTP/1.1" become return(GET, /index.html, HTTP/1.1)
-             
+        parsed = parse_request(_to_bytes(request))
+        if parsed is None:
+            return None, None, None
+        return self._request_line(parsed) # Example: "GET / HTTP/1.1" become return(GET, /index.html, HTTP/1.1)
+
+    def _request_line(self, parsed):
+        method = parsed.method.decode("latin-1")
+        path = parsed.path.decode("latin-1")
+        version = parsed.version.decode("latin-1")
+        if path == '/':
+            path = '/index.html'
+        return method, path, version
+
     def prepare_headers(self, request):
         """Prepares the given HTTP headers."""
-        # FIX 1: Use splitlines() to handle \r\n AND \n automatically
-        lines = request.splitlines()
+        if request is None or isinstance(request, ParsedRequest):
+            parsed = request  # None: the request line of the prepared request was malformed
+        else:
+            parsed = parse_request(_to_bytes(request))
         headers = {}
-        
-        # Start from 1 to skip the "GET / HTTP/1.1" line
-        if len(lines) > 1:
-            for line in lines[1:]:
-                # FIX 2: Check for ':' generally, not ': '
-                if ':' in line:
-                    key, val = line.split(':', 1)
-                    # FIX 3: Strip spaces manually. 
-                    # This turns "Cookie: auth=true" OR "Cookie:auth=true" into the same result.
-                    headers[key.lower().strip()] = val.strip()
-                    
+        if parsed is None:
+            return headers
+        if parsed.head_stop <= parsed.line_end:
+            return headers
+        # One decode of the header lines only, never of the body. Keys are
+        # lower-cased, so "Cookie: auth=true" and "cookie:auth=true" are the same.
+        text = bytes(parsed.fields).decode("latin-1")
+        for line in text.split("\r\n"):
+            key, sep, val = line.partition(":")
+            if sep:
+                headers[key.strip().lower()] = val.strip()
         return headers
 
     def prepare(self, request, routes=None):
-        """Prepares the entire request with the given parameters."""
+        """Prepares the entire request with the given parameters.
+
+        :param request (bytes): the raw request, parsed once by
+                                :func:`daemon.parser.parse_request` (``str`` is
+                                accepted and encoded first).
+        :param routes (Router|dict): compiled :class:`Router <Router>` or
+                                     ``{(METHOD, path): handler}`` mapping.
+        """
+
+        parsed = parse_request(_to_bytes(request))
+        #: Parsed request, the header block and body are memoryview slices of it.
+        self.parsed = parsed
+        # Drop what a previous prepare() materialised
+        for name in LAZY_ATTRS:
+            self.__dict__.pop(name, None)
+        if parsed is None:
+            self.method, self.path, self.version = None, None, None
+            return
 
         # Prepare the request line from the request header
-        self.method, self.path, self.version = self.extract_request_line(request) # get method, path and version from first line: GET /test1/ HTTP/1.1
-        print("[Request] {} path {} version {}".format(self.method, self.path, self.version))
+        self.method, self.path, self.version = self._request_line(parsed) # get method, path and version from first line: GET /test1/ HTTP/1.1
+        self.query = parsed.query.decode("latin-1")
+        log.debug("{} path {} version {}", self.method, self.path, self.version)
         #print("debug prepare function")
         #
         # @bksysnet Preapring the webapp hook with WeApRous instance
@@ -111,46 +165,70 @@ class Request():
         # TODO manage the webapp hook in this mounting point
         #
 
-        if not routes == {}:
+        if routes:
             self.routes = routes
-            self.hook = routes.get((self.method, self.path)) # this will give the destination function ("GET", "/index.html") → home_handler => req.hook = home_handler
+            if isinstance(routes, Router):
+                # One walk of the compiled trie, path parameters included
+                self.hook, self.params, self.allowed = routes.match(self.method, self.path)
+            else:
+                self.hook = routes.get((self.method, self.path)) # this will give the destination function ("GET", "/index.html") → home_handler => req.hook = home_handler
             #
             # self.hook manipulation goes here
             # ...
             #
 
-        self.headers = self.prepare_headers(request)
-        
-        # Get the cookie string (keys are lowercased by our new prepare_headers)
-        cookies = self.headers.get('cookie')
-        
-        self.cookies = {} # Reset cookies
-        
-        if cookies:
-            for pair in cookies.split(';'):
+        # headers, cookies and body are materialised on first access
+        return
+
+    @cached_property
+    def headers(self):
+        """Dictionary of the request headers, keys lower-cased."""
+        headers = self.prepare_headers(self.parsed)
+        parsed = self.parsed
+        if parsed is not None and parsed.terminated:
+            # Measured on the raw slice, the body is not decoded or re-encoded for it
+            headers.setdefault("Content-Type", "text/plain")
+            headers["Content-Length"] = str(len(parsed.body))
+        else:
+            headers["Content-Length"] = "0"
+        return headers
+
+    @cached_property
+    def cookies(self):
+        """Dictionary of the cookies sent in the ``Cookie`` header."""
+        cookies = {}
+        header = self.get_header("cookie")
+        if header:
+            for pair in header.split(';'):
                 if '=' in pair:
                     key, value = pair.split('=', 1)
                     # FIX 4: Strip keys/values just to be safe 
                     # (Clean up " auth=true" -> "auth")
-                    self.cookies[key.strip()] = value.strip()
-                    
-            # This line in your original code is redundant/circular but harmless:
-            self.prepare_cookies(cookies)
-        
+                    cookies[key.strip()] = value.strip()
+        return cookies
 
-        
-        body = None 
-        
-        parts = request.split("\r\n\r\n", 1) 
-        print("[Request] requested: {}".format(request))
-        
-        if len(parts) > 1:
-            body = parts[1]
-            print("[Request] parts: {}".format(parts[0]))
+    @cached_property
+    def body(self):
+        """Decoded request body, ``None`` if the header block is not terminated."""
+        parsed = self.parsed
+        if parsed is None or not parsed.terminated:
+            return None
+        return _text(parsed.body)
 
-        self.prepare_body(body, None, None)
+    def get_header(self, name):
+        """
+        Returns one request header without materialising :attr:`headers`.
 
-        return
+        :param name (str): lower-case header name.
+
+        :rtype str: the header value, or ``None`` if absent.
+        """
+        if "headers" in self.__dict__:
+            return self.headers.get(name)
+        if self.parsed is None:
+            return None
+        value = self.parsed.header(name.encode("latin-1"))
+        return None if value is None else value.decode("latin-1")
 
     def prepare_body(self, data, files, json=None):
         
@@ -18,15 +18,145 @@ This module provides a :class: `Response <Response>` object to manage and persis
 response settings (cookies, auth, proxies), and to construct HTTP responses
 based on incoming requests. 
 
-The current version supports MIME type detection, content loading and header formatting
+The current version supports MIME type detection, content loading and header formatting.
+Static files carry an ``ETag``, ``Last-Modified`` and a per-MIME
+``Cache-Control`` (:data:`CACHE_POLICIES`); conditional requests are answered
+with ``304 Not Modified`` and single ``Range`` requests with
+``206 Partial Content``. Compressible bodies are sent ``gzip`` encoded to
+clients accepting it (see :mod:`daemon.compression`); the ``.gz`` siblings and
+content-hashed URLs of a built asset tree (see :mod:`daemon.assets`) are served
+precompressed and ``immutable``. Files too large for the static cache are returned as a
+:class:`FileResponse <FileResponse>` and sent with ``sendfile``.
+Route handler results (bytes, str, dict/list or iterables, optionally with a
+status and headers) are serialised by :meth:`Response.prepare_hook_result` and
+sent straight from memory; generators and async iterators are streamed as a
+:class:`ChunkedResponse <ChunkedResponse>` instead.
 """
 import datetime
+import email.utils
+import http
+import json
 import os
 import mimetypes
+import time
 from .dictionary import CaseInsensitiveDict
+from .staticcache import static_cache
+from .zerocopy import FileResponse, SENDFILE_MIN_SIZE
+from .streaming import ChunkedResponse, is_stream, iterate
+from .compression import (accepts_gzip, compressible, compress, compress_stream,
+                          compression_stats, MIN_COMPRESS_SIZE, MAX_COMPRESS_SIZE)
+from .docroot import docroot_of, static_index
+from .logger import get_logger
+
+log = get_logger(__name__)
 
 BASE_DIR = ""
 
+#: ``Cache-Control`` of static files, looked up by MIME type then main type.
+#: HTML is revalidated on every navigation (cheap with ETags and 304s).
+CACHE_POLICIES = {
+    "text/html": "no-cache",
+    "text/css": "public, max-age=3600",
+    "image": "public, max-age=86400",
+    "video": "public, max-age=86400",
+}
+#: ``Cache-Control`` of static files without a policy.
+DEFAULT_CACHE_POLICY = "no-cache"
+#: ``Cache-Control`` of content-hashed URLs, whose content never changes.
+IMMUTABLE_CACHE_POLICY = "public, max-age=31536000, immutable"
+
+
+#: Headers written by :func:`header_template` / ``build_response_header`` itself.
+_TEMPLATE_HEADERS = frozenset(('Content-Type', 'Content-Length'))
+#: Precompiled header prefixes, see :func:`header_template`.
+_header_templates = {}
+#: Upper bound on the number of templates (reason phrases can be arbitrary).
+MAX_HEADER_TEMPLATES = 256
+#: ``(second, b"<HTTP date>")`` of the last :func:`http_date` call.
+_date_cache = (0, b"")
+
+
+def http_date():
+    """
+    Returns the current ``Date`` header value, formatted at most once per second.
+
+    :rtype bytes: the date in IMF-fixdate format.
+    """
+    global _date_cache
+    now = int(time.time())
+    second, value = _date_cache
+    if second != now:
+        value = email.utils.formatdate(now, usegmt=True).encode("latin-1")
+        # Tuple swap: readers on other threads see the old or the new pair
+        _date_cache = (now, value)
+    return value
+
+
+def header_template(status_code, reason, content_type, connection):
+    """
+    Returns the precompiled status line, ``Content-Type`` and ``Connection``
+    header lines for one combination of those values.
+
+    :params status_code (int): HTTP status code.
+    :params reason (str): reason phrase.
+    :params content_type (str): ``Content-Type`` value.
+    :params connection (str): ``Connection`` value.
+
+    :rtype bytes: the encoded header lines.
+    """
+    key = (status_code, reason, content_type, connection)
+    template = _header_templates.get(key)
+    if template is None:
+        template = (
+            f"HTTP/1.1 {status_code} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Connection: {connection}\r\n"
+        ).encode("latin-1")
+        if len(_header_templates) < MAX_HEADER_TEMPLATES:
+            _header_templates[key] = template
+    return template
+
+
+def parse_range(value, size):
+    """
+    Parses a ``Range`` header against a representation of ``size`` bytes.
+
+    :params value (str): the ``Range`` header, e.g. ``bytes=0-499``.
+    :params size (int): length of the full representation.
+
+    :rtype list: satisfiable ``(first, last)`` byte positions (inclusive), an
+                 empty list if no range can be satisfied, or ``None`` if the
+                 header is malformed and must be ignored.
+    """
+    unit, sep, specs = value.partition("=")
+    if not sep or unit.strip().lower() != "bytes":
+        return None
+    ranges = []
+    for spec in specs.split(","):
+        first, sep, last = spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                first = int(first)
+                if last:
+                    last = int(last)
+                    if last < first:
+                        return None
+                else:
+                    last = size - 1
+            else:
+                # Suffix range: the last N bytes
+                suffix = int(last)
+                if suffix == 0:
+                    continue
+                first, last = max(0, size - suffix), size - 1
+        except ValueError:
+            return None
+        if first < size:
+            ranges.append((first, min(last, size - 1)))
+    return ranges
+
 class Response():   
     """The :class:`Response <Response>` object, which contains a
     server's response to an HTTP request.
@@ -73,6 +203,7 @@ class Response():
         "request",
         "body",
         "reason",
+        "connection",
     ]
 
 
@@ -118,6 +249,24 @@ class Response():
         #: is a response.
         self.request = None
 
+        #: Value of the ``Connection`` header, ``keep-alive`` keeps the socket open.
+        self.connection = "close"
+
+        #: (timeout, max) advertised in the ``Keep-Alive`` header of persistent connections.
+        self.keepalive = None
+
+        #: Path of the static file being served, if any.
+        self.file_path = None
+
+        #: :class:`CacheEntry <CacheEntry>` of the static file being served, if any.
+        self.static_entry = None
+
+        #: :class:`IndexEntry <IndexEntry>` of the static file being served, if any.
+        self.static_file = None
+
+        #: Iterator returned by a streaming route handler, if any.
+        self._stream = None
+
 
     def get_mime_type(self, path):
         """
@@ -146,151 +295,148 @@ class Response():
 
         :raises ValueError: If the MIME type is unsupported.
         """
-        
-        base_dir = ""
-
-        # Processing mime_type based on main_type and sub_type
-        main_type, sub_type = mime_type.split('/', 1)
-        print("[Response] processing MIME main_type={} sub_type={}".format(main_type,sub_type))
-        if main_type == 'text':
-            self.headers['Content-Type']='text/{}'.format(sub_type)
-            if sub_type == 'plain' or sub_type == 'css' or sub_type == 'csv' or sub_type == 'xml':
-                base_dir = BASE_DIR+"static/"
-            elif sub_type == 'html':
-                base_dir = BASE_DIR+"www/"
-            else:
-                base_dir = BASE_DIR+"static/"
-                #handle_text_other(sub_type) dummy from teacher?
-        elif main_type == 'image':
-            base_dir = BASE_DIR+"static/"
-            self.headers['Content-Type']='image/{}'.format(sub_type)
-        elif main_type == 'application':
-            base_dir = BASE_DIR+"apps/"
-            self.headers['Content-Type']='application/{}'.format(sub_type)
-        #
-        #  TODO: process other mime_type
-        #        application/xml       
-        #        application/zip
-        #        ...
-        #        text/csv
-        #        text/xml
-        #        ...
-        #        video/mp4 
-        #        video/mpeg
-        #        ...
-        #
-            if sub_type == 'xml' or sub_type == 'zip':
-                base_dir = BASE_DIR+"application/"
-        elif main_type == 'video':
-            base_dir = BASE_DIR+"static/"
-            self.headers['Content-Type']='video/{}'.format(sub_type)
-            if sub_type == 'mp4' or sub_type == 'mpeg':
-                base_dir = BASE_DIR+"video/"
-        else:
-            raise ValueError("Invalid MEME type: main_type={} sub_type={}".format(main_type,sub_type))
+        docroot = docroot_of(mime_type)
+        if docroot is None:
+            raise ValueError("Invalid MIME type: {}".format(mime_type))
+        self.headers['Content-Type'] = mime_type
+        return BASE_DIR + docroot
 
-        return base_dir
 
-
-    def build_content(self, path, base_dir):
+    def build_content(self, path, base_dir=None):
         """
-        Loads the objects file from storage space.
+        Loads the objects file from storage space, through :data:`static_cache`.
 
-        :params path (str): relative path to the file.
+        :params path (str): path to the file, relative to ``base_dir`` if given.
         :params base_dir (str): base directory where the file is located.
 
         :rtype tuple: (int, bytes) representing content length and content data.
+                      The data is ``None`` for files not kept in memory.
         """
     
-        filepath = os.path.join(base_dir, path.lstrip('/'))
-        print("[Response] serving the object at location {}".format(filepath))
+        filepath = path if base_dir is None else os.path.join(base_dir, path.lstrip('/'))
+        self.file_path = filepath
+        log.debug("serving the object at location {}", filepath)
             #
             #  TODO: implement the step of fetch the object file
             #        store in the return value of content
             #
         try:
-            with open(filepath, "rb") as f:
-                content = f.read()
-            if path == "return.json":
-                # Clear the return.json
-                with open(filepath, "w") as f:
-                    f.write("")
-            return len(content), content
+            # Served from the process-wide cache, the disk is only touched on a miss
+            entry = static_cache.get(filepath)
+            if entry is None:
+                raise FileNotFoundError(filepath)
+            self.static_entry = entry
+            self.headers.update(entry.headers)
+            return entry.size, entry.content
         except FileNotFoundError:
-            print("[Response] file not found {}".format(filepath))
+            log.debug("file not found {}", filepath)
             return 0, b""
         except Exception as e:
-            print("[Response] cant read the file {}".format(filepath))
+            log.warning("cant read the file {}: {}", filepath, e)
             return 0, b""
         
 
+    def serialize_body(self, result):
+        """
+        Serialises the body returned by a route handler.
+
+        :params result: ``bytes``, ``str``, ``dict``/``list`` (sent as JSON), any
+                        other iterable of ``bytes``/``str`` chunks, or ``None``.
+
+        :rtype tuple: (bytes content, default Content-Type).
+        """
+        if result is None:
+            return b"", "text/plain; charset=utf-8"
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            return bytes(result), "application/octet-stream"
+        if isinstance(result, str):
+            return result.encode("utf-8"), "text/plain; charset=utf-8"
+        if isinstance(result, (dict, list)):
+            return json.dumps(result).encode("utf-8"), "application/json"
+        chunks = [
+            chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+            for chunk in result
+        ]
+        return b"".join(chunks), "application/octet-stream"
+
+    def prepare_hook_result(self, result):
+        """
+        Applies the value returned by a route handler to the response.
+
+        Handlers return ``body``, ``(status, body)`` or ``(status, body, headers)``.
+        The body is serialised with :meth:`serialize_body` and kept in memory,
+        unless it is a generator or async iterator, which is kept to be
+        streamed; ``headers`` are sent as given and may override ``Content-Type``.
+
+        :params result: the handler's return value.
+        """
+        status, headers = 200, None
+        if isinstance(result, tuple):
+            if len(result) == 3:
+                status, result, headers = result
+            elif len(result) == 2:
+                status, result = result
+        if is_stream(result):
+            self._stream = result
+            self._content, content_type = b"", "application/octet-stream"
+        else:
+            self._content, content_type = self.serialize_body(result)
+
+        self.status_code = int(status)
+        try:
+            self.reason = http.HTTPStatus(self.status_code).phrase
+        except ValueError:
+            self.reason = "Unknown"
+        self.headers['Content-Type'] = content_type
+        for key, value in (headers or {}).items():
+            if key.lower() == "content-type":
+                key = "Content-Type"
+            self.headers[key] = value
+
     def build_response_header(self, request):
         """
         Constructs the HTTP response headers based on the class:`Request <Request>
         and internal attributes.
 
+        The status line, ``Content-Type`` and ``Connection`` come from a
+        precompiled template (:func:`header_template`) and ``Date`` from the
+        once-per-second cache (:func:`http_date`); only the per-response
+        headers are formatted here.
+
         :params request (class:`Request <Request>`): incoming request object.
 
         :rtypes bytes: encoded HTTP response header.
         """
-        reqhdr = request.headers
         rsphdr = self.headers
-
-        #Build dynamic headers
-        headers = {
-                "Accept": "{}".format(reqhdr.get("Accept", "application/json")),
-                "Accept-Language": "{}".format(reqhdr.get("Accept-Language", "en-US,en;q=0.9")),
-                "Authorization": "{}".format(reqhdr.get("Authorization", "Basic <credentials>")),
-                "Cache-Control": "no-cache",
-                "Content-Type": "{}".format(self.headers['Content-Type']),
-                "Content-Length": "{}".format(len(self._content)),
-#                "Cookie": "{}".format(reqhdr.get("Cookie", "sessionid=xyz789")), #dummy cooki
-        #
-        # TODO prepare the request authentication
-        #
-	# self.auth = ...
-                
-                    
-                "Date": "{}".format(datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")),
-                "Max-Forward": "10",
-                "Pragma": "no-cache",
-                "Proxy-Authorization": "Basic dXNlcjpwYXNz",  # example base64
-                "Warning": "199 Miscellaneous warning",
-                "User-Agent": "{}".format(reqhdr.get("User-Agent", "Chrome/123.0.0.0")),
-            }
-
-        # Header text alignment
-            #
-            #  TODO: implement the header building to create formated
-            #        header from the provied headers
-            #
-        #
-        # TODO prepare the request authentication
-        #
-
-        # Status line
-        status_line = f"HTTP/1.1 {self.status_code} {self.reason}\r\n"
-
-        # Header lines (use the complete 'headers' dictionary)
-        if self.cookies:
-            headers["Set-Cookie"] = [
-                f"{k}={v}"
-                for k, v in self.cookies.items()
-            ]
-
-        header_lines = ""
-        for k, v in headers.items():
-            if isinstance(v, list):
-                for item in v:
-                    header_lines += f"{k}: {item}\r\n"
-            else:
-                header_lines += f"{k}: {v}\r\n"
-
-        # Final header string
-        fmt_header = status_line + header_lines + "\r\n"
-        print(f"[Response.Header] Sending Header:\n{fmt_header}") # Keep this print for verification
-
-        return fmt_header.encode("utf-8")
+        content_length = rsphdr.get('Content-Length')
+        if content_length is None and self._stream is None:
+            content_length = len(self._content)
+
+        parts = [
+            header_template(self.status_code, self.reason,
+                            rsphdr.get('Content-Type', 'text/plain'), self.connection),
+        ]
+        if content_length is not None:
+            parts += [b"Content-Length: ", str(content_length).encode("latin-1"), b"\r\n"]
+        parts += [b"Date: ", http_date(), b"\r\n"]
+        if 'Cache-Control' not in rsphdr:
+            parts.append(b"Cache-Control: no-cache\r\n")
+        if self.connection == "keep-alive" and self.keepalive:
+            parts.append("Keep-Alive: timeout={}, max={}\r\n".format(*self.keepalive).encode("latin-1"))
+
+        # Headers set on the response, e.g. returned by a route handler
+        lines = []
+        for k, v in rsphdr.items():
+            if k in _TEMPLATE_HEADERS or (k == 'Set-Cookie' and self.cookies):
+                continue
+            for item in (v if isinstance(v, list) else (v,)):
+                lines.append(f"{k}: {item}\r\n")
+        for k, v in self.cookies.items():
+            lines.append(f"Set-Cookie: {k}={v}\r\n")
+        if lines:
+            parts.append("".join(lines).encode("utf-8"))
+        parts.append(b"\r\n")
+        return b"".join(parts)
 
 
     def build_notfound(self):
@@ -306,7 +452,7 @@ class Response():
                 "Content-Type: text/html\r\n"
                 "Content-Length: 13\r\n"
                 "Cache-Control: max-age=86000\r\n"
-                "Connection: close\r\n"
+                f"Connection: {self.connection}\r\n"
                 "\r\n"
                 "404 Not Found"
             ).encode('utf-8')
@@ -318,60 +464,280 @@ class Response():
 
         :params request (class:`Request <Request>`): incoming request object.
 
-        :rtype bytes: complete HTTP response using prepared headers and content.
-        """
-
-        path = request.path
-
-        mime_type = self.get_mime_type(path)
-        print("[Response] {} path {} mime_type {}".format(request.method, request.path, mime_type))
-
-        base_dir = ""
-
-        #If HTML, parse and serve embedded objects
-        if path.endswith('.html') or mime_type == 'text/html':
-            base_dir = self.prepare_content_type(mime_type = 'text/html')
-        elif mime_type == 'text/css':
-            base_dir = self.prepare_content_type(mime_type = 'text/css')
-        elif mime_type == 'text/csv':
-            base_dir = self.prepare_content_type(mime_type = 'text/csv')
-        elif mime_type == 'text/xml':
-            base_dir = self.prepare_content_type(mime_type = 'text/xml')
-        elif mime_type.startswith('image/'):
-            base_dir = self.prepare_content_type(mime_type=mime_type)
-        elif mime_type == 'application/xml':
-            base_dir = self.prepare_content_type(mime_type = 'application/xml')
-        elif mime_type == 'application/zip':
-            base_dir = self.prepare_content_type(mime_type = 'application/zip')
-        elif mime_type == 'video/mp4':
-            base_dir = self.prepare_content_type(mime_type = 'video/mp4')
-        elif mime_type == 'video/mpeg':
-            base_dir = self.prepare_content_type(mime_type = 'video/mpeg')
-        #
-        # TODO: add support objects
-        #
-        elif mime_type == 'application/octet-stream':
-            base_dir = self.prepare_content_type(mime_type = 'application/json')
-            path = "return.json"
-        else:
+        :rtype bytes: complete HTTP response using prepared headers and content,
+                      or a :class:`FileResponse <FileResponse>` for large files.
+        """
+
+        if self._stream is not None:
+            return self.build_streamed(request)
+        if self._content is not False:
+            # Body returned by a route handler, sent from memory
+            if self.negotiate_gzip(request, len(self._content)):
+                self.apply_gzip(len(self._content), compress(self._content))
+            self._header = self.build_response_header(request)
+            return self._header + self._content
+
+        # One lookup in the docroot index built at startup: MIME type and
+        # file path are precomputed, unknown or escaping paths are not found.
+        indexed = static_index.lookup(request.path)
+        if indexed is None:
             return self.build_notfound()
-        
-        c_len, self._content = self.build_content(path, base_dir)
+        log.debug("{} path {} mime_type {}", request.method, request.path, indexed.mime_type)
 
-        if c_len > 0 or path == "return.json":
+        self.static_file = indexed
+        self.headers['Content-Type'] = indexed.mime_type
+        c_len, self._content = self.build_content(indexed.path)
+
+        if c_len > 0:
              if self.status_code is None:
                 self.status_code = 200
                 self.reason = "OK"
         else:
              return self.build_notfound()
 
+        self.headers['Cache-Control'] = self.cache_policy(self.headers['Content-Type'],
+                                                          indexed.immutable)
+        self.headers['Accept-Ranges'] = 'bytes'
+        offset, count, byte_range = 0, c_len, None
+        if request.method == "GET":
+            if self.not_modified(request, self.static_entry):
+                return self.build_not_modified(request)
+            byte_range = self.requested_range(request, self.static_entry)
+            if byte_range == []:
+                return self.build_range_not_satisfiable(c_len)
+            if byte_range:
+                first, last = byte_range
+                offset, count = first, last - first + 1
+                self.status_code = 206
+                self.reason = "Partial Content"
+                self.headers['Content-Range'] = "bytes {}-{}/{}".format(first, last, c_len)
+                self.headers['Content-Length'] = str(count)
+
+        # A range selects identity bytes: its response is never re-encoded
+        # A precompressed variant has no size limit: only the build compressed it
+        max_size = None if indexed.gzip_path else MAX_COMPRESS_SIZE
+        if byte_range is None and self.negotiate_gzip(request, c_len, max_size):
+            entry = self.static_entry
+            variant = static_cache.get(indexed.gzip_path) if indexed.gzip_path else None
+            if variant is not None:
+                # Precompressed by the asset build, cached like any other file
+                self.apply_gzip(c_len, variant.content, variant.size)
+            else:
+                # Compressed once per file version, then served from the cache;
+                # None for a file too large to keep, which goes identity
+                gzipped = static_cache.compressed(entry)
+                if gzipped is not None:
+                    self.apply_gzip(c_len, gzipped)
+            if self.headers.get('Content-Encoding') == 'gzip':
+                self.headers['ETag'] = entry.gzip_etag
+                self._header = self.build_response_header(request)
+                if self._content is None:
+                    self._content = b""
+                    return FileResponse(self._header, variant.path)
+                return self._header + self._content
+
+        if self._content is None:
+            if count >= SENDFILE_MIN_SIZE:
+                # Large file: only the header is built here, the body goes from
+                # the page cache to the socket without a user-space copy.
+                self._content = b""
+                self._header = self.build_response_header(request)
+                return FileResponse(self._header, self.file_path, offset, count)
+            # Not kept in memory, but too small for a sendfile to pay off
+            with open(self.file_path, "rb") as f:
+                f.seek(offset)
+                self._content = f.read(count)
+        elif count != c_len:
+            self._content = self._content[offset:offset + count]
+
         self._header = self.build_response_header(request)
-        print(f"[Response] Header building complete. Cookies to set: {self.cookies}")
+        log.debug("header building complete, cookies to set: {}", self.cookies)
 
         return self._header + self._content
     
+    def build_streamed(self, request):
+        """
+        Builds the response of a streaming route handler.
+
+        HTTP/1.1 clients get ``Transfer-Encoding: chunked``; an HTTP/1.0 client
+        reads the body until the connection closes. A compressible body is
+        gzip encoded on the fly when the client accepts it (the size is not
+        known up front, so :data:`MIN_COMPRESS_SIZE` does not apply).
+
+        :params request (class:`Request <Request>`): incoming request object.
+
+        :rtype ChunkedResponse: the header and the body iterator.
+        """
+        stream = self._stream
+        if self.negotiate_gzip(request, MIN_COMPRESS_SIZE):
+            self.headers['Content-Encoding'] = 'gzip'
+            stream = compress_stream(iterate(stream))
+        chunked = request.version != "HTTP/1.0"
+        if chunked:
+            self.headers['Transfer-Encoding'] = 'chunked'
+        else:
+            self.connection = "close"
+        self._header = self.build_response_header(request)
+        return ChunkedResponse(self._header, stream, chunked)
+
+    def cache_policy(self, mime_type, immutable=False):
+        """
+        Returns the ``Cache-Control`` value of a static file.
+
+        :params mime_type (str): MIME type of the file.
+        :params immutable (bool): ``True`` for a content-hashed URL.
+
+        :rtype str: :data:`IMMUTABLE_CACHE_POLICY` or the policy from
+                    :data:`CACHE_POLICIES`.
+        """
+        if immutable:
+            return IMMUTABLE_CACHE_POLICY
+        mime_type = mime_type.split(';', 1)[0].strip()
+        policy = CACHE_POLICIES.get(mime_type)
+        if policy is None:
+            policy = CACHE_POLICIES.get(mime_type.split('/', 1)[0], DEFAULT_CACHE_POLICY)
+        return policy
+
+    def not_modified(self, request, entry):
+        """
+        Evaluates ``If-None-Match`` / ``If-Modified-Since`` against a static file.
+
+        ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only used
+        when the client sent no entity tag.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params entry (CacheEntry): the file being served.
+
+        :rtype bool: ``True`` if the client copy is still valid.
+        """
+        if entry is None:
+            return False
+        if_none_match = request.get_header("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            # Weak comparison, as required for If-None-Match; either variant matches
+            return any(tag.removeprefix("W/") in (entry.etag, entry.gzip_etag) for tag in tags)
+
+        if_modified_since = request.get_header("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return entry.mtime_ns // 1_000_000_000 <= since
+        return False
+
+    def negotiate_gzip(self, request, size, max_size=MAX_COMPRESS_SIZE):
+        """
+        Decides whether the body is sent ``gzip`` encoded.
+
+        A compressible body always gets ``Vary: Accept-Encoding``, so caches
+        keep the identity and gzip variants apart.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params size (int): length of the identity body.
+        :params max_size (int): largest body compressed, ``None`` for no limit.
+
+        :rtype bool: ``True`` if the body should be compressed.
+        """
+        if not compressible(self.headers.get('Content-Type', ''), size, max_size):
+            return False
+        self.headers['Vary'] = 'Accept-Encoding'
+        return accepts_gzip(request.get_header("accept-encoding"))
+
+    def apply_gzip(self, identity_size, body, size=None):
+        """
+        Switches the response to a gzip encoded body.
+
+        :params identity_size (int): length of the uncompressed body.
+        :params body (bytes): the compressed body, ``None`` if it is sent from a file.
+        :params size (int): length of the compressed body, defaults to ``len(body)``.
+        """
+        if size is None:
+            size = len(body)
+        self._content = body
+        self.headers['Content-Encoding'] = 'gzip'
+        self.headers['Content-Length'] = str(size)
+        compression_stats.record(identity_size, size)
+
+    def requested_range(self, request, entry):
+        """
+        Resolves the ``Range`` / ``If-Range`` headers of a static file request.
+
+        Only single ranges are honoured: a multi-range request is answered with
+        the full representation, as RFC 9110 allows.
+
+        :params request (class:`Request <Request>`): incoming request object.
+        :params entry (CacheEntry): the file being served.
+
+        :rtype tuple: ``(first, last)`` byte positions, ``[]`` if the range is
+                      not satisfiable, or ``None`` to send the whole file.
+        """
+        value = request.get_header("range")
+        if value is None or entry is None:
+            return None
+        if_range = request.get_header("if-range")
+        if if_range is not None:
+            if_range = if_range.strip()
+            # Strong comparison: a weak tag or another date means "changed"
+            if if_range not in (entry.etag, entry.last_modified):
+                return None
+        ranges = parse_range(value, entry.size)
+        if ranges is None or len(ranges) > 1:
+            return None
+        return ranges[0] if ranges else []
+
+    def build_range_not_satisfiable(self, size):
+        """
+        Constructs a ``416 Range Not Satisfiable`` response.
+
+        :params size (int): length of the full representation.
+
+        :rtype bytes: Encoded 416 response.
+        """
+        self.status_code = 416
+        self.reason = "Range Not Satisfiable"
+        return (
+            "HTTP/1.1 416 Range Not Satisfiable\r\n"
+            f"Content-Range: bytes */{size}\r\n"
+            "Content-Length: 0\r\n"
+            f"Connection: {self.connection}\r\n"
+            "\r\n"
+            ).encode("utf-8")
+
+    def build_not_modified(self, request):
+        """
+        Constructs a body-less ``304 Not Modified`` for the current static file.
+
+        :params request (class:`Request <Request>`): incoming request object.
+
+        :rtype bytes: Encoded 304 response.
+        """
+        self.status_code = 304
+        self.reason = "Not Modified"
+        entry = self.static_entry
+        gzipped = self.negotiate_gzip(request, entry.size)
+        lines = [
+            "HTTP/1.1 304 Not Modified",
+            "ETag: {}".format(entry.gzip_etag if gzipped else entry.etag),
+            "Last-Modified: {}".format(entry.last_modified),
+            "Cache-Control: {}".format(self.headers['Cache-Control']),
+            "Date: {}".format(http_date().decode("latin-1")),
+            "Connection: {}".format(self.connection),
+        ]
+        if 'Vary' in self.headers:
+            lines.append("Vary: {}".format(self.headers['Vary']))
+        if self.connection == "keep-alive" and self.keepalive:
+            lines.append("Keep-Alive: timeout={}, max={}".format(*self.keepalive))
+        if self.cookies:
+            lines.extend("Set-Cookie: {}={}".format(k, v) for k, v in self.cookies.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
     # helper function
     def build_unauthorized(self):
+        self.connection = "close"
         body = "401 Unauthorized"
         return (
             "HTTP/1.1 401 Unauthorized\r\n"
@@ -384,3 +750,32 @@ class Response():
             f"{body}"
             ).encode("utf-8")
 
+    def build_error(self, status_code, reason, headers=None):
+        self.connection = "close"
+        body = "{} {}".format(status_code, reason)
+        extra = "".join(f"{k}: {v}\r\n" for k, v in (headers or {}).items())
+        return (
+            f"HTTP/1.1 {status_code} {reason}\r\n"
+            f"{extra}"
+            "Content-Type: text/plain\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Cache-Control: no-store\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+            f"{body}"
+            ).encode("utf-8")
+
+    def build_unavailable(self):
+        self.connection = "close"
+        body = "503 Service Unavailable"
+        return (
+            "HTTP/1.1 503 Service Unavailable\r\n"
+            "Content-Type: text/html\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Cache-Control: no-store\r\n"
+            "Retry-After: 1\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+            f"{body}"
+            ).encode("utf-8")
+
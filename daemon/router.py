@@ -0,0 +1,243 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.router
+~~~~~~~~~~~~~~~~~
+
+This module provides the compiled :class:`Router <Router>` used by
+:class:`WeApRous <WeApRous>` to dispatch requests.
+
+Route paths are split into segments and stored in a trie, so a lookup walks
+the request path once, whatever the number of routes. Besides static segments
+a route may contain typed parameters and a trailing wildcard::
+
+    /peers/<id>              any single segment, passed as str
+    /peers/<int:id>          digits only, passed as int
+    /ratio/<float:value>     passed as float
+    /files/<path:rest>       the remaining path, slashes included
+
+Static segments win over parameters, which win over wildcards. When a path
+matches a route but not for the request method, :meth:`Router.match` reports
+the allowed methods so the caller can answer ``405`` instead of ``404``.
+
+Usage Example:
+--------------
+>>> router = Router()
+>>> router.add("GET", "/peers/<int:id>", get_peer)
+>>> router.compile()
+>>> router.match("GET", "/peers/7")
+(<function get_peer>, {'id': 7}, None)
+>>> router.match("POST", "/peers/7")
+(None, {}, ['GET'])
+"""
+
+
+def _int(segment):
+    if not segment.isdigit():
+        raise ValueError(segment)
+    return int(segment)
+
+
+def _str(segment):
+    if not segment:
+        raise ValueError(segment)
+    return segment
+
+
+#: Parameter converters, keyed by the name used in route patterns.
+CONVERTERS = {
+    "str": _str,
+    "int": _int,
+    "float": float,
+}
+
+
+class _Node:
+    """One path segment of the route trie."""
+
+    __slots__ = ("static", "params", "wildcard", "handlers", "pattern")
+
+    def __init__(self):
+        self.static = {}
+        self.params = []
+        self.wildcard = None
+        self.handlers = {}
+        self.pattern = None
+
+
+def parse_pattern(pattern):
+    """
+    Splits a route pattern into segment descriptors.
+
+    :param pattern (str): route path, e.g. ``/peers/<int:id>``.
+
+    :rtype list: ``("static", text)``, ``("param", name, converter)`` or
+                 ``("wildcard", name)`` tuples.
+    :raises ValueError: If the pattern is malformed.
+    """
+    if not pattern.startswith("/"):
+        raise ValueError("Route path must start with '/': {}".format(pattern))
+    segments = pattern.split("/")[1:]
+    parts = []
+    for index, segment in enumerate(segments):
+        if segment.startswith("<") and segment.endswith(">"):
+            kind, sep, name = segment[1:-1].partition(":")
+            if not sep:
+                kind, name = "str", kind
+            if not name.isidentifier():
+                raise ValueError("Invalid route parameter {} in {}".format(segment, pattern))
+            if kind == "path":
+                if index != len(segments) - 1:
+                    raise ValueError("<path:...> must be the last segment: {}".format(pattern))
+                parts.append(("wildcard", name))
+            elif kind in CONVERTERS:
+                parts.append(("param", name, kind))
+            else:
+                raise ValueError("Unknown route converter {} in {}".format(kind, pattern))
+        else:
+            parts.append(("static", segment))
+    return parts
+
+
+class Router:
+    """A compiled, trie based route table.
+
+    Routes are registered with :meth:`add` and :meth:`compile` builds the trie
+    once; lookups never scan the route list.
+
+    :attrs routes (list): registered ``(method, pattern, handler)`` entries.
+    """
+
+    def __init__(self):
+        self.routes = []
+        self._root = None
+
+    @classmethod
+    def from_routes(cls, routes):
+        """
+        Builds and compiles a router from a ``{(METHOD, path): handler}`` mapping.
+
+        :param routes (dict): the WeApRous route mapping.
+
+        :rtype Router: the compiled router.
+        """
+        router = cls()
+        for (method, path), func in routes.items():
+            router.add(method, path, func)
+        router.compile()
+        return router
+
+    def add(self, method, pattern, func):
+        """
+        Register ``func`` for ``method`` and ``pattern``.
+
+        :param method (str): HTTP method.
+        :param pattern (str): route path, possibly with parameters.
+        :param func (callable): the route handler.
+
+        :raises ValueError: If the pattern is malformed.
+        """
+        parse_pattern(pattern)
+        self.routes.append((method.upper(), pattern, func))
+        self._root = None
+
+    def compile(self):
+        """Build the trie from the registered routes."""
+        root = _Node()
+        for method, pattern, func in self.routes:
+            node = root
+            for part in parse_pattern(pattern):
+                if part[0] == "static":
+                    node = node.static.setdefault(part[1], _Node())
+                elif part[0] == "param":
+                    _, name, kind = part
+                    for p_name, p_kind, _conv, child in node.params:
+                        if p_name == name and p_kind == kind:
+                            node = child
+                            break
+                    else:
+                        child = _Node()
+                        node.params.append((name, kind, CONVERTERS[kind], child))
+                        # Typed converters are tried before the catch-all str
+                        node.params.sort(key=lambda p: p[1] == "str")
+                        node = child
+                else:
+                    if node.wildcard is None:
+                        node.wildcard = (part[1], _Node())
+                    node = node.wildcard[1]
+            node.handlers[method] = func
+            node.pattern = pattern
+        self._root = root
+
+    def _lookup(self, node, segments, index, params):
+        """Depth-first walk of the trie, static segments first."""
+        if index == len(segments):
+            return node if node.handlers else None
+        segment = segments[index]
+
+        child = node.static.get(segment)
+        if child is not None:
+            found = self._lookup(child, segments, index + 1, params)
+            if found is not None:
+                return found
+
+        for name, _kind, convert, child in node.params:
+            try:
+                params[name] = convert(segment)
+            except ValueError:
+                continue
+            found = self._lookup(child, segments, index + 1, params)
+            if found is not None:
+                return found
+            del params[name]
+
+        if node.wildcard is not None:
+            name, child = node.wildcard
+            if child.handlers:
+                params[name] = "/".join(segments[index:])
+                return child
+        return None
+
+    def match(self, method, path):
+        """
+        Resolve a request.
+
+        :param method (str): HTTP method.
+        :param path (str): request path, without the query string.
+
+        :rtype tuple: ``(handler, params, allowed)``. ``handler`` is ``None`` when
+                      nothing matches; ``allowed`` then lists the methods of a
+                      route matching the path (405) or is ``None`` (404).
+        """
+        if self._root is None:
+            self.compile()
+        params = {}
+        node = self._lookup(self._root, path.split("/")[1:], 0, params)
+        if node is None:
+            return None, {}, None
+        func = node.handlers.get(method)
+        if func is None:
+            return None, {}, sorted(node.handlers)
+        return func, params, None
+
+    def get(self, key, default=None):
+        """Dict style lookup of a ``(METHOD, path)`` key, for callers of the old route mapping."""
+        func = self.match(*key)[0]
+        return default if func is None else func
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __repr__(self):
+        return "<Router {}>".format(
+            ", ".join("{} {}".format(method, pattern) for method, pattern, _ in self.routes))
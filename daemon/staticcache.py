@@ -0,0 +1,267 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.staticcache
+~~~~~~~~~~~~~~~~~
+
+This module provides the process-wide in-memory cache of static files used by
+:class:`Response <Response>`, so ``www/`` and ``static/`` assets are read from
+disk once instead of on every request.
+
+Entries are keyed by file path and hold the file bytes plus the headers that
+only depend on the file. Files larger than ``max_entry_size`` are never read:
+their entry only carries the metadata and :class:`Response <Response>` reads
+them from disk on each request, with :class:`FileResponse <FileResponse>` once
+they are worth a ``sendfile``. The cache is bounded by a byte
+budget and evicts the least recently used entries. Freshness is checked with a
+``stat()`` at most once every ``check_interval`` seconds per entry; a changed
+``mtime`` or size reloads the file. Each entry carries a strong ``ETag`` (a
+digest of the content) and ``Last-Modified`` for conditional requests, and the
+``gzip`` variant once :meth:`StaticCache.compressed` built it (only entries
+whose content is in memory get one).
+
+Usage Example:
+--------------
+>>> entry = static_cache.get("static/css/chat.css")
+>>> entry.content[:10], entry.headers["Content-Type"]
+(b'* {\\n    mar', 'text/css')
+>>> static_cache.stats()["hits"]
+0
+"""
+
+import collections
+import email.utils
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+
+from .compression import compress
+
+#: Total bytes of file content kept in memory.
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+#: Files larger than this are not loaded, only their metadata is cached.
+#: Independent of :data:`SENDFILE_MIN_SIZE <daemon.zerocopy.SENDFILE_MIN_SIZE>`.
+MAX_ENTRY_SIZE = 1024 * 1024
+#: Seconds during which a cached entry is trusted without a ``stat()``.
+CHECK_INTERVAL = 1.0
+
+
+def _digest(data=b""):
+    """Content hash used for the entity tags."""
+    return hashlib.blake2b(data, digest_size=12)
+
+
+class CacheEntry:
+    """One cached file.
+
+    :attrs path (str): file path, the cache key.
+    :attrs content (bytes): file bytes, ``None`` for files too large to keep in memory.
+    :attrs mtime_ns (int): modification time the content was read at.
+    :attrs size (int): file size in bytes.
+    :attrs etag (str): strong entity tag, a digest of the content.
+    :attrs last_modified (str): ``mtime`` as an HTTP date.
+    :attrs headers (dict): headers that only depend on the file.
+    :attrs gzip (bytes): gzip variant of the content, ``None`` until first needed.
+    :attrs checked (float): monotonic time of the last freshness check.
+    """
+
+    __slots__ = ("path", "content", "mtime_ns", "size", "etag", "last_modified",
+                 "headers", "gzip", "checked")
+
+    def __init__(self, path, content, mtime_ns, size, checked, digest):
+        self.path = path
+        self.content = content
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.checked = checked
+        self.gzip = None
+        self.etag = '"{}"'.format(digest)
+        self.last_modified = email.utils.formatdate(mtime_ns // 1_000_000_000, usegmt=True)
+        mime_type, _ = mimetypes.guess_type(path)
+        self.headers = {
+            "Content-Type": mime_type or "application/octet-stream",
+            "Content-Length": str(size),
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+        }
+
+    @property
+    def gzip_etag(self):
+        """Entity tag of the gzip variant, distinct from the identity one."""
+        return self.etag[:-1] + '-gz"'
+
+    @property
+    def cost(self):
+        """Bytes of content the entry keeps in memory."""
+        cost = 0 if self.content is None else self.size
+        if self.gzip is not None:
+            cost += len(self.gzip)
+        return cost
+
+
+class StaticCache:
+    """A thread-safe LRU cache of file contents bounded by a byte budget.
+
+    :attrs max_bytes (int): total bytes of content kept in memory.
+    :attrs max_entry_size (int): larger files only get a metadata entry.
+    :attrs check_interval (float): seconds between two ``stat()`` of an entry.
+    """
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, max_entry_size=MAX_ENTRY_SIZE,
+                 check_interval=CHECK_INTERVAL):
+        """
+        Initialize a new StaticCache instance.
+
+        :param max_bytes (int): byte budget of the cache.
+        :param max_entry_size (int): largest file whose content is kept in the cache.
+        :param check_interval (float): seconds a cached entry is trusted without
+                                       a ``stat()``, 0 checks on every access.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_size = max_entry_size
+        self.check_interval = check_interval
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # Held while compressing, so a variant is built once, not per request
+        self._compress_lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, path):
+        """
+        Returns the entry of ``path``, reading the file on a miss.
+
+        :param path (str): file path.
+
+        :rtype CacheEntry: the entry, or ``None`` if the file does not exist.
+        :raises OSError: If the file exists but cannot be read.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry.checked < self.check_interval:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            with self._lock:
+                entry.checked = now
+                if path in self._entries:
+                    self._entries.move_to_end(path)
+                self.hits += 1
+            return entry
+
+        with open(path, "rb") as f:
+            if st.st_size > self.max_entry_size:
+                # Hashed once per version of the file, never kept in memory
+                digest = hashlib.file_digest(f, _digest).hexdigest()
+                entry = CacheEntry(path, None, st.st_mtime_ns, st.st_size, now, digest)
+            else:
+                content = f.read()
+                digest = _digest(content).hexdigest()
+                entry = CacheEntry(path, content, st.st_mtime_ns, len(content), now, digest)
+
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old.cost
+                self.invalidations += 1
+            self._entries[path] = entry
+            self._bytes += entry.cost
+            self._evict()
+        return entry
+
+    def compressed(self, entry):
+        """
+        Returns the gzip variant of ``entry``, compressing the content on first use.
+
+        :param entry (CacheEntry): an entry returned by :meth:`get`.
+
+        :rtype bytes: the gzip encoded content, ``None`` for a file larger than
+                      ``max_entry_size`` (never compressed on the serving path).
+        """
+        if entry.gzip is not None or entry.content is None:
+            return entry.gzip
+        with self._compress_lock:
+            if entry.gzip is not None:
+                return entry.gzip  # built while this request waited
+            variant = compress(entry.content)
+            with self._lock:
+                entry.gzip = variant
+                if self._entries.get(entry.path) is entry:
+                    self._bytes += len(variant)
+                    self._evict()
+        return variant
+
+    def _evict(self):
+        """Drop least recently used entries until the budget is met (lock held)."""
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.cost
+            self.evictions += 1
+
+    def invalidate(self, path=None):
+        """
+        Drop the entry of ``path``, or every entry when ``path`` is ``None``.
+
+        :param path (str): file path.
+        """
+        with self._lock:
+            if path is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._bytes -= entry.cost
+                self.invalidations += 1
+
+    def stats(self):
+        """
+        Snapshot of the cache counters.
+
+        :rtype dict: ``entries``, ``bytes``, ``max_bytes``, ``hits``, ``misses``,
+                     ``hit_ratio``, ``evictions`` and ``invalidations``.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+#: Cache shared by every :class:`Response <Response>` of the process.
+static_cache = StaticCache()
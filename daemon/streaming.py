@@ -0,0 +1,230 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.streaming
+~~~~~~~~~~~~~~~~~
+
+This module provides :class:`ChunkedResponse <ChunkedResponse>`, the response
+of a route handler that returns a generator or an async iterator instead of a
+complete body.
+
+The body is never materialised: it is sent with
+``Transfer-Encoding: chunked`` (or, to HTTP/1.0 clients, until the connection
+closes), one chunk at a time. The next chunk is only pulled from the handler
+once the previous one has been accepted by the socket, so a slow client holds
+back the producer and memory stays bounded by the size of a chunk.
+
+Blocking sockets are served by :meth:`ChunkedResponse.send` and the
+non-blocking event loop by :meth:`ChunkedResponse.send_some`, like
+:class:`FileResponse <FileResponse>`.
+
+Usage Example:
+--------------
+>>> @app.route('/peers', methods=['GET'])
+>>> def peers(headers, body):
+>>>     return 200, json_chunks(peer_list), {"Content-Type": "application/json"}
+"""
+
+import asyncio
+import json
+
+#: Body bytes the event loop sends for one stream before serving other sockets.
+MAX_BURST = 256 * 1024
+#: Size the chunks of :func:`json_chunks` are coalesced to.
+JSON_CHUNK_SIZE = 16 * 1024
+#: Collections with fewer items than this are sent whole by :func:`json_body`.
+STREAM_MIN_ITEMS = 256
+
+_LAST_CHUNK = b"0\r\n\r\n"
+
+
+def is_stream(result):
+    """
+    Tells whether a handler body is streamed rather than serialised.
+
+    :param result: the body returned by a route handler.
+
+    :rtype bool: ``True`` for generators, iterators and async iterators.
+    """
+    return hasattr(result, "__next__") or hasattr(result, "__aiter__")
+
+
+def iterate(body):
+    """
+    Returns a plain iterator over a streamed body.
+
+    An async iterator is driven by a private :mod:`asyncio` loop, one
+    ``__anext__`` per chunk, from the thread sending the response.
+
+    :param body: an iterator or async iterator.
+
+    :rtype iterator: the chunks.
+    """
+    if hasattr(body, "__aiter__"):
+        return _iterate_async(body.__aiter__())
+    return iter(body)
+
+
+def _iterate_async(aiterator):
+    """Yield the items of ``aiterator`` from a private event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(aiterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(aiterator, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.close()
+
+
+def json_chunks(obj, chunk_size=JSON_CHUNK_SIZE):
+    """
+    Encodes ``obj`` as JSON incrementally.
+
+    :param obj: JSON serialisable object.
+    :param chunk_size (int): the encoder fragments are coalesced to about this size.
+
+    :rtype generator: ``str`` chunks of the JSON document.
+    """
+    buffered = []
+    size = 0
+    for fragment in json.JSONEncoder().iterencode(obj):
+        buffered.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(buffered)
+            buffered = []
+            size = 0
+    if buffered:
+        yield "".join(buffered)
+
+
+def json_body(obj, items, min_items=STREAM_MIN_ITEMS):
+    """
+    Chooses between a whole and a streamed JSON body.
+
+    A small document is cheaper to send whole: it gets a ``Content-Length``
+    and the usual gzip negotiation, without chunk framing.
+
+    :param obj: JSON serialisable object.
+    :param items (int): number of entries ``obj`` holds, a proxy for its size.
+    :param min_items (int): stream from this many entries on.
+
+    :rtype: ``obj`` itself, or the :func:`json_chunks` generator.
+    """
+    if items < min_items:
+        return obj
+    return json_chunks(obj)
+
+
+class ChunkedResponse:
+    """A raw HTTP header followed by a body pulled from an iterator.
+
+    :attrs header (bytes): the raw status line and headers.
+    :attrs chunked (bool): frame the body with ``Transfer-Encoding: chunked``;
+                           otherwise the body ends when the connection closes.
+    :attrs sent (int): body bytes sent so far.
+    """
+
+    def __init__(self, header, body, chunked=True):
+        """
+        :param header (bytes): raw status line and headers, blank line included.
+        :param body: iterator or async iterator of ``bytes``/``str`` chunks.
+        :param chunked (bool): use the chunked transfer coding.
+        """
+        self.header = header
+        self.chunked = chunked
+        self.sent = 0
+        self._chunks = iterate(body)
+        self._finished = False
+        # Progress of a non-blocking send
+        self._pending = memoryview(header)
+
+    def _next_block(self):
+        """
+        Pull the next non-empty chunk and frame it.
+
+        :rtype bytes: the bytes to write next, ``None`` once everything is out.
+        :raises OSError: If the handler failed while producing the body.
+        """
+        if self._finished:
+            return None
+        try:
+            for chunk in self._chunks:
+                data = chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+                if not data:
+                    continue  # an empty chunk would end the body
+                self.sent += len(data)
+                if self.chunked:
+                    return b"%x\r\n%b\r\n" % (len(data), data)
+                return data
+        except Exception as e:
+            # The status line is gone already: all we can do is cut the stream
+            self.close()
+            raise OSError("stream aborted by the handler: {!r}".format(e)) from e
+        self._finished = True
+        return _LAST_CHUNK if self.chunked else None
+
+    def send(self, conn):
+        """
+        Send the whole response on a blocking socket (a timeout is allowed).
+
+        ``sendall`` only returns once the socket took the chunk, which is what
+        holds back the producer.
+
+        :param conn (socket.socket): the client socket.
+        """
+        try:
+            conn.sendall(self.header)
+            while True:
+                block = self._next_block()
+                if block is None:
+                    return
+                conn.sendall(block)
+        finally:
+            self.close()
+
+    def send_some(self, sock):
+        """
+        Send as much as a non-blocking socket accepts, up to :data:`MAX_BURST`
+        body bytes, pulling chunks only as the previous ones are written.
+
+        :param sock (socket.socket): the non-blocking client socket.
+
+        :rtype bool: ``True`` once the whole response has been sent.
+        :raises BlockingIOError: If the socket is not writable.
+        """
+        budget = self.sent + MAX_BURST
+        while True:
+            if self._pending:
+                sent = sock.send(self._pending)
+                self._pending = self._pending[sent:]
+                if self._pending:
+                    return False
+            if self.sent >= budget:
+                return False
+            block = self._next_block()
+            if block is None:
+                return True
+            self._pending = memoryview(block)
+
+    def close(self):
+        """Close the handler's iterator, running its ``finally`` blocks."""
+        self._finished = True
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
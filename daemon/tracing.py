@@ -0,0 +1,222 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.tracing
+~~~~~~~~~~~~~~~~~
+
+This module provides the per-request stage timing of
+:class:`HttpAdapter <HttpAdapter>`.
+
+When enabled (see :meth:`WeApRous.enable_tracing`), every request gets a
+:class:`Trace <Trace>` with a trace ID, taken from the ``X-Trace-Id`` request
+header when a caller sent one. The adapter marks the end of each stage
+(``recv``, ``prepare``, ``auth``, ``hook``, ``build``, ``send``) and a route
+handler can time its own work with :func:`span`. Outbound calls made by a
+handler carry the trace ID (:func:`trace_header`), so a request crossing
+several peers shows up under the same ID everywhere.
+
+Requests slower than the threshold are kept, with their stages and spans, in
+a fixed-size ring buffer served by an admin route. While tracing is disabled
+:meth:`Tracer.begin` returns ``None`` and nothing is recorded.
+
+Usage Example:
+--------------
+>>> tracer.enable(threshold=0.2)
+>>> with span("peer-call"):
+...     sock.sendall("GET /get-list HTTP/1.1\\r\\n{}\\r\\n".format(trace_header()).encode())
+>>> tracer.slow_requests()[0]["stages"]
+{'recv': 0.02, 'prepare': 0.05, 'auth': 0.01, 'hook': 412.7, 'build': 0.03, 'send': 0.04}
+"""
+
+import collections
+import os
+import threading
+import time
+
+#: Request and outbound header carrying the trace ID.
+TRACE_HEADER = "X-Trace-Id"
+#: Requests slower than this many seconds are kept in the ring buffer.
+SLOW_THRESHOLD = 0.5
+#: Slow requests kept in the ring buffer.
+SLOW_CAPACITY = 128
+
+_local = threading.local()
+
+
+class Trace:
+    """Stage timings of one request.
+
+    :attrs trace_id (str): 16 hex digits, shared by the calls of one request.
+    :attrs started (float): :func:`time.perf_counter` at the start of the request.
+    :attrs stages (list): ``(stage, seconds)`` in order.
+    :attrs spans (list): ``(name, offset, seconds)`` timed by the handler.
+    """
+
+    __slots__ = ("trace_id", "started", "stages", "spans", "_last")
+
+    def __init__(self, trace_id=None):
+        self.trace_id = trace_id or os.urandom(8).hex()
+        self.started = self._last = time.perf_counter()
+        self.stages = []
+        self.spans = []
+
+    def adopt(self, trace_id):
+        """
+        Continue the trace of the caller.
+
+        :param trace_id (str): ``X-Trace-Id`` value of the request, may be ``None``.
+        """
+        if trace_id and len(trace_id) <= 64 and trace_id.isprintable():
+            self.trace_id = trace_id
+
+    def mark(self, stage):
+        """
+        End ``stage``: it lasted since the previous mark.
+
+        :param stage (str): stage name.
+        """
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def elapsed(self):
+        """Seconds since the start of the request."""
+        return time.perf_counter() - self.started
+
+
+class Tracer:
+    """Creates the request traces and keeps the slow ones.
+
+    :attrs enabled (bool): traces are only created when ``True``.
+    :attrs threshold (float): seconds above which a request is kept.
+    """
+
+    def __init__(self, threshold=SLOW_THRESHOLD, capacity=SLOW_CAPACITY):
+        """
+        :param threshold (float): slow request threshold, in seconds.
+        :param capacity (int): slow requests kept, the oldest are dropped.
+        """
+        self.enabled = False
+        self.threshold = threshold
+        self._slow = collections.deque(maxlen=capacity)
+
+    def enable(self, threshold=None, capacity=None):
+        """
+        Start tracing the requests.
+
+        :param threshold (float): slow request threshold, in seconds.
+        :param capacity (int): size of the slow request ring buffer.
+        """
+        if threshold is not None:
+            self.threshold = threshold
+        if capacity is not None:
+            self._slow = collections.deque(self._slow, maxlen=capacity)
+        self.enabled = True
+
+    def begin(self):
+        """
+        Start the trace of a request on the calling thread.
+
+        :rtype Trace: the trace, ``None`` while tracing is disabled.
+        """
+        if not self.enabled:
+            return None
+        trace = _local.trace = Trace()
+        return trace
+
+    def finish(self, trace, method, path, status):
+        """
+        End the trace of the calling thread, keeping it if it was slow.
+
+        :param trace (Trace): value of :meth:`begin`, may be ``None``.
+        :param method (str): request method.
+        :param path (str): request path.
+        :param status (str): response status code.
+        """
+        if trace is None:
+            return
+        _local.trace = None
+        total = trace.elapsed()
+        if total < self.threshold:
+            return
+        # deque.append is atomic: no lock on the serving path
+        self._slow.append({
+            "trace_id": trace.trace_id,
+            "time": time.time(),
+            "method": method,
+            "path": path,
+            "status": status,
+            "total_ms": round(total * 1000, 3),
+            "stages": {stage: round(seconds * 1000, 3) for stage, seconds in trace.stages},
+            "spans": [
+                {"name": name, "offset_ms": round(offset * 1000, 3),
+                 "duration_ms": round(seconds * 1000, 3)}
+                for name, offset, seconds in trace.spans
+            ],
+        })
+
+    def slow_requests(self):
+        """
+        The slow requests, newest first.
+
+        :rtype list: one dict per request (stages and spans in milliseconds).
+        """
+        return list(reversed(self._slow))
+
+
+def current_trace():
+    """
+    The trace of the request handled by the calling thread.
+
+    :rtype Trace: the trace, ``None`` outside a traced request.
+    """
+    return getattr(_local, "trace", None)
+
+
+def trace_header():
+    """
+    The header line to add to an outbound request made by a handler.
+
+    :rtype str: ``"X-Trace-Id: <id>\\r\\n"``, or ``""`` outside a traced request.
+    """
+    trace = current_trace()
+    if trace is None:
+        return ""
+    return "{}: {}\r\n".format(TRACE_HEADER, trace.trace_id)
+
+
+class span:
+    """Context manager timing a piece of a handler into the current trace.
+
+    :attrs name (str): span name, e.g. ``"peer-call"``.
+    """
+
+    __slots__ = ("name", "trace", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = current_trace()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.trace is not None:
+            end = time.perf_counter()
+            self.trace.spans.append((self.name, self.start - self.trace.started, end - self.start))
+        return False
+
+
+#: Tracer shared by every :class:`HttpAdapter <HttpAdapter>` of the process.
+tracer = Tracer()
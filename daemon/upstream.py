@@ -0,0 +1,314 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.upstream
+~~~~~~~~~~~~~~~~~
+
+This module provides the pool of persistent backend connections used by
+:func:`forward_request <daemon.proxy.forward_request>`, so the proxy does not
+open a TCP connection to the backend for every request.
+
+Backend responses are framed by :class:`ResponseReader <ResponseReader>`
+(``Content-Length``, chunked, or no body for ``HEAD``/1xx/204/304) instead of
+being read until EOF, which is what leaves the connection usable for the next
+request. Only responses without a length are still read until EOF, and their
+connection is closed.
+
+Per backend (``host, port``), :class:`UpstreamPool <UpstreamPool>` keeps at
+most ``max_idle`` idle connections and opens at most ``max_per_host``
+connections in total; a request waits for a free one when the limit is
+reached. Idle connections older than ``idle_timeout`` are evicted, and every
+idle connection is checked on checkout (a peek telling whether the backend
+closed it) before it is reused.
+
+Usage Example:
+--------------
+>>> upstream = upstream_pool.checkout("127.0.0.1", 9000)
+>>> upstream.sock.sendall(b"GET /get-list HTTP/1.1\\r\\nHost: 127.0.0.1\\r\\n\\r\\n")
+>>> head, body, reusable = upstream.reader.read_response("GET")
+>>> upstream_pool.release(upstream, reusable)
+"""
+
+import collections
+import os
+import socket
+import sys
+import threading
+import time
+
+from .reader import RequestReader, RequestError, header_value, reframe_head
+
+#: Idle connections kept per backend.
+MAX_IDLE = 16
+#: Connections opened per backend, idle and in use.
+MAX_PER_HOST = 64
+#: Seconds an idle connection is kept, below the 5 second keep-alive of the backends.
+IDLE_TIMEOUT = 4.0
+#: Socket timeout of the backend connections, also the wait for a free connection.
+UPSTREAM_TIMEOUT = 30.0
+
+
+class ResponseReader(RequestReader):
+    """Reads complete responses from a backend socket.
+
+    The body of a chunked response is decoded and its header block re-framed
+    with ``Content-Length``, like requests are by :class:`RequestReader`.
+    """
+
+    def __init__(self, conn):
+        # The proxy buffers whole responses, large ones included
+        super().__init__(conn, max_body_size=sys.maxsize, stream_threshold=None)
+
+    def read_response(self, method):
+        """
+        Read one complete response.
+
+        :param method (str): method of the request it answers.
+
+        :rtype tuple: (header block, body, whether the connection can be reused).
+        :raises ConnectionResetError: If the backend closed the connection first.
+        :raises RequestError: If the response is malformed.
+        """
+        while True:
+            head = self.read_head()
+            if head is None:
+                raise ConnectionResetError("the backend closed the connection")
+            try:
+                status = int(head[9:12])
+            except ValueError:
+                raise RequestError(502, "Bad Gateway")
+            if not 100 <= status < 200 or status == 101:
+                break
+            # Interim answer (100 Continue): the final response follows
+
+        reusable = head.startswith(b"HTTP/1.1") and \
+            (header_value(head, b"connection") or b"").lower() != b"close"
+        if method == "HEAD":
+            # Backends (this one included) may send the body of a HEAD anyway:
+            # the connection cannot be trusted for another exchange
+            return head, b"", False
+        if status < 200 or status in (204, 304):
+            return head, b"", reusable and not self.buffer
+
+        encoding = header_value(head, b"transfer-encoding")
+        if encoding is not None and encoding.lower().split(b",")[-1].strip() == b"chunked":
+            body = b"".join(self._iter_chunked())
+            return reframe_head(head, len(body)), body, reusable
+        length = header_value(head, b"content-length")
+        if length is not None:
+            try:
+                body = b"".join(self._read_exact(int(length)))
+            except ValueError:
+                raise RequestError(502, "Bad Gateway")
+            # Bytes past the response would desynchronise the next exchange
+            return head, body, reusable and not self.buffer
+
+        # No framing: the body ends with the connection
+        while self._fill():
+            pass
+        body = bytes(self.buffer)
+        self.buffer.clear()
+        return head, body, False
+
+
+class Upstream:
+    """One connection to a backend.
+
+    :attrs address (tuple): backend ``(host, port)``.
+    :attrs sock (socket.socket): the connected socket.
+    :attrs reader (ResponseReader): reader of the responses on ``sock``.
+    :attrs reused (bool): the connection served a previous request.
+    :attrs idle_since (float): monotonic time it was last released.
+    """
+
+    __slots__ = ("address", "sock", "reader", "reused", "idle_since")
+
+    def __init__(self, address, timeout):
+        self.address = address
+        self.sock = socket.create_connection(address, timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = ResponseReader(self.sock)
+        self.reused = False
+        self.idle_since = 0.0
+
+    def alive(self):
+        """
+        Tells whether the backend kept the idle connection open.
+
+        An idle connection has nothing to read: EOF means the backend closed
+        it, and unexpected bytes mean it cannot be framed any more.
+        """
+        timeout = self.sock.gettimeout()
+        try:
+            self.sock.setblocking(False)
+            self.sock.recv(1, socket.MSG_PEEK)
+            return False
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            try:
+                self.sock.settimeout(timeout)
+            except OSError:
+                pass
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class _Host:
+    """Connections of one backend: the idle ones and the count of open ones."""
+
+    __slots__ = ("idle", "opened")
+
+    def __init__(self):
+        self.idle = collections.deque()
+        self.opened = 0
+
+
+class UpstreamPool:
+    """A thread-safe pool of keep-alive backend connections.
+
+    :attrs max_idle (int): idle connections kept per backend.
+    :attrs max_per_host (int): connections opened per backend.
+    :attrs idle_timeout (float): seconds an idle connection is kept.
+    :attrs timeout (float): socket timeout, and longest wait for a free connection.
+    """
+
+    def __init__(self, max_idle=MAX_IDLE, max_per_host=MAX_PER_HOST,
+                 idle_timeout=IDLE_TIMEOUT, timeout=UPSTREAM_TIMEOUT):
+        self.max_idle = max_idle
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._hosts = {}
+        self._cond = threading.Condition()
+        self._connects = 0
+        self._reuses = 0
+        self._evictions = 0
+        if hasattr(os, "register_at_fork"):
+            # A forked worker must not share the parent's backend sockets
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        """Drop the parent's connections in a forked child."""
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    def checkout(self, host, port):
+        """
+        Take a connection to a backend: a healthy idle one, or a new one.
+
+        :param host (str): backend IP address.
+        :param port (int): backend port.
+
+        :rtype Upstream: the connection, to give back with :meth:`release`.
+        :raises socket.timeout: If ``max_per_host`` connections stay busy for ``timeout``.
+        :raises OSError: If the backend cannot be reached.
+        """
+        address = (host, port)
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            entry = self._hosts.get(address)
+            if entry is None:
+                entry = self._hosts[address] = _Host()
+            while True:
+                now = time.monotonic()
+                # Most recently used first: the oldest ones age out at the other end
+                while entry.idle:
+                    upstream = entry.idle.pop()
+                    if now - upstream.idle_since < self.idle_timeout and upstream.alive():
+                        upstream.reused = True
+                        self._reuses += 1
+                        return upstream
+                    upstream.close()
+                    entry.opened -= 1
+                    self._evictions += 1
+                if entry.opened < self.max_per_host:
+                    entry.opened += 1
+                    break
+                if now >= deadline or not self._cond.wait(deadline - now):
+                    raise socket.timeout("no free connection to {}:{}".format(host, port))
+
+        try:
+            upstream = Upstream(address, self.timeout)
+        except OSError:
+            self._closed(entry)
+            raise
+        with self._cond:
+            self._connects += 1
+        return upstream
+
+    def release(self, upstream, reusable):
+        """
+        Give a connection back after a complete exchange.
+
+        :param upstream (Upstream): value of :meth:`checkout`.
+        :param reusable (bool): the response was fully read and the backend
+                                keeps the connection open.
+        """
+        with self._cond:
+            entry = self._hosts.get(upstream.address)
+            if entry is not None and reusable and len(entry.idle) < self.max_idle:
+                upstream.idle_since = time.monotonic()
+                entry.idle.append(upstream)
+                self._evict(entry, upstream.idle_since)
+                self._cond.notify()
+                return
+        upstream.close()
+        if entry is not None:
+            self._closed(entry)
+
+    def _closed(self, entry):
+        """Account for a closed connection and wake up a waiting checkout."""
+        with self._cond:
+            entry.opened -= 1
+            self._cond.notify()
+
+    def _evict(self, entry, now):
+        """Close the idle connections of ``entry`` past ``idle_timeout``."""
+        while entry.idle and now - entry.idle[0].idle_since >= self.idle_timeout:
+            entry.idle.popleft().close()
+            entry.opened -= 1
+            self._evictions += 1
+
+    def stats(self):
+        """
+        Counters of the pool.
+
+        :rtype dict: ``connects``, ``reuses``, ``evictions``, ``idle`` and ``open``.
+        """
+        with self._cond:
+            return {
+                "connects": self._connects,
+                "reuses": self._reuses,
+                "evictions": self._evictions,
+                "idle": sum(len(entry.idle) for entry in self._hosts.values()),
+                "open": sum(entry.opened for entry in self._hosts.values()),
+            }
+
+    def close(self):
+        """Close every idle connection."""
+        with self._cond:
+            for entry in self._hosts.values():
+                while entry.idle:
+                    entry.idle.pop().close()
+                    entry.opened -= 1
+
+
+#: Backend connections shared by the proxy threads of the process.
+upstream_pool = UpstreamPool()
@@ -17,7 +17,17 @@ deamon.weaproute
 This module provides a WeApRous object to deploy RESTful url web app with routing
 """
 
+from urllib.parse import urlsplit, parse_qs
+
 from .backend import create_backend
+from .router import Router, parse_pattern
+from .docroot import static_index
+from .logger import get_logger
+from .metrics import metrics
+from .tracing import tracer
+from .profiler import profiler, DEFAULT_DURATION, DEFAULT_INTERVAL
+
+log = get_logger(__name__)
 
 class WeApRous:
     """The fully mutable :class:`WeApRous <WeApRous>` object, which is a lightweight,
@@ -40,6 +50,10 @@ class WeApRous:
       >>> def hello(headers, body):
       >>>     return {'message': 'Hello, world!'}
 
+      >>> @app.route('/peers/<int:id>', methods=['GET'])
+      >>> def get_peer(headers, body, id):
+      >>>     return {'peer': id}
+
       >>> app.run()
     """
 
@@ -50,6 +64,7 @@ class WeApRous:
         Sets up an empty route registry and prepares placeholders for IP and port.
         """
         self.routes = {}
+        self.router = None
         self.ip = None
         self.port = None
         return
@@ -64,15 +79,100 @@ class WeApRous:
         self.ip = ip
         self.port = port
 
+    def prepare_static(self, base_dir):
+        """
+        Serve the static files from another directory, e.g. the output of the
+        asset build (``python build_static.py``).
+
+        :param base_dir (str): directory containing ``www/``, ``static/``, ...
+        """
+        static_index.base_dir = base_dir
+        static_index.entries = None
+
+    def enable_metrics(self, path="/metrics"):
+        """
+        Register the admin route exposing the request metrics (see
+        :mod:`daemon.metrics`) in Prometheus text format. Metrics are always
+        recorded; only their exposition is opt-in.
+
+        :param path (str): URL path of the admin route.
+        """
+        def metrics_endpoint(headers, body):
+            return 200, metrics.render(), {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+        self.route(path, methods=['GET'])(metrics_endpoint)
+
+    def enable_tracing(self, path="/debug/slow-requests", threshold=None, capacity=None):
+        """
+        Time the stages of every request (see :mod:`daemon.tracing`) and
+        register the admin route listing the slow ones as JSON, newest first.
+
+        :param path (str): URL path of the admin route.
+        :param threshold (float): seconds above which a request is kept.
+        :param capacity (int): slow requests kept.
+        """
+        tracer.enable(threshold=threshold, capacity=capacity)
+
+        def slow_requests(headers, body):
+            return tracer.slow_requests()
+
+        self.route(path, methods=['GET'])(slow_requests)
+
+    def enable_profiler(self, path="/debug/profile"):
+        """
+        Register the admin routes of the sampling profiler (see
+        :mod:`daemon.profiler`). Nothing is sampled until a profile is started.
+
+        ``POST <path>?seconds=10&interval=0.005`` starts a time-boxed profile
+        (409 while one runs); ``GET <path>`` returns the last one as collapsed
+        stacks, or ``GET <path>?format=json`` as the hot spots of every route.
+
+        :param path (str): URL path of the admin routes.
+        """
+        def query_of(headers):
+            # The request line is the first line of the header block
+            target = headers.split(" ", 2)[1] if headers.count(" ") >= 2 else ""
+            return {key: values[-1] for key, values in parse_qs(urlsplit(target).query).items()}
+
+        def start_profile(headers, body):
+            query = query_of(headers)
+            try:
+                duration = float(query.get("seconds", DEFAULT_DURATION))
+                interval = float(query.get("interval", DEFAULT_INTERVAL))
+                started = profiler.start(duration, interval)
+            except ValueError as e:
+                return 400, {"error": str(e)}
+            if not started:
+                return 409, {"error": "A profile is already running"}
+            return 202, {"status": "started", "seconds": duration, "interval": interval}
+
+        def get_profile(headers, body):
+            if profiler.running:
+                return 409, {"error": "A profile is running"}
+            profile = profiler.result()
+            if profile is None:
+                return 404, {"error": "No profile yet, POST {} to start one".format(path)}
+            if query_of(headers).get("format") == "json":
+                return profile.hot_spots()
+            return 200, profile.collapsed(), {"Content-Type": "text/plain; charset=utf-8"}
+
+        self.route(path, methods=['POST'])(start_profile)
+        self.route(path, methods=['GET'])(get_profile)
+
     def route(self, path, methods=['GET']):
         """
         Decorator to register a route handler for a specific path and HTTP methods.
 
-        :param path (str): The URL path to route.
+        :param path (str): The URL path to route. Segments such as ``<id>``,
+                           ``<int:id>`` or a trailing ``<path:rest>`` capture path
+                           parameters, passed to the handler as keyword arguments.
         :param methods (list): A list of HTTP methods (e.g., ['GET', 'POST']) to bind.
 
         :rtype: function - A decorator that registers the handler function.
+        :raises ValueError: If the path pattern is malformed.
         """
+        parse_pattern(path)
+
         def decorator(func):
             for method in methods:
                 self.routes[(method.upper(), path)] = func
@@ -84,18 +184,27 @@ class WeApRous:
             return func
         return decorator
 
-    def run(self):
+    def run(self, engine="threaded", **options):
         """
         Start the backend server and begin handling requests.
 
         This method launches the TCP server using the configured IP and port,
         and dispatches incoming requests to the registered route handlers.
+        The routes are compiled into a :class:`Router <Router>` once, here,
+        so requests never scan the route table.
+
+        :param engine (str): backend serving engine (see :func:`create_backend`).
+        :param options: engine specific settings, e.g. ``min_workers``,
+                        ``max_workers``, ``queue_size`` and ``overflow`` for
+                        ``engine="pool"``, ``workers`` and ``max_connections``
+                        for ``engine="eventloop"``.
 
         :raise: Error if IP or port has not been configured.
         """
         if not self.ip or not self.port:
-            print("Rous app need to preapre address"
-                  "by calling app.prepare_address(ip,port)")
+            log.error("Rous app need to prepare address "
+                      "by calling app.prepare_address(ip,port)")
 
-        create_backend(self.ip, self.port, self.routes)
+        self.router = Router.from_routes(self.routes)
+        create_backend(self.ip, self.port, self.router, engine=engine, **options)
         
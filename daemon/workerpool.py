@@ -0,0 +1,281 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.workerpool
+~~~~~~~~~~~~~~~~~
+
+This module provides a bounded :class:`WorkerPool <WorkerPool>` used by the
+backend to serve client connections with a limited number of threads instead
+of spawning one thread per accepted socket.
+
+The pool keeps between ``min_workers`` and ``max_workers`` threads alive and
+hands work over through a bounded queue. When the queue is full the configured
+overflow policy decides what happens to the new job:
+
+- ``block``: the submitter waits until a slot becomes free (backpressure is
+  pushed back into the kernel listen backlog).
+- ``reject``: the job is refused and :meth:`submit` returns ``False`` so the
+  caller can answer with ``503 Service Unavailable``.
+- ``caller-runs``: the job is executed in the submitting thread, with the
+  ``caller_func`` given to :meth:`submit` if any (e.g. a variant that
+  returns quickly, since the submitter is stalled meanwhile).
+
+Usage Example:
+--------------
+>>> pool = WorkerPool(min_workers=4, max_workers=32, queue_size=128)
+>>> pool.start()
+>>> pool.submit(print, "hello")
+True
+>>> pool.stats()["queue_depth"]
+0
+"""
+
+import queue
+import threading
+import time
+
+from .logger import get_logger
+
+log = get_logger(__name__)
+
+#: Supported behaviours when the hand-off queue is full.
+OVERFLOW_POLICIES = ("block", "reject", "caller-runs")
+
+
+class WorkerPool:
+    """A bounded, self-sizing pool of daemon worker threads.
+
+    :attrs min_workers (int): number of threads that are always kept alive.
+    :attrs max_workers (int): upper bound on the number of threads.
+    :attrs queue_size (int): capacity of the hand-off queue.
+    :attrs overflow (str): overflow policy, one of :data:`OVERFLOW_POLICIES`.
+    :attrs idle_timeout (float): seconds an extra worker may stay idle before exiting.
+    """
+
+    def __init__(self, min_workers=4, max_workers=None, queue_size=128,
+                 overflow="reject", idle_timeout=30.0, name="Worker"):
+        """
+        Initialize a new WorkerPool instance.
+
+        :param min_workers (int): threads started up front and never retired.
+        :param max_workers (int): maximum threads, defaults to ``min_workers`` (fixed pool).
+        :param queue_size (int): capacity of the bounded hand-off queue.
+        :param overflow (str): ``block``, ``reject`` or ``caller-runs``.
+        :param idle_timeout (float): idle seconds before an extra worker is retired.
+        :param name (str): prefix used for worker thread names.
+
+        :raises ValueError: If the sizing or overflow policy is invalid.
+        """
+        if max_workers is None:
+            max_workers = min_workers
+        if min_workers < 1 or max_workers < min_workers:
+            raise ValueError("Invalid pool size: min_workers={} max_workers={}".format(
+                min_workers, max_workers))
+        if queue_size < 1:
+            raise ValueError("Invalid queue size: {}".format(queue_size))
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("Invalid overflow policy: {}".format(overflow))
+
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.idle_timeout = idle_timeout
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._busy = 0
+        self._running = False
+        #: Exit sentinels :meth:`shutdown` could not queue yet (the queue was full).
+        self._owed_stops = 0
+
+        #: Counters reported by :meth:`stats`.
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._caller_runs = 0
+        self._peak_queue_depth = 0
+        self._peak_busy = 0
+
+    def start(self):
+        """Start the ``min_workers`` core threads."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for _ in range(self.min_workers):
+                self._spawn_locked(core=True)
+
+    def _spawn_locked(self, core=False):
+        """Start a new worker thread. Caller must hold ``self._lock``."""
+        self._workers += 1
+        worker = threading.Thread(
+            target=self._worker_loop,
+            args=(core,),
+            name="{}-{}".format(self.name, self._workers)
+        )
+        worker.daemon = True
+        worker.start()
+
+    def _worker_loop(self, core):
+        """Pull jobs from the queue until the pool stops or the worker retires."""
+        timeout = None if core else self.idle_timeout
+        while True:
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._workers > self.min_workers:
+                        self._workers -= 1
+                        return
+                continue
+
+            if job is None:
+                with self._lock:
+                    self._workers -= 1
+                return
+
+            if self._owed_stops:
+                self._queue_owed_stop()
+
+            func, args = job
+            with self._lock:
+                self._busy += 1
+                if self._busy > self._peak_busy:
+                    self._peak_busy = self._busy
+            try:
+                func(*args)
+            except Exception as e:
+                log.error("job error: {!r}", e)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._completed += 1
+
+    def submit(self, func, *args, caller_func=None):
+        """
+        Hand a job over to the pool.
+
+        :param func (callable): function executed by a worker.
+        :param args: positional arguments passed to ``func``.
+        :param caller_func (callable): run with ``args`` instead of ``func`` when
+                                       the ``caller-runs`` policy runs the job
+                                       in the submitting thread.
+
+        :rtype bool: ``True`` if the job was accepted (or run by the caller),
+                     ``False`` if it was rejected by the overflow policy.
+        """
+        with self._lock:
+            self._submitted += 1
+            # Grow towards max_workers while every thread is already busy.
+            if (self._busy + self._queue.qsize() >= self._workers
+                    and self._workers < self.max_workers):
+                self._spawn_locked()
+
+        try:
+            if self.overflow == "block":
+                self._queue.put((func, args))
+            else:
+                self._queue.put_nowait((func, args))
+        except queue.Full:
+            if self.overflow == "caller-runs":
+                with self._lock:
+                    self._caller_runs += 1
+                (caller_func or func)(*args)
+                return True
+            with self._lock:
+                self._rejected += 1
+            return False
+
+        with self._lock:
+            depth = self._queue.qsize()
+            if depth > self._peak_queue_depth:
+                self._peak_queue_depth = depth
+        return True
+
+    def stats(self):
+        """
+        Snapshot of the pool sizing counters.
+
+        :rtype dict: queue depth, worker counts, utilisation and job counters.
+        """
+        with self._lock:
+            workers = self._workers
+            busy = self._busy
+            return {
+                "workers": workers,
+                "busy": busy,
+                "idle": workers - busy,
+                "utilisation": (busy / workers) if workers else 0.0,
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.queue_size,
+                "peak_queue_depth": self._peak_queue_depth,
+                "peak_busy": self._peak_busy,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "caller_runs": self._caller_runs,
+            }
+
+    def report(self, interval):
+        """
+        Print :meth:`stats` every ``interval`` seconds from a daemon thread.
+
+        :param interval (float): seconds between two reports.
+        """
+        def loop():
+            while self._running:
+                time.sleep(interval)
+                s = self.stats()
+                log.info("workers={} busy={} utilisation={:.0%} "
+                         "queue={}/{} peak_queue={} rejected={}",
+                         s["workers"], s["busy"], s["utilisation"],
+                         s["queue_depth"], s["queue_capacity"],
+                         s["peak_queue_depth"], s["rejected"])
+
+        reporter = threading.Thread(target=loop, name="{}-stats".format(self.name))
+        reporter.daemon = True
+        reporter.start()
+
+    def shutdown(self):
+        """
+        Stop accepting jobs and tell every worker to exit once the queue drains.
+
+        Never blocks: the exit sentinels that do not fit in a full queue are
+        queued by the workers as they take jobs out of it.
+        """
+        with self._lock:
+            self._running = False
+            workers = self._workers
+        for queued in range(workers):
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                with self._lock:
+                    self._owed_stops += workers - queued
+                return
+
+    def _queue_owed_stop(self):
+        """Queue one sentinel :meth:`shutdown` owes, behind the remaining jobs."""
+        with self._lock:
+            if not self._owed_stops:
+                return
+            self._owed_stops -= 1
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            # A submit took the free slot: the next job taken retries
+            with self._lock:
+                self._owed_stops += 1
@@ -0,0 +1,140 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.zerocopy
+~~~~~~~~~~~~~~~~~
+
+This module provides :class:`FileResponse <FileResponse>`, the response of a
+static file sent without copying it through Python memory.
+
+The header is sent first, then the file (or a byte range of it) goes straight
+from the page cache to the socket with ``os.sendfile``. Where ``sendfile`` is
+not available the file is ``mmap``-ed and sent from memoryview slices of the
+mapping, so no ``bytes`` copy of the file is ever built either.
+
+It is used for the static files :data:`static_cache
+<daemon.staticcache.static_cache>` does not keep in memory, from
+:data:`SENDFILE_MIN_SIZE` bytes on.
+
+Both blocking sockets (:meth:`FileResponse.send`) and the non-blocking event
+loop (:meth:`FileResponse.send_some`) are supported.
+
+Usage Example:
+--------------
+>>> response = FileResponse(header, "static/images/welcome.png")
+>>> response.send(conn)
+"""
+
+import mmap
+import os
+
+#: Largest block handed to a single ``sendfile``/``send`` call.
+BLOCK_SIZE = 1024 * 1024
+#: Smallest body sent with ``sendfile``: below it, opening the file per
+#: request costs more than the copy it saves.
+SENDFILE_MIN_SIZE = 16 * 1024
+
+
+class FileResponse:
+    """A raw HTTP header followed by a byte range of a file.
+
+    :attrs header (bytes): the raw status line and headers.
+    :attrs path (str): the file to send.
+    :attrs offset (int): first byte of the file to send.
+    :attrs count (int): number of file bytes to send.
+    """
+
+    def __init__(self, header, path, offset=0, count=None):
+        """
+        :param header (bytes): raw status line and headers, blank line included.
+        :param path (str): file to send.
+        :param offset (int): first byte to send.
+        :param count (int): bytes to send, defaults to the rest of the file.
+        """
+        self.header = header
+        self.path = path
+        self.offset = offset
+        if count is None:
+            count = os.path.getsize(path) - offset
+        self.count = count
+
+        # Progress of a non-blocking send
+        self._sent_header = 0
+        self._sent_body = 0
+        self._file = None
+        self._map = None
+
+    def __len__(self):
+        return len(self.header) + self.count
+
+    def send(self, conn):
+        """
+        Send the whole response on a blocking socket (a timeout is allowed).
+
+        :param conn (socket.socket): the client socket.
+        """
+        conn.sendall(self.header)
+        if not self.count:
+            return
+        with open(self.path, "rb") as f:
+            if hasattr(os, "sendfile"):
+                # socket.sendfile() loops over os.sendfile and honours the timeout
+                conn.sendfile(f, self.offset, self.count)
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    conn.sendall(view[self.offset:self.offset + self.count])
+
+    def send_some(self, sock):
+        """
+        Send as much as a non-blocking socket accepts.
+
+        :param sock (socket.socket): the non-blocking client socket.
+
+        :rtype bool: ``True`` once the whole response has been sent.
+        :raises BlockingIOError: If the socket is not writable.
+        """
+        if self._sent_header < len(self.header):
+            self._sent_header += sock.send(self.header[self._sent_header:])
+            if self._sent_header < len(self.header):
+                return False
+
+        remaining = self.count - self._sent_body
+        if remaining <= 0:
+            return True
+        if self._file is None:
+            self._file = open(self.path, "rb")
+
+        position = self.offset + self._sent_body
+        size = min(remaining, BLOCK_SIZE)
+        if hasattr(os, "sendfile"):
+            sent = os.sendfile(sock.fileno(), self._file.fileno(), position, size)
+            if sent == 0:
+                # The file shrank under us, nothing more can be sent
+                raise OSError("{} was truncated while being sent".format(self.path))
+        else:
+            if self._map is None:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            with memoryview(self._map) as view:
+                sent = sock.send(view[position:position + size])
+        self._sent_body += sent
+        return self._sent_body >= self.count
+
+    def close(self):
+        """Release the file opened by :meth:`send_some`."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
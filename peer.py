@@ -32,6 +32,9 @@ import threading
 
 
 from daemon.weaprous import WeApRous
+from daemon.upstream import ResponseReader
+from daemon.streaming import json_body
+from daemon.tracing import span, trace_header, TRACE_HEADER
 
 messagereceived = [
 
@@ -82,7 +85,7 @@ def home(headers, body):
       client_socket.send(request_message.encode())
       html_content = client_socket.receive_message().decode()
       client_socket.close()
-      return 200, html_content
+      return 200, html_content, {"Content-Type": "text/html"}
     except Exception as e:
       return 500, str(e)
 @app.route("/receive-message", methods=["POST"])
@@ -109,7 +112,8 @@ def get_messages(headers, body):
                 grouped[sender] = []
             grouped[sender].append(msg)
 
-      return 200, json.dumps(grouped)
+      # Streamed only once the history is large; the 1 s poll is usually tiny
+      return 200, json_body(grouped, len(messagereceived)), {"Content-Type": "application/json"}
     except Exception as e:
       return 500, str(e)
 
@@ -119,6 +123,10 @@ def send_message(headers, body):
       # print("headers: ",headers)
       # print("body: ",body)
       new_headers = headers.replace("/send-peer", "/receive-message", 1)
+      trace_line = trace_header()
+      if trace_line and TRACE_HEADER.lower() not in new_headers.lower():
+        # Carry the trace ID so the receiving peer's timings line up with ours
+        new_headers = new_headers.rstrip("\r\n") + "\r\n" + trace_line.rstrip("\r\n")
       # print("new_headers: ",new_headers)
       
       body_json = json.loads(body)
@@ -128,15 +136,16 @@ def send_message(headers, body):
       peerport = int(body_json['message']['receiver'].split(":")[1])
       
       # print(f"Connecting to peer {peerip}:{peerport}...")
-      client_socket = socket.socket()
-      client_socket.connect((peerip, peerport))
-      
-      # Re-insert the CRLF separator between headers and body
-      full_message = new_headers + "\r\n\r\n" + body
-      client_socket.send(full_message.encode())
-      
-      # Wait for response to ensure delivery and check status
-      response = client_socket.recv(4096).decode()
+      with span("peer-call"):
+        client_socket = socket.socket()
+        client_socket.connect((peerip, peerport))
+
+        # Re-insert the CRLF separator between headers and body
+        full_message = new_headers + "\r\n\r\n" + body
+        client_socket.send(full_message.encode())
+
+        # Wait for response to ensure delivery and check status
+        response = client_socket.recv(4096).decode()
       # print(f"Response from peer {peerip}:{peerport}:\n{response}")
       
       client_socket.close()
@@ -155,13 +164,13 @@ def get_list(headers, body):
     if active_peers_dict is None:
         return 500, "Lỗi khi lấy danh sách Peer." # Lỗi server nội bộ
         
-    # 5. Nếu thành công, trả về mã 200 và Dữ liệu đã là Dictionary (framework sẽ tự động serialize thành JSON)
-    return  200,  active_peers_dict
+    # 5. Nếu thành công, trả về Dictionary (framework sẽ tự động serialize thành JSON)
+    return active_peers_dict
 
 @app.route("/userip", methods=["GET"])
 def get_user(headers, body):
     
-    return 200, "{}:{}".format(IP, PORT)
+    return "{}:{}".format(IP, PORT)
 
 
 def print_input(headers, body):
@@ -173,45 +182,38 @@ def print_input(headers, body):
 def get_listfunc(ip, port):
     client_socket = socket.socket()
     try:
+      with span("tracker-get-list"):
         client_socket.connect((ip, port))
         request_message_getlist = (
             f"GET /get-list HTTP/1.1\r\n"
             f"Host: {ip}:{port}\r\n"
             f"Cookie: auth=true\r\n"
+            f"{trace_header()}"
             f"\r\n"
         )
         client_socket.send(request_message_getlist.encode()) 
         
-        # 1. Receive and DECODE the bytes to string immediately
-        receive_message = client_socket.recv(4096).decode('utf-8')
+        # 1. Read the whole framed response (the list may arrive chunked)
+        head, body, _ = ResponseReader(client_socket).read_response("GET")
         
     except Exception as e:
         print(f"[ERROR] Socket connection failed: {e}")
         return None
     finally:
         client_socket.close()
-    # print("start: {}\n".format(receive_message))
 
-    lines = receive_message.split('\n', 1)
-    clean_response = lines[1] if len(lines) > 1 else ""
-    return clean_response
-    # 2. Now receive_message is a string, so we can use string separators
-    separator = '\r\n\r\n'
-    
-    if separator in receive_message:
-        # 3. Split header and body
-        header_part, body_content_raw = receive_message.split(separator, 1)
-        
-        # 4. Parse the body JSON string into a Python Dictionary
-        try:
-            # strip() removes extra whitespace/newlines around the JSON
-            return json.loads(body_content_raw.strip()) 
-        except json.JSONDecodeError as e:
-            print(f"[ERROR] Failed to parse JSON body: {e}")
-            return None
-            
-    print("[ERROR] Header separator not found in response.")
-    return None
+    # 2. Only a 200 carries the peer list
+    if head[9:12] != b"200":
+        status_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+        print(f"[ERROR] Tracker answered: {status_line}")
+        return None
+
+    # 3. Parse the body JSON string into a Python Dictionary
+    try:
+        return json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        print(f"[ERROR] Failed to parse JSON body: {e}")
+        return None
 
 
 def handle_peer_connection(client,addr):
@@ -372,6 +374,7 @@ if __name__ == "__main__":
     parser.add_argument('--server-port', type=int, default=PORT)
     parser.add_argument('--peer-ip')
     parser.add_argument('--peer-port', type = int)
+    parser.add_argument('--trace-slow', type=float, default=0)
     args = parser.parse_args()
     ip = args.server_ip
     port = args.server_port
@@ -387,6 +390,8 @@ if __name__ == "__main__":
 
 
     app.prepare_address(peip,pepo)
+    if args.trace_slow:
+        app.enable_tracing(threshold=args.trace_slow)
     peer_thread = threading.Thread(target= app.run)
     peer_thread.daemon = True 
     peer_thread.start()
@@ -111,16 +111,25 @@ if __name__ == "__main__":
 
     :arg --server-ip (str): IP address to bind the server (default: 127.0.0.1).
     :arg --server-port (int): Port number to bind the server (default: 9000).
+    :arg --config (str): virtual host configuration file (default: config/proxy.conf).
     """
 
     parser = argparse.ArgumentParser(prog='Proxy', description='', epilog='Proxy daemon')
     parser.add_argument('--server-ip', default='0.0.0.0')
     parser.add_argument('--server-port', type=int, default=PROXY_PORT)
+    parser.add_argument('--processes', type=int, default=1,
+        help='Number of prefork worker processes, 0 uses one per CPU. Default is 1.')
+    parser.add_argument('--cpu-affinity', action='store_true',
+        help='Pin each prefork worker process to one CPU.')
+    parser.add_argument('--config', default='config/proxy.conf',
+        help='Virtual host configuration file. Default is config/proxy.conf.')
  
     args = parser.parse_args()
     ip = args.server_ip
     port = args.server_port
 
-    routes = parse_virtual_hosts("config/proxy.conf")
+    routes = parse_virtual_hosts(args.config)
 
-    create_proxy(ip, port, routes)
+    create_proxy(ip, port, routes,
+                 processes=args.processes or None,
+                 cpu_affinity=args.cpu_affinity)
@@ -29,6 +29,10 @@ import socket
 import argparse
 
 from daemon.weaprous import WeApRous
+from daemon.streaming import json_body
+from daemon.logger import get_logger, configure, parse_levels
+
+log = get_logger("tracker")
 
 PORT = 9000  # Default port
 
@@ -47,44 +51,35 @@ def hello(headers, body):
     :param headers (str): The request headers or user identifier.
     :param body (str): The request body or message payload.
     """
-    print("[SampleApp] ['PUT'] Hello in {} to {}".format(headers, body))
+    log.info("['PUT'] Hello in {} to {}", headers, body)
     return 200, "OK"
 
 def print_input(headers, body):
-    print("[Tracker] HEADERS:")
-    print(headers)
-    print("[Tracker] body:")
-    print(body)
+    log.debug("HEADERS:\n{}\nbody: {}", headers, body)
 
 def handle_error(e):
-    print("[Tracker] ERROR: {}".format(e))
-    with open("apps/return.json", "w") as f:
-        json.dump({'error': str(e)}, f, indent=4)
-    return 500, "Internal Server Error"
+    log.error("ERROR: {!r}", e)
+    return 500, {'error': str(e)}
 
 @app.route("/", methods=["GET"])
 def home(headers, body):
-    return 200, "OK" #{"message": "Welcome to the RESTful TCP WebApp"}
+    return {"message": "Welcome to the RESTful TCP WebApp"}
 
 @app.route("/user", methods=["GET"])
 def get_user(headers, body):
-    with open("apps/return.json", "w") as f:
-        json.dump({"id": 1, "name": "Alice", "email": "alice@example.com"}, f, indent=4)
-    return 200, "OK"
+    return {"id": 1, "name": "Alice", "email": "alice@example.com"}
 
 @app.route("/echo", methods=["POST"])
 def echo(headers, body):
     try:
         data = json.loads(body)
-        with open("apps/return.json", "w") as f:
-            json.dump({"received": data}, f, indent=4)
-        return 200, "OK"
+        return {"received": data}
     except json.JSONDecodeError:
-        return {"error": "Invalid JSON"}
+        return 400, {"error": "Invalid JSON"}
     
 @app.route('/submit-info', methods=['POST'])
 def submit_info(headers, body):
-    print("[Tracker] POST /submit-info")
+    log.debug("POST /submit-info")
     print_input(headers, body)
     try:
         data = json.loads(body) if body else {}
@@ -92,10 +87,8 @@ def submit_info(headers, body):
         peer_port = data.get('port', 0)
         
         if not (peer_ip and peer_port):
-            print("[Tracker] ERROR: Missing ip or port")
-            with open("apps/return.json", "w") as f:
-                json.dump({'error': 'Missing ip or port'}, f, indent=4)
-            return 400, "Bad Request"
+            log.warning("Missing ip or port")
+            return 400, {'error': 'Missing ip or port'}
         
         peer_id = "{}:{}".format(peer_ip, peer_port)
         peer_list[peer_id] = {
@@ -103,18 +96,16 @@ def submit_info(headers, body):
             'port': int(peer_port),
             'active': False
         }
-        print("[Tracker] Registered: {}".format(peer_id))
+        log.info("Registered: {}", peer_id)
         
-        with open("apps/return.json", "w") as f:
-            json.dump({'peer_id': peer_id}, f, indent=4)
-        return 200, "OK"
+        return {'peer_id': peer_id}
         
     except Exception as e:
         return handle_error(e)
         
 @app.route('/get-list', methods=['GET'])
 def get_list(headers, body):
-    print("[Tracker] GET /get-list")
+    log.debug("GET /get-list")
     print_input(headers, body)
 
     try:
@@ -122,22 +113,20 @@ def get_list(headers, body):
             peer_id: info for peer_id, info in peer_list.items() if info.get("active") is True
         }
 
-        print("[Tracker] Active peers: {}".format(active_peers))
-
-        with open("apps/return.json", "w") as f:
-            json.dump({
-                'peer_list': active_peers,
-                'length': len(active_peers),
-            }, f, indent=4)
+        log.debug("Active peers: {}", active_peers)
 
-        return 200, "OK"
+        # Streamed once the list is large: the JSON is then encoded chunk by chunk
+        return 200, json_body({
+            'peer_list': active_peers,
+            'length': len(active_peers),
+        }, len(active_peers)), {'Content-Type': 'application/json'}
         
     except Exception as e:
         return handle_error(e)
 
 @app.route('/add-list', methods=['POST'])
 def add_list(headers, body):
-    print("[Tracker] POST /add-list")
+    log.debug("POST /add-list")
     print_input(headers, body)
     try:
         data = json.loads(body) if body else {}
@@ -145,37 +134,29 @@ def add_list(headers, body):
         peer_port = data.get('port', 0)
         
         if not (peer_ip and peer_port):
-            print("[Tracker] ERROR: Missing ip or port")
-            with open("apps/return.json", "w") as f:
-                json.dump({'error': 'Missing ip or port'}, f, indent=4)
-            return 400, "Bad Request"
+            log.warning("Missing ip or port")
+            return 400, {'error': 'Missing ip or port'}
         
         peer_id = "{}:{}".format(peer_ip, peer_port)
         if peer_id not in peer_list:
-            print("[Tracker] ERROR: ID {} haven't registerd yet".format(peer_id))
-            with open("apps/return.json", "w") as f:
-                json.dump({'error': "ID {} haven't registerd yet".format(peer_id)}, f, indent=4)
-            return 400, "Bad Request"
+            log.warning("ID {} haven't registerd yet", peer_id)
+            return 400, {'error': "ID {} haven't registerd yet".format(peer_id)}
             
         if peer_list[peer_id]['active']:
-            print("[Tracker] ERROR: ID {} is already online".format(peer_id))
-            with open("apps/return.json", "w") as f:
-                json.dump({'error': "ID {} is already online".format(peer_id)}, f, indent=4)
-            return 400, "Bad Request"
+            log.warning("ID {} is already online", peer_id)
+            return 400, {'error': "ID {} is already online".format(peer_id)}
         
         peer_list[peer_id]['active'] = True
-        print("[Tracker] Active: {}".format(peer_id))
+        log.info("Active: {}", peer_id)
         
-        with open("apps/return.json", "w") as f:
-            json.dump({'peer_id': peer_id}, f, indent=4)
-        return 200, "OK"
+        return {'peer_id': peer_id}
         
     except Exception as e:
         return handle_error(e)
     
 @app.route('/remove', methods=['POST'])
 def add_list(headers, body):
-    print("[Tracker] POST /remove")
+    log.debug("POST /remove")
     print_input(headers, body)
     try:
         data = json.loads(body) if body else {}
@@ -183,29 +164,21 @@ def add_list(headers, body):
         peer_port = data.get('port', 0)
         
         if not (peer_ip and peer_port):
-            print("[Tracker] ERROR: Missing ip or port")
-            with open("apps/return.json", "w") as f:
-                json.dump({'error': 'Missing ip or port'}, f, indent=4)
-            return 400, "Bad Request"
+            log.warning("Missing ip or port")
+            return 400, {'error': 'Missing ip or port'}
         
         peer_id = "{}:{}".format(peer_ip, peer_port)
         if peer_id not in peer_list:
-            print("[Tracker] ERROR: ID {} haven't registerd yet".format(peer_id))
-            with open("apps/return.json", "w") as f:
-                json.dump({'error': "ID {} haven't registerd yet".format(peer_id)}, f, indent=4)
-            return 400, "Bad Request"
+            log.warning("ID {} haven't registerd yet", peer_id)
+            return 400, {'error': "ID {} haven't registerd yet".format(peer_id)}
             
         if not peer_list[peer_id]['active']:
-            print("[Tracker] ERROR: ID {} is already offline".format(peer_id))
-            with open("apps/return.json", "w") as f:
-                json.dump({'error': "ID {} is already offline".format(peer_id)}, f, indent=4)
-            return 400, "Bad Request"
+            log.warning("ID {} is already offline", peer_id)
+            return 400, {'error': "ID {} is already offline".format(peer_id)}
         peer_list[peer_id]['active'] = False
-        print("[Tracker] Offline: {}".format(peer_id))
+        log.info("Offline: {}", peer_id)
         
-        with open("apps/return.json", "w") as f:
-            json.dump({'peer_id': peer_id}, f, indent=4)
-        return 200, "OK"
+        return {'peer_id': peer_id}
         
     except Exception as e:
         return handle_error(e)
@@ -215,16 +188,53 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(prog='Backend', description='', epilog='Beckend daemon')
     parser.add_argument('--server-ip', default='0.0.0.0')
     parser.add_argument('--server-port', type=int, default=PORT)
+    parser.add_argument('--engine', default='threaded', choices=['threaded', 'pool', 'eventloop', 'prefork'])
+    parser.add_argument('--min-workers', type=int, default=8)
+    parser.add_argument('--max-workers', type=int, default=64)
+    parser.add_argument('--queue-size', type=int, default=256)
+    parser.add_argument('--overflow', default='reject', choices=['block', 'reject', 'caller-runs'])
+    parser.add_argument('--stats-interval', type=float, default=0)
+    parser.add_argument('--processes', type=int, default=0)
+    parser.add_argument('--cpu-affinity', action='store_true')
+    parser.add_argument('--static-dir', default='')
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    parser.add_argument('--log-module', action='append', default=[], metavar='NAME=LEVEL')
+    parser.add_argument('--access-sample', type=int, default=1)
+    parser.add_argument('--metrics', action='store_true')
+    parser.add_argument('--trace-slow', type=float, default=0, metavar='SECONDS')
+    parser.add_argument('--profiler', action='store_true')
  
     args = parser.parse_args()
     ip = args.server_ip
     port = args.server_port
-    
-    # Clear the return.json
-    with open("apps/return.json", "w") as f:
-        f.write("")
 
 
+    configure(level=args.log_level, levels=parse_levels(args.log_module),
+              samples={'daemon.access': args.access_sample})
+
     # Prepare and launch the RESTful application
     app.prepare_address(ip, port)
-    app.run()
+    if args.static_dir:
+        app.prepare_static(args.static_dir)
+    if args.metrics:
+        app.enable_metrics()
+    if args.trace_slow:
+        app.enable_tracing(threshold=args.trace_slow)
+    if args.profiler:
+        app.enable_profiler()
+    if args.engine == 'pool':
+        app.run(engine='pool',
+                min_workers=args.min_workers,
+                max_workers=args.max_workers,
+                queue_size=args.queue_size,
+                overflow=args.overflow,
+                stats_interval=args.stats_interval)
+    elif args.engine == 'eventloop':
+        app.run(engine='eventloop', workers=args.min_workers)
+    elif args.engine == 'prefork':
+        app.run(engine='prefork',
+                processes=args.processes or None,
+                cpu_affinity=args.cpu_affinity,
+                stats_interval=args.stats_interval)
+    else:
+        app.run()
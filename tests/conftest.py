@@ -0,0 +1,92 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""Test configuration: the repository root is importable as the ``daemon`` package's parent."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import socket
+import threading
+
+import pytest
+
+from daemon.backend import run_backend, run_backend_pool
+from daemon.eventloop import run_backend_eventloop
+from daemon.request import Request
+from daemon.response import Response
+from daemon.router import Router
+from daemon.weaprous import WeApRous
+
+#: Engine name to the function serving an already listening socket.
+ENGINES = {
+    "threaded": run_backend,
+    "pool": lambda ip, port, routes, server, **options: run_backend_pool(
+        ip, port, routes, **dict({"min_workers": 2, "max_workers": 4}, server=server, **options)),
+    "eventloop": run_backend_eventloop,
+    "eventloop-workers": lambda ip, port, routes, server, **options: run_backend_eventloop(
+        ip, port, routes, **dict({"workers": 2}, server=server, **options)),
+}
+
+
+@pytest.fixture
+def start_server():
+    """Serve a route table on a loopback port with an engine and its options; returns the port."""
+
+    def start(routes, engine="threaded", **options):
+        # Registered like an application does, so handlers carry their route metadata
+        app = WeApRous()
+        for (method, path), func in routes.items():
+            app.route(path, methods=[method])(func)
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(16)
+        port = server.getsockname()[1]
+        thread = threading.Thread(target=ENGINES[engine],
+                                  args=("127.0.0.1", port, Router.from_routes(app.routes)),
+                                  kwargs=dict(options, server=server), daemon=True)
+        thread.start()
+        return port
+
+    return start
+
+
+def exchange(port, raw, timeout=5):
+    """Send a raw request and read until the server closes the connection."""
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+        sock.sendall(raw)
+        data = b""
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except socket.timeout:
+                break
+            if not chunk:
+                break
+            data += chunk
+    return data
+
+
+@pytest.fixture
+def repo_cwd(monkeypatch):
+    """Serve the repository's own www/ and static/ directories."""
+    monkeypatch.chdir(ROOT)
+
+
+def static_get(url, headers=b""):
+    """Build the response to ``GET url`` with extra raw header lines."""
+    request = Request()
+    request.prepare(b"GET " + url.encode() + b" HTTP/1.1\r\nHost: x\r\n" + headers + b"\r\n", None)
+    return Response().build_response(request)
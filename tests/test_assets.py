@@ -0,0 +1,118 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import gzip
+import json
+import os
+
+import pytest
+
+from daemon.assets import build_assets, fingerprint, minify_css, minify_html, minify_js
+from daemon.docroot import StaticIndex
+
+CSS = """/* header */
+body {
+    background: url("../images/logo.png");
+    content: "a  ;  b";
+}
+""" + "p { margin : 0 ; }\n" * 100
+
+HTML = """<!DOCTYPE html>
+<html>
+  <!-- comment -->
+  <head>
+    <link rel="stylesheet" href="/css/site.css?v=1">
+    <style>
+      h1 { color: red ; }
+    </style>
+  </head>
+  <body>
+    <img src="images/logo.png">
+    <a href="https://example.com/css/site.css">x</a>
+    <pre>
+  kept   as is
+    </pre>
+  </body>
+</html>
+"""
+
+
+def write(base, relative, data):
+    path = os.path.join(str(base), relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_minify_css_keeps_strings():
+    assert minify_css('a { color:  red ; } /* x */ b  >  i { content: "1  ;  2"; }') == \
+        'a{color:red}b>i{content:"1  ;  2"}'
+    # A space before ":" is a descendant selector, it stays
+    assert minify_css("a :hover { x: y }") == "a :hover{x:y}"
+
+
+def test_minify_js_keeps_template_literals():
+    source = "// comment\n  let a = 1;\n\n  let t = `\n    kept\n`;\n"
+    assert minify_js(source) == "let a = 1;\nlet t = `\n    kept\n`;"
+
+
+def test_minify_html():
+    text = minify_html(HTML)
+    assert "<!-- comment -->" not in text
+    assert "h1{color:red}" in text
+    assert "<pre>\n  kept   as is\n    </pre>" in text
+
+
+def test_fingerprint():
+    hashed = fingerprint("/css/site.css", b"a")
+    assert hashed.startswith("/css/site.") and hashed.endswith(".css")
+    assert len(hashed) == len("/css/site.css") + 13
+    assert fingerprint("/css/site.css", b"b") != hashed
+
+
+def test_build_assets(tmp_path):
+    source, out = tmp_path / "src", tmp_path / "dist"
+    write(source, "www/index.html", HTML.encode())
+    write(source, "static/css/site.css", CSS.encode())
+    write(source, "static/images/logo.png", b"\x89PNG")
+
+    manifest = build_assets(str(source) + os.sep, str(out))
+    assert set(manifest) == {"/css/site.css", "/images/logo.png"}
+    with open(str(out / "manifest.json")) as f:
+        assert json.load(f) == manifest
+
+    with open(str(out / "www/index.html")) as f:
+        page = f.read()
+    assert 'href="{}?v=1"'.format(manifest["/css/site.css"]) in page
+    assert 'src="{}"'.format(manifest["/images/logo.png"]) in page
+    assert 'href="https://example.com/css/site.css"' in page
+
+    hashed_css = str(out / "static") + manifest["/css/site.css"]
+    with open(hashed_css, "rb") as f:
+        css = f.read()
+    assert manifest["/images/logo.png"].encode() in css
+    with open(hashed_css + ".gz", "rb") as f:
+        assert gzip.decompress(f.read()) == css
+    assert not os.path.exists(str(out / "static") + manifest["/images/logo.png"] + ".gz")
+
+    # Served from the output, hashed URLs are immutable and .gz files are variants
+    index = StaticIndex(str(out) + os.sep)
+    index.build()
+    assert index.lookup(manifest["/css/site.css"]).immutable
+    assert index.lookup(manifest["/css/site.css"]).gzip_path == hashed_css + ".gz"
+    assert not index.lookup("/css/site.css").immutable
+    assert index.lookup("/css/site.css.gz") is None
+
+
+def test_build_refuses_to_overwrite_the_sources(tmp_path):
+    with pytest.raises(ValueError):
+        build_assets(str(tmp_path), str(tmp_path))
@@ -0,0 +1,89 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import gzip
+import json
+
+import pytest
+
+from conftest import exchange, static_get
+from daemon.compression import (MAX_COMPRESS_SIZE, MIN_COMPRESS_SIZE, accepts_gzip, compress,
+                                compressible)
+
+
+@pytest.mark.parametrize("value, accepted", [
+    (None, False),
+    ("", False),
+    ("gzip", True),
+    ("deflate, GZIP;q=0.5", True),
+    ("x-gzip", True),
+    ("gzip;q=0", False),
+    ("gzip;q=0, *", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("br, deflate", False),
+    ("gzip;q=oops", False),
+])
+def test_accepts_gzip(value, accepted):
+    assert accepts_gzip(value) is accepted
+
+
+def test_compressible():
+    assert compressible("text/css", MIN_COMPRESS_SIZE)
+    assert compressible("application/json; charset=utf-8", 4096)
+    assert not compressible("text/css", MIN_COMPRESS_SIZE - 1)
+    assert not compressible("image/png", 4096)
+    assert compressible("image/svg+xml", 4096)
+    assert compressible("text/css", MAX_COMPRESS_SIZE)
+    assert not compressible("text/css", MAX_COMPRESS_SIZE + 1)
+    assert compressible("text/css", MAX_COMPRESS_SIZE + 1, max_size=None)
+
+
+def test_compress_is_deterministic():
+    data = b"hello world " * 200
+    assert compress(data) == compress(data)
+    assert gzip.decompress(compress(data)) == data
+
+
+def test_static_file_is_gzipped_when_accepted(repo_cwd):
+    with open("static/css/chat.css", "rb") as f:
+        css = f.read()
+    head, _, body = static_get("/css/chat.css", b"Accept-Encoding: gzip\r\n").partition(b"\r\n\r\n")
+    assert b"Content-Encoding: gzip" in head
+    assert b"Vary: Accept-Encoding" in head
+    assert b"Content-Length: %d\r\n" % len(body) in head
+    assert gzip.decompress(body) == css
+
+    head, _, body = static_get("/css/chat.css").partition(b"\r\n\r\n")
+    assert b"Content-Encoding" not in head
+    assert b"Vary: Accept-Encoding" in head
+    assert body == css
+
+
+@pytest.mark.parametrize("url", ["/images/welcome.png", "/images/favicon.ico"])
+def test_incompressible_files_are_sent_identity(repo_cwd, url):
+    response = static_get(url, b"Accept-Encoding: gzip\r\n")
+    assert b"Content-Encoding" not in response
+
+
+def test_handler_body_is_gzipped(start_server):
+    items = [{"peer": i, "ip": "127.0.0.1"} for i in range(100)]
+
+    def listing(headers, body):
+        return items
+
+    port = start_server({("GET", "/list"): listing})
+    response = exchange(port, b"GET /list HTTP/1.1\r\nHost: x\r\nAccept-Encoding: gzip\r\n"
+                              b"Connection: close\r\n\r\n")
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert b"Content-Encoding: gzip" in head
+    assert json.loads(gzip.decompress(body)) == items
@@ -0,0 +1,69 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import re
+
+from conftest import static_get
+
+
+def header(response, name):
+    match = re.search(rb"\r\n" + name + rb": ([^\r]*)", response, re.I)
+    return match.group(1) if match else None
+
+
+def test_validators_are_sent(repo_cwd):
+    response = static_get("/css/chat.css")
+    assert response.startswith(b"HTTP/1.1 200 ")
+    assert header(response, b"ETag").startswith(b'"')
+    assert header(response, b"Last-Modified").endswith(b"GMT")
+
+
+def test_matching_etag_is_not_modified(repo_cwd):
+    etag = header(static_get("/css/chat.css"), b"ETag")
+    for value in (etag, b"W/" + etag, b'"other", ' + etag, b"*"):
+        response = static_get("/css/chat.css", b"If-None-Match: " + value + b"\r\n")
+        assert response.startswith(b"HTTP/1.1 304 "), value
+        assert response.endswith(b"\r\n\r\n")
+        assert header(response, b"ETag") == etag
+        assert header(response, b"Content-Length") is None
+
+
+def test_other_etag_is_served_in_full(repo_cwd):
+    response = static_get("/css/chat.css", b'If-None-Match: "stale"\r\n')
+    assert response.startswith(b"HTTP/1.1 200 ")
+
+
+def test_if_modified_since(repo_cwd):
+    last_modified = header(static_get("/css/chat.css"), b"Last-Modified")
+    response = static_get("/css/chat.css", b"If-Modified-Since: " + last_modified + b"\r\n")
+    assert response.startswith(b"HTTP/1.1 304 ")
+    old = b"If-Modified-Since: Thu, 01 Jan 1970 00:00:00 GMT\r\n"
+    assert static_get("/css/chat.css", old).startswith(b"HTTP/1.1 200 ")
+    assert static_get("/css/chat.css", b"If-Modified-Since: junk\r\n").startswith(b"HTTP/1.1 200 ")
+
+
+def test_if_none_match_wins_over_if_modified_since(repo_cwd):
+    last_modified = header(static_get("/css/chat.css"), b"Last-Modified")
+    response = static_get("/css/chat.css", b'If-None-Match: "stale"\r\n'
+                                           b"If-Modified-Since: " + last_modified + b"\r\n")
+    assert response.startswith(b"HTTP/1.1 200 ")
+
+
+def test_gzip_variant_has_its_own_etag(repo_cwd):
+    identity = header(static_get("/css/chat.css"), b"ETag")
+    gzipped = static_get("/css/chat.css", b"Accept-Encoding: gzip\r\n")
+    gzip_etag = header(gzipped, b"ETag")
+    assert gzip_etag != identity
+    response = static_get("/css/chat.css", b"Accept-Encoding: gzip\r\nIf-None-Match: " + gzip_etag + b"\r\n")
+    assert response.startswith(b"HTTP/1.1 304 ")
+    assert header(response, b"ETag") == gzip_etag
+    assert header(response, b"Vary") == b"Accept-Encoding"
@@ -0,0 +1,42 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import os
+
+from daemon.docroot import StaticIndex, docroot_of
+
+
+def touch(base, relative, data=b"x"):
+    path = os.path.join(str(base), relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_docroot_of():
+    assert docroot_of("text/html") == "www/"
+    assert docroot_of("image/png") == "static/"
+    assert docroot_of("application/zip") == "application/"
+    assert docroot_of("application/octet-stream") is None
+    assert docroot_of("application/x-python-code") is None
+
+
+def test_index_serves_only_listed_types(tmp_path):
+    for relative in ("www/index.html", "static/css/a.css", "application/data.xml",
+                     "application/bundle.zip", "application/blob.bin",
+                     "apps/sampleApp.py", "apps/__pycache__/sampleApp.pyc", "www/logo.png"):
+        touch(tmp_path, relative)
+    index = StaticIndex(str(tmp_path) + os.sep)
+    index.build()
+    assert sorted(index.entries) == ["/bundle.zip", "/css/a.css", "/data.xml", "/index.html"]
+    assert index.lookup("/sampleApp.py") is None
+    assert index.lookup("/../apps/sampleApp.py") is None
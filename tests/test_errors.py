@@ -0,0 +1,91 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT, exchange
+
+
+def crash(headers, body):
+    raise RuntimeError("boom")
+
+
+@pytest.mark.parametrize("engine", ["threaded", "pool", "eventloop", "eventloop-workers"])
+def test_crashing_handler_answers_500(start_server, engine):
+    port = start_server({("GET", "/crash"): crash}, engine)
+    response = exchange(port, b"GET /crash HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 500 ")
+    assert b"Cache-Control: no-store" in response
+
+
+@pytest.mark.parametrize("engine", ["threaded", "pool"])
+def test_crash_is_counted_as_500(start_server, engine):
+    from daemon.metrics import metrics
+
+    def fail(headers, body):
+        raise ValueError("bad")
+
+    port = start_server({("GET", "/fail-" + engine): fail}, engine)
+    exchange(port, "GET /fail-{} HTTP/1.1\r\nHost: x\r\n\r\n".format(engine).encode())
+    requests = metrics.snapshot()["requests"]
+    assert requests.get(("GET", "/fail-" + engine, "500")) == 1
+
+
+#: A prefork backend (it installs signal handlers, so it runs as a main program).
+PREFORK_APP = """
+import sys
+from daemon.backend import run_backend_prefork
+from daemon.router import Router
+from daemon.weaprous import WeApRous
+
+app = WeApRous()
+
+@app.route("/crash", methods=["GET"])
+def crash(headers, body):
+    raise RuntimeError("boom")
+
+run_backend_prefork("127.0.0.1", int(sys.argv[1]), Router.from_routes(app.routes),
+                    processes=2, worker_engine=sys.argv[2])
+"""
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="prefork needs os.fork")
+@pytest.mark.parametrize("worker_engine", ["threaded", "eventloop"])
+def test_crashing_handler_answers_500_under_prefork(worker_engine):
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    server = subprocess.Popen([sys.executable, "-c", PREFORK_APP, str(port), worker_engine],
+                              cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                assert time.monotonic() < deadline, "prefork backend did not start"
+                time.sleep(0.05)
+        response = exchange(port, b"GET /crash HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        assert response.startswith(b"HTTP/1.1 500 ")
+        assert b"Cache-Control: no-store" in response
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(10)
@@ -0,0 +1,69 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import socket
+import threading
+import time
+
+import pytest
+
+from daemon.eventloop import EventLoop, _Connection
+from daemon.router import Router
+from daemon.weaprous import WeApRous
+
+
+@pytest.fixture
+def slow_loop():
+    """An event loop with hook workers serving ``GET /slow``, held until released."""
+    release = threading.Event()
+    app = WeApRous()
+
+    @app.route("/slow", methods=["GET"])
+    def slow(headers, body):
+        release.wait(5)
+        return "done"
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    port = server.getsockname()[1]
+    loop = EventLoop("127.0.0.1", port, Router.from_routes(app.routes), workers=1)
+    threading.Thread(target=loop.serve_forever, args=(server,), daemon=True).start()
+    yield loop, port, release
+    release.set()
+
+
+def connections(loop):
+    return [key.data for key in list(loop.selector.get_map().values())
+            if isinstance(key.data, _Connection)]
+
+
+def test_busy_connection_is_not_read(slow_loop):
+    loop, port, release = slow_loop
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"GET /slow HTTP/1.1\r\nHost: x\r\n\r\n")
+        deadline = time.monotonic() + 5
+        while loop.pool.stats()["busy"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Pipelined behind the slow request: left in the socket, not buffered
+        sock.sendall(b"GET /slow HTTP/1.1\r\nHost: x\r\n\r\n" * 20)
+        time.sleep(0.1)
+        assert connections(loop) == []
+
+        release.set()
+        data = b""
+        while data.count(b"done") < 21:
+            chunk = sock.recv(65536)
+            assert chunk
+            data += chunk
+    assert data.count(b"HTTP/1.1 200 ") == 21
+
@@ -0,0 +1,55 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import json
+
+import pytest
+
+from conftest import exchange
+from daemon.response import Response
+
+
+@pytest.mark.parametrize("result, status, body, content_type", [
+    ({"ok": True}, 200, b'{"ok": true}', "application/json"),
+    ([1, 2], 200, b"[1, 2]", "application/json"),
+    ("héllo", 200, "héllo".encode(), "text/plain; charset=utf-8"),
+    (b"\x00\x01", 200, b"\x00\x01", "application/octet-stream"),
+    (None, 200, b"", "text/plain; charset=utf-8"),
+    ((201, "made"), 201, b"made", "text/plain; charset=utf-8"),
+    ((202, ("a,", b"b"), {"content-type": "text/csv"}), 202, b"a,b", "text/csv"),
+])
+def test_handler_results(result, status, body, content_type):
+    response = Response()
+    response.prepare_hook_result(result)
+    assert response.status_code == status
+    assert response._content == body
+    assert response.headers["Content-Type"] == content_type
+
+
+def test_unknown_status_reason():
+    response = Response()
+    response.prepare_hook_result((599, ""))
+    assert response.reason == "Unknown"
+
+
+def test_served_handler_result(start_server):
+    def create(headers, body, **params):
+        return 201, {"id": params["id"], "body": body}, {"X-Created": "yes"}
+
+    app_port = start_server({("POST", "/items/<int:id>"): create})
+    response = exchange(app_port, b"POST /items/7 HTTP/1.1\r\nHost: x\r\nConnection: close\r\n"
+                                  b"Content-Length: 2\r\n\r\nhi")
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 201 Created")
+    assert b"X-Created: yes" in head
+    assert b"Content-Type: application/json" in head
+    assert json.loads(body) == {"id": 7, "body": "hi"}
@@ -0,0 +1,89 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import socket
+
+import pytest
+
+from conftest import exchange
+
+ENGINES = ["threaded", "pool", "eventloop", "eventloop-workers"]
+
+
+def echo(headers, body):
+    return body
+
+
+def responses(data):
+    """Split a stream of Content-Length framed responses."""
+    out = []
+    while data:
+        head, _, rest = data.partition(b"\r\n\r\n")
+        length = int(head.lower().split(b"content-length:", 1)[1].split(b"\r\n", 1)[0])
+        out.append((head, rest[:length]))
+        data = rest[length:]
+    return out
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_pipelined_requests_are_answered_in_order(start_server, engine):
+    port = start_server({("POST", "/echo"): echo}, engine)
+    raw = b"".join(
+        b"POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: 3\r\n\r\n" + body
+        for body in (b"one", b"two")
+    ) + b"POST /echo HTTP/1.1\r\nHost: x\r\nConnection: close\r\nContent-Length: 5\r\n\r\nthree"
+    answers = responses(exchange(port, raw))
+    assert [body for _, body in answers] == [b"one", b"two", b"three"]
+    assert b"Connection: keep-alive" in answers[0][0]
+    assert b"Connection: close" in answers[2][0]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_connection_is_reused_between_requests(start_server, engine):
+    port = start_server({("POST", "/echo"): echo}, engine)
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        for body in (b"a", b"b"):
+            sock.sendall(b"POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: 1\r\n\r\n" + body)
+            data = b""
+            while not data.endswith(b"\r\n\r\n" + body):
+                chunk = sock.recv(65536)
+                assert chunk, "connection closed after a keep-alive response"
+                data += chunk
+            assert data.startswith(b"HTTP/1.1 200 ")
+
+
+def test_http10_closes_without_keep_alive(start_server):
+    port = start_server({("POST", "/echo"): echo})
+    response = exchange(port, b"POST /echo HTTP/1.0\r\nContent-Length: 2\r\n\r\nhi")
+    assert b"Connection: close" in response
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_smuggling_framing_closes_the_connection(start_server, engine):
+    port = start_server({("POST", "/echo"): echo}, engine)
+    # Both framing headers: chunked wins, and nothing after it is served
+    raw = (b"POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: 40\r\n"
+           b"Transfer-Encoding: chunked\r\n\r\n2\r\nhi\r\n0\r\n\r\n"
+           b"POST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: 3\r\n\r\nbad")
+    answers = responses(exchange(port, raw))
+    assert [body for _, body in answers] == [b"hi"]
+    assert b"Connection: close" in answers[0][0]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_unknown_final_transfer_coding_is_rejected(start_server, engine):
+    port = start_server({("POST", "/echo"): echo}, engine)
+    raw = (b"POST /echo HTTP/1.1\r\nHost: x\r\nTransfer-Encoding: chunked, identity\r\n\r\n"
+           b"0\r\n\r\nPOST /echo HTTP/1.1\r\nHost: x\r\nContent-Length: 3\r\n\r\nbad")
+    response = exchange(port, raw)
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"bad" not in response
@@ -0,0 +1,144 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import io
+import os
+import threading
+
+import pytest
+
+from daemon import logger as logger_module
+from daemon.logger import (DEBUG, ERROR, INFO, WARNING, LogWriter, access, configure,
+                           get_logger, parse_levels)
+
+
+@pytest.fixture
+def output(monkeypatch):
+    """A fresh logger registry writing to an in-memory stream; returns the stream."""
+    stream = io.StringIO()
+    monkeypatch.setattr(logger_module, "writer", LogWriter(stream))
+    monkeypatch.setattr(logger_module, "_loggers", {})
+    monkeypatch.setattr(logger_module, "_levels", {})
+    monkeypatch.setattr(logger_module, "_samples", {})
+    monkeypatch.setattr(logger_module, "_default_level", INFO)
+    return stream
+
+
+def lines(stream):
+    logger_module.writer.flush()
+    return stream.getvalue().splitlines()
+
+
+def test_parse_levels():
+    assert parse_levels(["daemon.response=DEBUG", " daemon = warning "]) == {
+        "daemon.response": DEBUG, "daemon": WARNING}
+    assert parse_levels(None) == {}
+    for spec in ("daemon.response", "=DEBUG", "daemon=LOUD"):
+        with pytest.raises(ValueError):
+            parse_levels([spec])
+
+
+def test_levels_resolve_per_module_then_package(output):
+    configure(level="WARNING", levels={"daemon": "INFO", "daemon.response": "DEBUG"})
+    assert get_logger("daemon.response").level == DEBUG
+    assert get_logger("daemon.response.sub").level == DEBUG
+    assert get_logger("daemon.request").level == INFO
+    assert get_logger("peer").level == WARNING
+    # Existing loggers follow a later configure()
+    configure(levels={"daemon.request": ERROR})
+    assert get_logger("daemon.request").level == ERROR
+
+
+def test_disabled_records_are_not_written(output):
+    configure(levels={"quiet": "WARNING"})
+    log = get_logger("quiet")
+    log.debug("hidden {}", 1)
+    log.info("hidden {}", 2)
+    log.warning("shown {}", 3)
+    written = lines(output)
+    assert len(written) == 1
+    assert written[0].endswith(" WARNING quiet shown 3")
+
+
+def test_broken_template_is_written_as_is(output):
+    get_logger("app").info("missing {} {}", 1)
+    assert lines(output)[0].endswith(" INFO app missing {} {} (1,)")
+
+
+def test_sampling_keeps_warnings(output):
+    configure(samples={"hot": 10})
+    log = get_logger("hot")
+    for i in range(30):
+        log.info("tick {}", i)
+    log.warning("always")
+    written = lines(output)
+    assert [line.rsplit(" ", 1)[1] for line in written] == ["0", "10", "20", "always"]
+
+
+def test_full_queue_drops_and_counts(output):
+    entered, release = threading.Event(), threading.Event()
+
+    class SlowStream(io.StringIO):
+        def write(self, text):
+            entered.set()
+            release.wait(5)
+            return super().write(text)
+
+    stream = SlowStream()
+    writer = LogWriter(stream, max_queue=1)
+    record = (0.0, INFO, "app", "record", ())
+    writer.put(record)
+    entered.wait(5)  # the writer thread is busy with the first record
+    writer.put(record)  # queued
+    writer.put(record)  # dropped
+    assert writer.dropped == 1
+    release.set()
+    writer.flush()
+    assert stream.getvalue().count("record") == 2
+
+
+def test_flush_without_records_returns():
+    LogWriter(io.StringIO()).flush(timeout=0)
+
+
+def test_access_line_format(output, monkeypatch):
+    monkeypatch.setattr(logger_module.access_log, "level", INFO)
+    access(("127.0.0.1", 51234), "GET", "/css/chat.css", "HTTP/1.1", 200, 6393, 0.0004)
+    access(None, "GET", "/events", "HTTP/1.1", 200, None, 0.0123)
+    written = lines(output)
+    assert written[0].endswith(' INFO daemon.access 127.0.0.1:51234 "GET /css/chat.css HTTP/1.1" 200 6393 0.4ms')
+    assert written[1].endswith(' INFO daemon.access -:- "GET /events HTTP/1.1" 200 - 12.3ms')
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_starts_its_own_writer(tmp_path):
+    path = tmp_path / "log.txt"
+    with open(path, "w") as stream:
+        writer = LogWriter(stream)
+        writer.put((0.0, INFO, "parent", "before fork", ()))
+        writer.flush()
+        pid = os.fork()
+        if pid == 0:
+            # The parent's writer thread did not survive: a new one must start
+            code = 1
+            try:
+                parent_queue_dropped = writer._queue is None
+                writer.put((0.0, INFO, "child", "after fork", ()))
+                writer.flush()
+                code = 0 if parent_queue_dropped else 2
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    text = path.read_text()
+    assert "parent before fork" in text
+    assert "child after fork" in text
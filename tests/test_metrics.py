@@ -0,0 +1,72 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import threading
+
+from daemon.metrics import Metrics
+
+
+def test_counts_and_histogram():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.end("GET", "/get-list", "200", metrics.begin())
+    metrics.end("GET", "/get-list", "200", metrics.begin())
+    metrics.end("GET", "/get-list", "500", metrics.begin())
+    snap = metrics.snapshot()
+    assert snap["requests"][("GET", "/get-list", "200")] == 2
+    assert snap["requests"][("GET", "/get-list", "500")] == 1
+    assert snap["latency"][("GET", "/get-list")][0] == 3
+    assert snap["in_flight"] == 0
+
+
+def test_short_lived_threads_do_not_grow_the_shards():
+    metrics = Metrics(shards=8)
+
+    def request():
+        metrics.end("GET", "/", "200", metrics.begin())
+
+    for _ in range(200):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+    assert len(metrics._shards) == 8
+    assert metrics.snapshot()["requests"][("GET", "/", "200")] == 200
+
+
+def test_render_is_prometheus_text():
+    metrics = Metrics()
+    metrics.end("POST", '/a"b', "201", metrics.begin())
+    text = metrics.render()
+    assert 'weaprous_requests_total{route="/a\\"b",method="POST",status="201"} 1' in text
+    assert 'weaprous_request_duration_seconds_count{route="/a\\"b",method="POST"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_method_label_is_escaped():
+    metrics = Metrics()
+    metrics.end('G"E}T', "other", "400", metrics.begin())
+    text = metrics.render()
+    assert 'weaprous_requests_total{route="other",method="G\\"E}T",status="400"} 1' in text
+
+
+def test_unknown_methods_are_labelled_other(start_server):
+    from conftest import exchange
+    from daemon.metrics import metrics
+
+    def hello(headers, body):
+        return "hi"
+
+    port = start_server({("GET", "/method-label"): hello})
+    for method in (b'G"E}T', b"BREW", b"GET"):
+        exchange(port, method + b" /method-label HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    methods = {method for method, _, _ in metrics.snapshot()["requests"]}
+    assert {"GET", "other"} <= methods
+    assert not methods & {'G"E}T', "BREW"}
@@ -0,0 +1,73 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+from daemon.parser import parse_request
+from daemon.request import Request
+
+RAW = (b"POST /echo?x=1&y=2 HTTP/1.1\r\n"
+       b"Host: 127.0.0.1:9000\r\n"
+       b"Content-Type:  text/plain \r\n"
+       b"X-Dup: first\r\n"
+       b"x-dup: second\r\n"
+       b"no colon here\r\n"
+       b"\r\n"
+       b"hello")
+
+
+def test_request_line_and_body():
+    p = parse_request(RAW)
+    assert (p.method, p.path, p.query, p.version) == (b"POST", b"/echo", b"x=1&y=2", b"HTTP/1.1")
+    assert p.terminated
+    assert bytes(p.body) == b"hello"
+    assert bytes(p.head).endswith(b"no colon here")
+
+
+def test_header_lookup_is_case_insensitive_and_keeps_the_first():
+    p = parse_request(RAW)
+    assert p.header(b"content-type") == b"text/plain"
+    assert p.header(b"x-dup") == b"first"
+    assert p.header(b"missing") is None
+    assert list(p.header_items())[-1] == (b"x-dup", b"second")
+
+
+def test_header_index_is_built_once():
+    p = parse_request(RAW)
+    p.header(b"host")
+    index = p._index
+    p.header(b"x-dup")
+    assert p._index is index
+    assert set(index) == {b"host", b"content-type", b"x-dup"}
+
+
+def test_unterminated_and_headerless_requests():
+    p = parse_request(b"GET / HTTP/1.1\r\nHost: a")
+    assert not p.terminated
+    assert p.header(b"host") == b"a"
+    assert bytes(p.body) == b""
+
+    p = parse_request(b"GET / HTTP/1.1\r\n\r\n")
+    assert list(p.header_items()) == []
+    assert p.header(b"host") is None
+
+
+def test_malformed_request_line():
+    assert parse_request(b"GET /\r\n\r\n") is None
+    assert parse_request(b"\r\n\r\n") is None
+    assert parse_request(bytearray(b"GET / HTTP/1.0\r\n\r\n")).version == b"HTTP/1.0"
+
+
+def test_request_get_header_uses_the_index():
+    request = Request()
+    request.prepare(RAW, None)
+    assert request.get_header("content-type") == "text/plain"
+    assert request.get_header("host") == "127.0.0.1:9000"
+    assert request.body == "hello"
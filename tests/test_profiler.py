@@ -0,0 +1,74 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import threading
+import time
+
+import pytest
+
+from conftest import exchange
+from daemon.profiler import MAX_DURATION, MIN_INTERVAL, SamplingProfiler
+
+
+def wait_result(profiler, timeout=5):
+    deadline = time.monotonic() + timeout
+    while profiler.running:
+        assert time.monotonic() < deadline, "profile did not finish"
+        time.sleep(0.01)
+    return profiler.result()
+
+
+@pytest.mark.parametrize("duration, interval", [
+    (0, 0.01), (MAX_DURATION + 1, 0.01), (1, MIN_INTERVAL / 2), (0.1, 0.1),
+])
+def test_out_of_range_settings(duration, interval):
+    with pytest.raises(ValueError):
+        SamplingProfiler().start(duration, interval)
+
+
+def test_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    assert profiler.start(0.05, 0.01)
+    assert not profiler.start(0.05, 0.01)
+    profile = wait_result(profiler)
+    assert profile.ticks > 0
+    assert profile.samples == 0  # no request was being handled
+    assert profile.collapsed() == ""
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_samples_are_filed_under_the_route(start_server):
+    def busy(headers, body, **params):
+        spin(0.3)
+        return "done"
+
+    port = start_server({("GET", "/busy/<int:n>"): busy})
+    profiler = SamplingProfiler()
+    client = threading.Thread(target=exchange, args=(
+        port, b"GET /busy/1 HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"))
+    client.start()
+    time.sleep(0.05)
+    assert profiler.start(0.15, 0.005)
+    profile = wait_result(profiler)
+    client.join()
+
+    assert profile.samples > 0
+    lines = profile.collapsed().splitlines()
+    assert all(line.startswith("/busy/<int:n>;") for line in lines)
+    assert any(";test_profiler.py:spin " in line for line in lines)
+    route = profile.hot_spots()["routes"]["/busy/<int:n>"]
+    assert route["self"][0]["function"] == "test_profiler.py:spin"
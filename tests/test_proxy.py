@@ -0,0 +1,112 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import socket
+import threading
+
+import pytest
+
+from conftest import exchange
+from daemon.proxy import forward_request, run_proxy, set_connection_header
+
+
+@pytest.fixture
+def proxy(start_server):
+    """A proxy routing Host ``app.local`` to a backend echoing POST bodies; returns its port."""
+
+    def echo(headers, body):
+        return {"length": len(body), "body": body}
+
+    backend = start_server({("POST", "/echo"): echo, ("GET", "/echo"): echo})
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    port = server.getsockname()[1]
+    routes = {"app.local": ("127.0.0.1:{}".format(backend), "round-robin")}
+    threading.Thread(target=run_proxy, args=("127.0.0.1", port, routes),
+                     kwargs={"server": server}, daemon=True).start()
+    return port
+
+
+def test_set_connection_header():
+    message = b"GET / HTTP/1.1\r\nHost: a\r\nConnection: close\r\nKeep-Alive: 5\r\n\r\nbody"
+    assert set_connection_header(message, b"keep-alive") == \
+        b"GET / HTTP/1.1\r\nHost: a\r\nConnection: keep-alive\r\n\r\nbody"
+
+
+def test_non_utf8_body_is_forwarded(proxy):
+    body = b"\xff\xfe\x00binary"
+    response = exchange(proxy, b"POST /echo HTTP/1.1\r\nHost: app.local\r\n"
+                               b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+    assert response.startswith(b"HTTP/1.1 200 ")
+    assert b"Connection: close" in response
+    assert b"binary" in response
+
+
+def test_missing_host_is_a_bad_request(proxy):
+    response = exchange(proxy, b"GET /echo HTTP/1.1\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+@pytest.fixture
+def flaky_backend():
+    """A backend answering the first request of each connection and closing on the
+    second without answering; returns its port and the list of received request lines."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    received = []
+
+    def serve(conn):
+        with conn:
+            for answered in (False, True):
+                data = conn.recv(65536)
+                if not data:
+                    return
+                received.append(data.split(b"\r\n", 1)[0])
+                if answered:
+                    return
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+
+    def accept():
+        while True:
+            conn, _ = server.accept()
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return server.getsockname()[1], received
+
+
+def test_idempotent_request_is_retried_on_a_fresh_connection(flaky_backend):
+    port, received = flaky_backend
+    request = b"GET /a HTTP/1.1\r\nHost: b\r\n\r\n"
+    assert forward_request("127.0.0.1", port, request).endswith(b"ok")
+    assert forward_request("127.0.0.1", port, request).endswith(b"ok")
+    assert received == [b"GET /a HTTP/1.1"] * 3
+
+
+def test_post_is_not_retried(flaky_backend):
+    port, received = flaky_backend
+    request = b"POST /a HTTP/1.1\r\nHost: b\r\nContent-Length: 0\r\n\r\n"
+    assert forward_request("127.0.0.1", port, request).endswith(b"ok")
+    assert forward_request("127.0.0.1", port, request).startswith(b"HTTP/1.1 502 ")
+    assert received == [b"POST /a HTTP/1.1"] * 2
+
+
+def test_unreachable_backend_is_a_bad_gateway():
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    response = forward_request("127.0.0.1", port, b"GET / HTTP/1.1\r\nHost: b\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 502 ")
+    assert b"Cache-Control: no-store" in response
@@ -0,0 +1,97 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import pytest
+
+from conftest import static_get
+from daemon.response import parse_range
+
+
+@pytest.mark.parametrize("value, ranges", [
+    ("bytes=0-9", [(0, 9)]),
+    ("bytes=90-", [(90, 99)]),
+    ("bytes=-10", [(90, 99)]),
+    ("bytes=-500", [(0, 99)]),
+    ("bytes=50-500", [(50, 99)]),
+    ("BYTES = 0-0, 5-6", [(0, 0), (5, 6)]),
+    ("bytes=100-", []),
+    ("bytes=-0", []),
+    ("bytes=9-1", None),
+    ("bytes=a-b", None),
+    ("bytes=5", None),
+    ("items=0-1", None),
+])
+def test_parse_range(value, ranges):
+    assert parse_range(value, 100) == ranges
+
+
+@pytest.fixture
+def css(repo_cwd):
+    with open("static/css/chat.css", "rb") as f:
+        return f.read()
+
+
+def test_single_range(css):
+    response = static_get("/css/chat.css", b"Range: bytes=10-19\r\n")
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 206 Partial Content")
+    assert b"Content-Range: bytes 10-19/%d" % len(css) in head
+    assert b"Content-Length: 10\r\n" in head
+    assert body == css[10:20]
+
+
+def test_unsatisfiable_range(css):
+    response = static_get("/css/chat.css", b"Range: bytes=%d-\r\n" % len(css))
+    assert response.startswith(b"HTTP/1.1 416 ")
+    assert b"Content-Range: bytes */%d" % len(css) in response
+
+
+@pytest.mark.parametrize("headers", [
+    b"Range: bytes=0-1,5-6\r\n",          # multiple ranges: the whole file
+    b"Range: bytes=oops\r\n",             # malformed: ignored
+    b'Range: bytes=0-1\r\nIf-Range: "stale"\r\n',
+])
+def test_full_file_instead_of_a_range(css, headers):
+    response = static_get("/css/chat.css", headers)
+    assert response.startswith(b"HTTP/1.1 200 ")
+    assert response.endswith(css)
+
+
+def test_if_range_with_the_current_validator(css):
+    head = static_get("/css/chat.css").partition(b"\r\n\r\n")[0]
+    etag = head.split(b"ETag: ", 1)[1].split(b"\r\n", 1)[0]
+    response = static_get("/css/chat.css", b"Range: bytes=0-3\r\nIf-Range: " + etag + b"\r\n")
+    assert response.startswith(b"HTTP/1.1 206 ")
+    assert response.endswith(css[:4])
+
+
+def test_range_is_served_identity_even_with_gzip(css):
+    response = static_get("/css/chat.css", b"Range: bytes=0-3\r\nAccept-Encoding: gzip\r\n")
+    assert b"Content-Encoding" not in response
+    assert response.endswith(css[:4])
+
+
+def test_full_length_range_is_served_identity_even_with_gzip(css):
+    response = static_get("/css/chat.css", b"Range: bytes=0-\r\nAccept-Encoding: gzip\r\n")
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 206 Partial Content")
+    assert b"Content-Range: bytes 0-%d/%d" % (len(css) - 1, len(css)) in head
+    assert b"Content-Length: %d\r\n" % len(css) in head
+    assert b"Content-Encoding" not in head
+    assert b'-gz"' not in head
+    assert body == css
+
+
+def test_gzip_without_a_range(css):
+    head = static_get("/css/chat.css", b"Accept-Encoding: gzip\r\n").partition(b"\r\n\r\n")[0]
+    assert head.startswith(b"HTTP/1.1 200 ")
+    assert b"Content-Encoding: gzip" in head
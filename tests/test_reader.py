@@ -0,0 +1,140 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import pytest
+
+from daemon.reader import BodyStream, RequestError, RequestReader, frame_request
+
+
+class FakeConn:
+    """A socket returning ``data`` in pieces of ``step`` bytes."""
+
+    def __init__(self, data, step=7):
+        self.data = data
+        self.step = step
+        self.sent = b""
+
+    def recv(self, size):
+        piece, self.data = self.data[:min(size, self.step)], self.data[min(size, self.step):]
+        return piece
+
+    def sendall(self, data):
+        self.sent += data
+
+
+CHUNKED = (b"POST /a HTTP/1.1\r\nHost: x\r\nTransfer-Encoding: chunked\r\n\r\n"
+           b"5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nTrailer: t\r\n\r\n")
+
+
+def test_content_length_body_across_reads():
+    conn = FakeConn(b"POST /a HTTP/1.1\r\nContent-Length: 5\r\n\r\nhelloGET /b HTTP/1.1\r\n\r\n")
+    reader = RequestReader(conn)
+    head, body = reader.read_request()
+    assert head.endswith(b"Content-Length: 5\r\n\r\n") and body == b"hello"
+    # The pipelined request stays buffered for the next read
+    head, body = reader.read_request()
+    assert head == b"GET /b HTTP/1.1\r\n\r\n" and body == b""
+    assert reader.read_request() == (None, None)
+
+
+def test_chunked_body_is_decoded_and_reframed():
+    head, body = RequestReader(FakeConn(CHUNKED)).read_request()
+    assert body == b"hello world"
+    assert b"Transfer-Encoding" not in head
+    assert head.endswith(b"Content-Length: 11\r\n\r\n")
+
+
+def test_frame_request_matches_the_reader():
+    length, head, body = frame_request(CHUNKED + b"GET /next")
+    assert length == len(CHUNKED)
+    assert body == b"hello world"
+    assert head.endswith(b"Content-Length: 11\r\n\r\n")
+    # Incomplete at every split point
+    for end in range(len(CHUNKED)):
+        assert frame_request(CHUNKED[:end]) is None
+
+
+def test_large_body_is_streamed():
+    body = b"x" * 100
+    conn = FakeConn(b"POST /a HTTP/1.1\r\nContent-Length: 100\r\n\r\n" + body)
+    head, stream = RequestReader(conn, stream_threshold=10).read_request()
+    assert isinstance(stream, BodyStream)
+    assert stream.read() == body
+
+
+def test_expect_100_continue():
+    conn = FakeConn(b"POST /a HTTP/1.1\r\nExpect: 100-continue\r\nContent-Length: 2\r\n\r\nok")
+    assert RequestReader(conn).read_request()[1] == b"ok"
+    assert conn.sent == b"HTTP/1.1 100 Continue\r\n\r\n"
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"POST /a HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /a HTTP/1.1\r\nContent-Length: -1\r\n\r\n", 400),
+    (b"POST /a HTTP/1.1\r\nContent-Length: 11\r\n\r\n", 413),
+    (b"POST /a HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n", 400),
+    (b"POST /a HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n10\r\n" + b"x" * 16 + b"\r\n0\r\n\r\n", 413),
+    (b"GET /a HTTP/1.1\r\nX: " + b"y" * 200 + b"\r\n\r\n", 431),
+    # RFC 9112 section 6.3 framing rules
+    (b"POST /a HTTP/1.1\r\nTransfer-Encoding: chunked, identity\r\n\r\n0\r\n\r\n", 400),
+    (b"POST /a HTTP/1.1\r\nTransfer-Encoding: gzip\r\nContent-Length: 4\r\n\r\nabcd", 400),
+    (b"POST /a HTTP/1.1\r\nContent-Length: 4\r\nContent-Length: 6\r\n\r\nabcdef", 400),
+    (b"POST /a HTTP/1.1\r\nContent-Length: 4, 6\r\n\r\nabcdef", 400),
+    (b"POST /a HTTP/1.1\r\nContent-Length: +5\r\n\r\nabcde", 400),
+    (b"POST /a HTTP/1.1\r\nContent-Length: 1_0\r\n\r\nabcde", 400),
+    (b"POST /a HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n+5\r\nhello\r\n0\r\n\r\n", 400),
+])
+def test_malformed_or_oversized_requests(raw, status):
+    reader = RequestReader(FakeConn(raw), max_header_size=128, max_body_size=10)
+    with pytest.raises(RequestError) as error:
+        reader.read_request()
+    assert error.value.status_code == status
+    # frame_request applies the same limits to the in-memory buffer
+    with pytest.raises(RequestError) as error:
+        frame_request(raw, max_header_size=128, max_body_size=10)
+    assert error.value.status_code == status
+
+
+def test_body_cut_short_by_the_client():
+    raw = b"POST /a HTTP/1.1\r\nContent-Length: 5\r\n\r\nab"
+    with pytest.raises(RequestError) as error:
+        RequestReader(FakeConn(raw)).read_request()
+    assert error.value.status_code == 400
+    assert frame_request(raw) is None
+
+
+def test_repeated_identical_content_length():
+    raw = b"POST /a HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 5\r\n\r\nhello"
+    assert RequestReader(FakeConn(raw)).read_request()[1] == b"hello"
+    assert frame_request(raw)[2] == b"hello"
+
+
+def test_transfer_encoding_overrides_content_length_and_closes():
+    raw = (b"POST /a HTTP/1.1\r\nContent-Length: 4\r\nConnection: keep-alive\r\n"
+           b"Transfer-Encoding: chunked\r\n\r\n2\r\nhi\r\n0\r\n\r\n")
+    head, body = RequestReader(FakeConn(raw)).read_request()
+    assert body == b"hi"
+    assert b"Content-Length: 2\r\n" in head
+    assert b"keep-alive" not in head
+    assert b"Connection: close\r\n" in head
+    assert frame_request(raw)[1] == head
+
+
+def test_unterminated_chunk_line_is_rejected():
+    raw = b"POST /a HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+    assert frame_request(raw + b"0" * 100, max_header_size=128) is None
+    with pytest.raises(RequestError) as error:
+        frame_request(raw + b"0" * 200, max_header_size=128)
+    assert error.value.status_code == 400
+    # Trailers are bounded the same way
+    with pytest.raises(RequestError):
+        frame_request(raw + b"0\r\nX: " + b"y" * 200, max_header_size=128)
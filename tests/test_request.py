@@ -0,0 +1,65 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+from daemon.request import Request
+
+RAW = (b"POST /login HTTP/1.1\r\n"
+       b"Host: 127.0.0.1:9000\r\n"
+       b"Cookie: auth=true;  theme = dark ;broken\r\n"
+       b"Content-Length: 29\r\n"
+       b"\r\n"
+       b"username=admin&password=p\xc3\xa4ss")
+
+
+def prepared(raw=RAW):
+    request = Request()
+    request.prepare(raw, None)
+    return request
+
+
+def test_nothing_is_materialised_by_prepare():
+    request = prepared()
+    assert (request.method, request.path, request.version) == ("POST", "/login", "HTTP/1.1")
+    assert not {"headers", "cookies", "body"} & set(request.__dict__)
+    # A header lookup does not build the headers dict either
+    assert request.get_header("host") == "127.0.0.1:9000"
+    assert "headers" not in request.__dict__
+
+
+def test_headers_cookies_and_body_on_access():
+    request = prepared()
+    assert request.headers["host"] == "127.0.0.1:9000"
+    assert request.headers["content-length"] == "29"
+    assert request.cookies == {"auth": "true", "theme": "dark"}
+    assert request.body == "username=admin&password=päss"
+
+
+def test_root_path_and_missing_body():
+    request = prepared(b"GET / HTTP/1.1\r\nHost: a")
+    assert request.path == "/index.html"
+    assert request.body is None
+    assert request.cookies == {}
+
+
+def test_prepare_resets_the_lazy_attributes():
+    request = prepared()
+    assert request.cookies
+    request.prepare(b"GET /a HTTP/1.1\r\nHost: b\r\n\r\n", None)
+    assert request.cookies == {}
+    assert request.headers["host"] == "b"
+    assert request.body == ""
+
+
+def test_malformed_request_line():
+    request = prepared(b"garbage\r\n\r\n")
+    assert request.method is None
+    assert request.headers == {"Content-Length": "0"}
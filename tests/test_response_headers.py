@@ -0,0 +1,74 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import email.utils
+
+from daemon import response as response_module
+from daemon.request import Request
+from daemon.response import MAX_HEADER_TEMPLATES, Response, header_template, http_date
+
+
+def build(result, **attrs):
+    response = Response()
+    for name, value in attrs.items():
+        setattr(response, name, value)
+    response.prepare_hook_result(result)
+    return response.build_response_header(Request())
+
+
+def test_header_template_is_reused():
+    first = header_template(200, "OK", "text/plain", "close")
+    assert first == b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nConnection: close\r\n"
+    assert header_template(200, "OK", "text/plain", "close") is first
+
+
+def test_template_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(response_module, "_header_templates", {})
+    for i in range(MAX_HEADER_TEMPLATES + 10):
+        header_template(200, "Reason {}".format(i), "text/plain", "close")
+    assert len(response_module._header_templates) == MAX_HEADER_TEMPLATES
+
+
+def test_http_date_is_formatted_once_per_second(monkeypatch):
+    class Clock:
+        now = 1_000_000_000.2
+
+        def time(self):
+            return self.now
+
+    clock = Clock()
+    monkeypatch.setattr(response_module, "time", clock)
+    value = http_date()
+    assert value == b"Sun, 09 Sep 2001 01:46:40 GMT"
+    clock.now += 0.5
+    assert http_date() is value
+    clock.now += 1
+    assert email.utils.parsedate_to_datetime(http_date().decode()).timestamp() == 1_000_000_001
+
+
+def test_response_header_block():
+    header = build((201, {"a": 1}, {"X-Custom": "1", "Set-Cookie": ["a=1", "b=2"]}))
+    lines = header.decode().split("\r\n")
+    assert lines[0] == "HTTP/1.1 201 Created"
+    assert "Content-Type: application/json" in lines
+    assert "Content-Length: 8" in lines
+    assert "Cache-Control: no-cache" in lines
+    assert "X-Custom: 1" in lines
+    assert lines.count("Set-Cookie: a=1") == lines.count("Set-Cookie: b=2") == 1
+    assert header.endswith(b"\r\n\r\n")
+    assert sum(line.startswith("Content-Type:") for line in lines) == 1
+
+
+def test_keep_alive_header():
+    header = build("x", connection="keep-alive", keepalive=(5, 99))
+    assert b"Connection: keep-alive\r\n" in header
+    assert b"Keep-Alive: timeout=5, max=99\r\n" in header
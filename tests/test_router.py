@@ -0,0 +1,64 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import pytest
+
+from conftest import exchange
+from daemon.router import Router
+
+
+def handler(headers, body, **params):
+    return params
+
+
+@pytest.fixture
+def router():
+    router = Router()
+    for method, path in [("GET", "/peers"), ("GET", "/peers/me"), ("GET", "/peers/<int:id>"),
+                         ("DELETE", "/peers/<int:id>"), ("GET", "/ratio/<float:value>"),
+                         ("GET", "/files/<path:rest>")]:
+        router.add(method, path, handler)
+    router.compile()
+    return router
+
+
+def test_static_segments_win_over_parameters(router):
+    assert router.match("GET", "/peers/me") == (handler, {}, None)
+    assert router.match("GET", "/peers/7") == (handler, {"id": 7}, None)
+
+
+def test_converters(router):
+    assert router.match("GET", "/ratio/0.5")[1] == {"value": 0.5}
+    assert router.match("GET", "/files/a/b/c.txt")[1] == {"rest": "a/b/c.txt"}
+    assert router.match("GET", "/peers/x") == (None, {}, None)
+
+
+def test_not_found_and_method_not_allowed(router):
+    assert router.match("GET", "/nothing") == (None, {}, None)
+    assert router.match("POST", "/peers/7") == (None, {}, ["DELETE", "GET"])
+    assert router.get(("GET", "/peers")) is handler
+    assert router.get(("POST", "/peers")) is None
+
+
+def test_served_405_lists_allowed_methods(start_server):
+    port = start_server({("PUT", "/hello"): handler})
+    response = exchange(port, b"GET /hello HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 405 ")
+    assert b"Allow: PUT" in response
+
+
+def test_405_is_decided_on_the_rewritten_path(start_server):
+    # GET /login without a cookie serves login.html, although only POST /login is routed
+    port = start_server({("POST", "/login"): handler})
+    response = exchange(port, b"GET /login HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 200 ")
+    assert b"text/html" in response
@@ -0,0 +1,177 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import os
+import threading
+
+from conftest import static_get
+from daemon import staticcache
+from daemon.staticcache import MAX_ENTRY_SIZE, StaticCache, static_cache
+from daemon.zerocopy import SENDFILE_MIN_SIZE, FileResponse
+
+def write(path, data):
+    with open(str(path), "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_hits_and_misses(tmp_path):
+    cache = StaticCache()
+    path = write(tmp_path / "a.css", b"body {}")
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert first.headers["Content-Type"] == "text/css"
+    assert first.headers["Content-Length"] == "7"
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    cache = StaticCache(check_interval=0)
+    path = write(tmp_path / "a.css", b"old")
+    old = cache.get(path)
+    write(path, b"newer")
+    os.utime(path, ns=(old.mtime_ns + 10 ** 9, old.mtime_ns + 10 ** 9))
+    new = cache.get(path)
+    assert new.content == b"newer"
+    assert new.etag != old.etag
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_entry_is_trusted_until_invalidated(tmp_path):
+    cache = StaticCache(check_interval=60)
+    path = write(tmp_path / "a.css", b"old")
+    cache.get(path)
+    write(path, b"new!")
+    assert cache.get(path).content == b"old"  # trusted without a stat()
+    cache.invalidate(path)
+    assert cache.get(path).content == b"new!"
+
+
+def test_deleted_file_is_dropped(tmp_path):
+    cache = StaticCache(check_interval=0)
+    path = write(tmp_path / "a.css", b"x")
+    cache.get(path)
+    os.remove(path)
+    assert cache.get(path) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = StaticCache(max_bytes=10)
+    a = write(tmp_path / "a.css", b"aaaa")
+    b = write(tmp_path / "b.css", b"bbbb")
+    c = write(tmp_path / "c.css", b"cccc")
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)  # b is now the least recently used
+    cache.get(c)
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 8, 1)
+    cache.get(a)
+    assert cache.stats()["hits"] == 2
+
+
+def test_gzip_variant_counts_against_the_budget(tmp_path):
+    cache = StaticCache()
+    entry = cache.get(write(tmp_path / "a.css", b"body { margin: 0 } " * 100))
+    variant = cache.compressed(entry)
+    assert cache.compressed(entry) is variant
+    assert cache.stats()["bytes"] == entry.size + len(variant)
+    cache.invalidate()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_files_too_large_to_keep_are_not_compressed(tmp_path):
+    cache = StaticCache(max_entry_size=1024)
+    entry = cache.get(write(tmp_path / "a.css", b"body { margin: 0 } " * 100))
+    assert entry.content is None
+    assert cache.compressed(entry) is None
+    assert entry.gzip is None
+
+
+def test_concurrent_first_requests_compress_once(tmp_path, monkeypatch):
+    calls = []
+    started = threading.Event()
+    proceed = threading.Event()
+
+    def slow_compress(data):
+        calls.append(data)
+        started.set()
+        proceed.wait(5)
+        return b"gz"
+
+    monkeypatch.setattr(staticcache, "compress", slow_compress)
+    cache = StaticCache()
+    entry = cache.get(write(tmp_path / "a.css", b"body { margin: 0 } " * 100))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.compressed(entry)))
+               for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    proceed.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [b"gz"] * 4
+    assert len(calls) == 1
+
+
+def test_cache_limit_and_sendfile_threshold_are_separate():
+    assert MAX_ENTRY_SIZE == 1024 * 1024
+    assert SENDFILE_MIN_SIZE == 16 * 1024
+
+
+def test_files_up_to_the_entry_size_are_kept_in_memory(tmp_path):
+    cache = StaticCache(max_entry_size=64 * 1024)
+    medium = cache.get(write(tmp_path / "medium.css", b"a" * (32 * 1024)))
+    large = cache.get(write(tmp_path / "large.css", b"a" * (64 * 1024 + 1)))
+    assert medium.content == b"a" * (32 * 1024)
+    assert large.content is None and large.size == 64 * 1024 + 1
+    assert cache.stats()["bytes"] == 32 * 1024
+
+
+def test_cached_file_is_sent_from_memory(repo_cwd):
+    # welcome.png is above the sendfile threshold but cached
+    assert os.path.getsize("static/images/welcome.png") > SENDFILE_MIN_SIZE
+    response = static_get("/images/welcome.png")
+    assert isinstance(response, bytes)
+    assert response.startswith(b"HTTP/1.1 200 ")
+
+
+def test_uncached_files_use_sendfile_above_the_threshold(repo_cwd, monkeypatch):
+    monkeypatch.setattr(static_cache, "max_entry_size", 0)
+    static_cache.invalidate()
+    try:
+        large = static_get("/images/welcome.png")
+        assert isinstance(large, FileResponse)
+        assert large.count == os.path.getsize("static/images/welcome.png")
+
+        small = static_get("/css/chat.css")
+        assert isinstance(small, bytes)
+        with open("static/css/chat.css", "rb") as f:
+            assert small.endswith(f.read())
+    finally:
+        static_cache.invalidate()
+
+
+def test_uncached_files_are_sent_identity(repo_cwd, monkeypatch):
+    monkeypatch.setattr(static_cache, "max_entry_size", 0)
+    static_cache.invalidate()
+    try:
+        response = static_get("/css/chat.css", b"Accept-Encoding: gzip\r\n")
+        head, _, body = response.partition(b"\r\n\r\n")
+        assert b"Content-Encoding" not in head
+        with open("static/css/chat.css", "rb") as f:
+            assert body == f.read()
+    finally:
+        static_cache.invalidate()
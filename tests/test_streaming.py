@@ -0,0 +1,75 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import gzip
+import json
+
+import pytest
+
+from conftest import exchange
+from daemon.streaming import STREAM_MIN_ITEMS, json_body, json_chunks
+
+
+def dechunk(body):
+    """Decode a chunked body."""
+    out = b""
+    while True:
+        size, _, rest = body.partition(b"\r\n")
+        size = int(size, 16)
+        if size == 0:
+            return out
+        out += rest[:size]
+        body = rest[size + 2:]
+
+
+def split(response):
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.lower(), body
+
+
+ITEMS = {str(i): {"ip": "127.0.0.1", "port": 9000 + i} for i in range(STREAM_MIN_ITEMS)}
+
+
+def listing(headers, body):
+    return 200, json_chunks(ITEMS), {"Content-Type": "application/json"}
+
+
+@pytest.mark.parametrize("engine", ["threaded", "eventloop"])
+def test_streamed_body_is_gzipped_when_accepted(start_server, engine):
+    port = start_server({("GET", "/list"): listing}, engine)
+    response = exchange(port, b"GET /list HTTP/1.1\r\nHost: x\r\nAccept-Encoding: gzip\r\n"
+                              b"Connection: close\r\n\r\n")
+    head, body = split(response)
+    assert b"content-encoding: gzip" in head
+    assert b"transfer-encoding: chunked" in head
+    assert json.loads(gzip.decompress(dechunk(body))) == ITEMS
+
+
+def test_streamed_body_is_identity_without_accept_encoding(start_server):
+    port = start_server({("GET", "/list"): listing})
+    head, body = split(exchange(port, b"GET /list HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"))
+    assert b"content-encoding" not in head
+    assert json.loads(dechunk(body)) == ITEMS
+
+
+def test_small_collections_are_not_streamed(start_server):
+    assert json_body({"a": 1}, 1) == {"a": 1}
+    assert not isinstance(json_body(ITEMS, len(ITEMS)), dict)
+
+    def small(headers, body):
+        return 200, json_body({"peer_list": {}, "length": 0}, 0), {"Content-Type": "application/json"}
+
+    port = start_server({("GET", "/get-list"): small})
+    head, body = split(exchange(port, b"GET /get-list HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"))
+    assert b"transfer-encoding" not in head
+    assert b"content-length: %d" % len(body) in head
+    assert json.loads(body) == {"peer_list": {}, "length": 0}
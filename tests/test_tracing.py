@@ -0,0 +1,85 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import collections
+import time
+
+import pytest
+
+from conftest import exchange
+from daemon.tracing import Tracer, Trace, current_trace, span, trace_header, tracer
+
+
+def test_disabled_tracer_records_nothing():
+    local = Tracer()
+    assert local.begin() is None
+    local.finish(None, "GET", "/", "200")
+    assert local.slow_requests() == []
+
+
+def test_only_slow_requests_are_kept():
+    local = Tracer(threshold=0.01, capacity=2)
+    local.enable()
+    for path, delay in (("/fast", 0), ("/slow-1", 0.02), ("/slow-2", 0.02), ("/slow-3", 0.02)):
+        trace = local.begin()
+        assert current_trace() is trace
+        time.sleep(delay)
+        trace.mark("hook")
+        local.finish(trace, "GET", path, "200")
+        assert current_trace() is None
+    slow = local.slow_requests()
+    assert [entry["path"] for entry in slow] == ["/slow-3", "/slow-2"]
+    assert slow[0]["stages"]["hook"] >= 20
+
+
+def test_adopt_accepts_only_sane_ids():
+    trace = Trace()
+    own = trace.trace_id
+    assert len(own) == 16
+    for bad in (None, "", "x" * 65, "a\nb"):
+        trace.adopt(bad)
+        assert trace.trace_id == own
+    trace.adopt("caller-id")
+    assert trace.trace_id == "caller-id"
+
+
+def test_span_and_trace_header_outside_a_request():
+    with span("nothing"):
+        pass
+    assert trace_header() == ""
+
+
+@pytest.fixture
+def tracing(monkeypatch):
+    """Trace every request of the process, keeping all of them."""
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "threshold", 0)
+    monkeypatch.setattr(tracer, "_slow", collections.deque(maxlen=16))
+    return tracer
+
+
+@pytest.mark.parametrize("engine", ["threaded", "eventloop"])
+def test_served_request_is_traced(start_server, tracing, engine):
+    def handler(headers, body):
+        with span("work"):
+            time.sleep(0.005)
+        return trace_header()
+
+    port = start_server({("GET", "/traced"): handler}, engine)
+    response = exchange(port, b"GET /traced HTTP/1.1\r\nHost: x\r\nX-Trace-Id: abc123\r\n"
+                              b"Connection: close\r\n\r\n")
+    assert response.endswith(b"X-Trace-Id: abc123\r\n")
+    entry = tracing.slow_requests()[0]
+    assert (entry["trace_id"], entry["path"], entry["status"]) == ("abc123", "/traced", "200")
+    assert {"prepare", "auth", "hook", "build"} <= set(entry["stages"])
+    assert entry["spans"][0]["name"] == "work"
+    assert entry["spans"][0]["duration_ms"] >= 5
@@ -0,0 +1,160 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import socket
+import threading
+import time
+
+import pytest
+
+from daemon.reader import RequestError
+from daemon.upstream import ResponseReader, UpstreamPool
+
+
+class FakeConn:
+    """A socket returning ``data`` in pieces of ``step`` bytes."""
+
+    def __init__(self, data, step=5):
+        self.data = data
+        self.step = step
+
+    def recv(self, size):
+        piece, self.data = self.data[:self.step], self.data[self.step:]
+        return piece
+
+
+def read(data, method="GET", step=5):
+    reader = ResponseReader(FakeConn(data, step))
+    return reader.read_response(method) + (bytes(reader.buffer) + reader.conn.data,)
+
+
+def test_content_length_response():
+    # Bytes received past the response would desynchronise the next exchange
+    head, body, reusable, rest = read(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nokHTTP/1.1", step=100)
+    assert (body, reusable) == (b"ok", False)
+    head, body, reusable, rest = read(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+    assert (body, reusable, rest) == (b"ok", True, b"")
+
+
+def test_chunked_response_is_reframed():
+    head, body, reusable, _ = read(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                                   b"3\r\nabc\r\n2\r\nde\r\n0\r\n\r\n")
+    assert body == b"abcde" and reusable
+    assert head.endswith(b"Content-Length: 5\r\n\r\n")
+    assert b"chunked" not in head
+
+
+def test_responses_without_a_body():
+    assert read(b"HTTP/1.1 204 No Content\r\n\r\n")[1:3] == (b"", True)
+    assert read(b"HTTP/1.1 304 Not Modified\r\nContent-Length: 9\r\n\r\n")[1:3] == (b"", True)
+    # The backend may send a body for HEAD anyway: never reused
+    assert read(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok", "HEAD")[1:3] == (b"", False)
+
+
+def test_interim_response_is_skipped():
+    head, body, _, _ = read(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 201 Created\r\nContent-Length: 1\r\n\r\nx")
+    assert head.startswith(b"HTTP/1.1 201") and body == b"x"
+
+
+def test_unframed_response_ends_with_the_connection():
+    head, body, reusable, _ = read(b"HTTP/1.0 200 OK\r\n\r\nuntil eof")
+    assert (body, reusable) == (b"until eof", False)
+    assert read(b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 1\r\n\r\nx")[2] is False
+
+
+def test_bad_responses():
+    with pytest.raises(RequestError) as error:
+        read(b"HTTP/1.1 abc Nope\r\n\r\n")
+    assert error.value.status_code == 502
+    with pytest.raises(ConnectionResetError):
+        read(b"")
+
+
+@pytest.fixture
+def backend():
+    """A keep-alive backend answering ``ok`` to every request; returns its port."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+
+    def serve(conn):
+        with conn:
+            while conn.recv(65536):
+                conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+
+    def accept():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+def roundtrip(pool, port):
+    upstream = pool.checkout("127.0.0.1", port)
+    upstream.sock.sendall(b"GET / HTTP/1.1\r\nHost: b\r\n\r\n")
+    head, body, reusable = upstream.reader.read_response("GET")
+    pool.release(upstream, reusable)
+    return upstream, body
+
+
+def test_connection_is_reused(backend):
+    pool = UpstreamPool()
+    first, body = roundtrip(pool, backend)
+    second, _ = roundtrip(pool, backend)
+    assert body == b"ok"
+    assert second is first and second.reused
+    assert pool.stats() == {"connects": 1, "reuses": 1, "evictions": 0, "idle": 1, "open": 1}
+    pool.close()
+    assert pool.stats()["idle"] == 0
+
+
+def test_closed_idle_connection_is_replaced(backend):
+    pool = UpstreamPool()
+    first, _ = roundtrip(pool, backend)
+    first.sock.shutdown(socket.SHUT_RDWR)  # as if the backend had closed it
+    second, _ = roundtrip(pool, backend)
+    assert second is not first
+    assert pool.stats()["evictions"] == 1
+
+
+def test_idle_connections_expire(backend):
+    pool = UpstreamPool(idle_timeout=0.05)
+    first, _ = roundtrip(pool, backend)
+    time.sleep(0.1)
+    second, _ = roundtrip(pool, backend)
+    assert second is not first
+    assert pool.stats()["evictions"] == 1
+
+
+def test_max_idle_and_max_per_host(backend):
+    pool = UpstreamPool(max_idle=1, max_per_host=2, timeout=0.2)
+    a = pool.checkout("127.0.0.1", backend)
+    b = pool.checkout("127.0.0.1", backend)
+    with pytest.raises(socket.timeout):
+        pool.checkout("127.0.0.1", backend)
+    pool.release(a, True)
+    pool.release(b, True)  # beyond max_idle: closed
+    assert pool.stats()["idle"] == 1 and pool.stats()["open"] == 1
+    assert pool.checkout("127.0.0.1", backend) is a
+
+
+def test_waiting_checkout_gets_a_released_connection(backend):
+    pool = UpstreamPool(max_per_host=1, timeout=5)
+    a = pool.checkout("127.0.0.1", backend)
+    threading.Timer(0.05, pool.release, args=(a, True)).start()
+    assert pool.checkout("127.0.0.1", backend) is a
@@ -0,0 +1,168 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+import socket
+import threading
+import time
+
+import pytest
+
+from conftest import exchange
+from daemon.workerpool import WorkerPool
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def gate():
+    """An event the jobs block on; released at teardown so no worker is left stuck."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_jobs_run_and_are_counted():
+    pool = WorkerPool(min_workers=2)
+    pool.start()
+    done = []
+    for i in range(10):
+        assert pool.submit(done.append, i)
+    wait_for(lambda: pool.stats()["completed"] == 10)
+    assert sorted(done) == list(range(10))
+    assert pool.stats()["submitted"] == 10
+    pool.shutdown()
+
+
+def test_pool_grows_to_max_workers(gate):
+    pool = WorkerPool(min_workers=1, max_workers=3, queue_size=8)
+    pool.start()
+    for busy in range(1, 4):
+        pool.submit(gate.wait)
+        wait_for(lambda: pool.stats()["busy"] == busy)
+    assert pool.stats()["workers"] == 3
+    gate.set()
+    pool.shutdown()
+
+
+def test_reject_when_the_queue_is_full(gate):
+    pool = WorkerPool(min_workers=1, queue_size=1, overflow="reject")
+    pool.start()
+    assert pool.submit(gate.wait)
+    wait_for(lambda: pool.stats()["busy"] == 1)
+    assert pool.submit(gate.wait)
+    assert not pool.submit(gate.wait)
+    assert pool.stats()["rejected"] == 1
+
+
+def test_caller_runs_when_the_queue_is_full(gate):
+    pool = WorkerPool(min_workers=1, queue_size=1, overflow="caller-runs")
+    pool.start()
+    pool.submit(gate.wait)
+    wait_for(lambda: pool.stats()["busy"] == 1)
+    pool.submit(gate.wait)
+    ran_in = []
+    assert pool.submit(lambda: ran_in.append(threading.current_thread()))
+    assert ran_in == [threading.current_thread()]
+    assert pool.stats()["caller_runs"] == 1
+
+
+def test_shutdown_with_a_full_queue_does_not_block(gate):
+    pool = WorkerPool(min_workers=2, queue_size=2, overflow="reject")
+    pool.start()
+    done = []
+    for i in range(4):
+        assert pool.submit(lambda i=i: (gate.wait(), done.append(i)))
+        if i == 1:
+            wait_for(lambda: pool.stats()["busy"] == 2)
+    assert pool.stats()["queue_depth"] == 2
+
+    stopper = threading.Thread(target=pool.shutdown)
+    stopper.start()
+    stopper.join(1)
+    assert not stopper.is_alive()
+
+    # The queued jobs still run, then every worker exits
+    gate.set()
+    wait_for(lambda: pool.stats()["workers"] == 0)
+    assert sorted(done) == [0, 1, 2, 3]
+
+
+def test_eventloop_answers_503_when_its_pool_is_full(start_server, gate):
+    def slow(headers, body):
+        gate.wait()
+        return {}
+
+    port = start_server({("GET", "/slow"): slow}, "eventloop-workers", workers=1, queue_size=1)
+    request = b"GET /slow HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+    busy = []
+    for _ in range(2):
+        # One request runs in the worker, one waits in the queue
+        sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        sock.sendall(request)
+        busy.append(sock)
+        time.sleep(0.1)
+
+    response = exchange(port, request)
+    assert response.startswith(b"HTTP/1.1 503 ")
+    assert b"Retry-After: 1" in response
+
+    gate.set()
+    for sock in busy:
+        with sock:
+            assert sock.recv(65536).startswith(b"HTTP/1.1 200 ")
+
+
+def test_caller_runs_uses_the_caller_function(gate):
+    pool = WorkerPool(min_workers=1, queue_size=1, overflow="caller-runs")
+    pool.start()
+    pool.submit(gate.wait)
+    wait_for(lambda: pool.stats()["busy"] == 1)
+    pool.submit(gate.wait)
+    ran = []
+    assert pool.submit(lambda name: ran.append(("worker", name)), "job",
+                       caller_func=lambda name: ran.append(("caller", name)))
+    assert ran == [("caller", "job")]
+
+
+def test_caller_run_connections_close_after_one_request(start_server, gate):
+    def slow(headers, body):
+        gate.wait()
+        return {}
+
+    def fast(headers, body):
+        return "ok"
+
+    port = start_server({("GET", "/slow"): slow, ("GET", "/fast"): fast}, "pool",
+                        min_workers=1, max_workers=1, queue_size=1, overflow="caller-runs")
+    busy = []
+    for _ in range(2):
+        # One connection runs in the worker, one waits in the queue
+        sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        sock.sendall(b"GET /slow HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        busy.append(sock)
+        time.sleep(0.1)
+
+    # Served by the accept thread: a keep-alive request still gets closed
+    response = exchange(port, b"GET /fast HTTP/1.1\r\nHost: x\r\n\r\n"
+                              b"GET /fast HTTP/1.1\r\nHost: x\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 200 ")
+    assert b"Connection: close" in response
+    assert response.count(b"HTTP/1.1 200 ") == 1
+
+    gate.set()
+    for sock in busy:
+        sock.close()